@@ -0,0 +1,117 @@
+"""
+TOPLU İŞLEME BENCHMARK
+- Sentetik ham ürün kayıtları üretir (Türkçe/İngilizce fiyat formatları, hatalı
+  fiyatlar, boş kategoriler, filtrelenecek ve duplike edilecek ürünler)
+- Kayıt kayıt yolu (DataValidator + ProductFilter + apply_duplication_rules +
+  compute_statistics) ile BatchProcessor'ın aynı sonucu ürettiğini doğrular
+- Her iki yolun süresini raporlar
+
+Kullanım:
+    python bench_batch.py [--count N] [--seed S]
+"""
+import sys
+import io
+import time
+import random
+import argparse
+from contextlib import redirect_stdout
+
+from dogtas_other_scraper import (
+    BatchProcessor, DataValidator, ProductFilter, compute_statistics,
+)
+
+
+KATEGORILER = ["Yatak Odası", "Yemek Odası", "Oturma Grupları", "Doğtaş Home", "", " Genç Odası "]
+ADLAR = ["Komodin", "Ayna", "Konsol", "Abajur", "Halı", "Karyola", "Vazo", "Sehpa", "Dolap", "Kırlent",
+         "KIRLENT", "AYNALI DOLAP", "İNCE HALI", "ŞAMDAN"]
+FIYATLAR = ["12.500,50 TL", "12,500.50", "1.250", "1.25", "999,90", "5", "2.000.000 TL",
+            "abc", "", "  45.000 ₺", "1.2.34", "7,5"]
+
+
+def make_records(count: int, seed: int):
+    """Rastgele ham kayıtlar (ProductExtractor.extract çıktısı biçiminde)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        koleksiyon = rng.choice(["Lenova", "Vega", "", "Carmen "])
+        urun_adi = f" {rng.choice(ADLAR)} {i}" if rng.random() > 0.02 else ""
+        urun_adi_tam = f"{koleksiyon} {urun_adi}" if koleksiyon and urun_adi else urun_adi
+        records.append({
+            'KOLEKSIYON': koleksiyon,
+            'urun_adi': urun_adi,
+            'urun_adi_tam': urun_adi_tam,
+            'sku': rng.choice([f"3{i:09d}", " 31-A_x* ", "a!", ""]),
+            'orijinal_fiyat': rng.choice(FIYATLAR),
+            'fiyat': rng.choice(FIYATLAR),
+            'kategori': rng.choice(KATEGORILER),
+            'marka': "Doğtaş",
+            'urun_url': f"https://www.dogtas.com/urun-{i}",
+        })
+    return records
+
+
+def per_record(raw_records):
+    """Scraper'ın kayıt kayıt uyguladığı yol"""
+    products = []
+    for veri in raw_records:
+        validated = DataValidator.validate_product_data(veri)
+        if not validated.get('urun_adi_tam') or not validated.get('urun_adi_tam').strip():
+            continue
+        if ProductFilter.should_filter_product(validated):
+            continue
+        products.append(validated)
+    products = ProductFilter.apply_duplication_rules(products)
+    return products, compute_statistics(products)
+
+
+def timed(func, records):
+    """Fonksiyonu stdout bastırılarak çalıştır; (sonuç, süre) döndür"""
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = func(records)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu işleme benchmark")
+    parser.add_argument('--count', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    records = make_records(args.count, args.seed)
+    print(f"[INFO] {len(records)} ham kayıt")
+
+    # pandas importu ölçüme dahil edilmesin
+    timed(BatchProcessor.process, records[:10])
+
+    (expected, expected_stats), record_time = timed(per_record, records)
+    (actual, actual_stats), batch_time = timed(BatchProcessor.process, records)
+
+    print(f"[BENCH] kayıt kayıt : {record_time:8.3f} s ({len(records)/record_time:10.0f} kayıt/saniye)")
+    print(f"[BENCH] toplu       : {batch_time:8.3f} s ({len(records)/batch_time:10.0f} kayıt/saniye)")
+
+    mismatches = 0
+    if len(expected) != len(actual):
+        mismatches += 1
+        print(f"[DIFF] Ürün sayısı: {len(expected)} != {len(actual)}")
+    for index, (exp, act) in enumerate(zip(expected, actual)):
+        if exp != act:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[DIFF] #{index}")
+                print(f"       kayıt: {exp}")
+                print(f"       toplu: {act}")
+    if expected_stats != actual_stats:
+        mismatches += 1
+        print(f"[DIFF] İstatistikler:\n       kayıt: {expected_stats}\n       toplu: {actual_stats}")
+
+    if mismatches:
+        print(f"[ERROR] {mismatches} fark bulundu")
+        return 1
+
+    print(f"[OK] Aynı sonuç: {len(actual)} ürün")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+HTML BACKEND BENCHMARK
+- Kaydedilmiş ürün sayfalarını (*.html) tüm HTML backend'leriyle ayrıştırır
+- Backend'lerin aynı kayıtları ürettiğini doğrular (referans: bs4)
+- Her backend için sayfa/saniye raporlar
+- Akışla erken kesilen sayfa başından (ProductPrefixScanner) aynı kaydın
+  çıktığını doğrular ve indirilmeyen byte oranını raporlar
+
+Kullanım:
+    python bench_extractors.py [sayfa_dizini] [--repeat N]
+
+Sayfa dizini varsayılanı script yanındaki bench_pages/ klasörüdür. Dosya adı
+(uzantısız) ürün URL'i yerine kayda yazılır.
+"""
+import sys
+import os
+import time
+import argparse
+from pathlib import Path
+
+from dogtas_other_scraper import (
+    EXTRACTORS, BeautifulSoupExtractor, ProductPrefixScanner, get_base_dir,
+)
+
+
+def load_pages(pages_dir: str):
+    """Dizindeki .html dosyalarını (isim, html) olarak oku"""
+    pages = []
+    for path in sorted(Path(pages_dir).glob('*.html')):
+        pages.append((path.stem, path.read_text(encoding='utf-8')))
+    return pages
+
+
+def run_backend(extractor, pages, repeat: int):
+    """Tüm sayfaları repeat kez ayrıştır; (kayıtlar, sayfa/saniye) döndür"""
+    records = [extractor.extract_record(html, name) for name, html in pages]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, html in pages:
+            extractor.extract_record(html, name)
+    elapsed = time.perf_counter() - start
+
+    return records, (len(pages) * repeat) / elapsed if elapsed else float('inf')
+
+
+def check_prefixes(extractor, pages, reference, chunk_size: int = 16 * 1024):
+    """Sayfaları parça parça tarayıp kesme noktasındaki sayfa başından kayıt çıkar
+
+    (erken kesilen sayfa, indirilmeyen byte oranı, farklı kayıt sayısı) döndürür.
+    """
+    cut_pages = 0
+    total_bytes = saved_bytes = 0
+    mismatches = 0
+
+    for (page_name, html), expected in zip(pages, reference):
+        body = html.encode('utf-8')
+        total_bytes += len(body)
+
+        scanner = ProductPrefixScanner()
+        cut = None
+        for start in range(0, len(body), chunk_size):
+            cut = scanner.feed(body[start:start + chunk_size])
+            if cut is not None:
+                break
+        if cut is None:
+            continue
+
+        record = extractor.extract_record(body[:cut].decode('utf-8'), page_name, partial=True)
+        if record is None:
+            # Eksik alan: scraper tam sayfaya düşer
+            continue
+
+        cut_pages += 1
+        saved_bytes += len(body) - len(scanner.buffer)
+        if record != expected:
+            mismatches += 1
+            print(f"[DIFF] akış - {page_name}")
+            print(f"       tam : {expected}")
+            print(f"       baş : {record}")
+
+    return cut_pages, saved_bytes / total_bytes if total_bytes else 0.0, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML backend benchmark")
+    parser.add_argument('pages_dir', nargs='?', default=os.path.join(get_base_dir(), 'bench_pages'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        print(f"[ERROR] Sayfa bulunamadı: {args.pages_dir}/*.html")
+        return 1
+
+    print(f"[INFO] {len(pages)} sayfa, {args.repeat} tekrar")
+
+    reference = None
+    mismatches = 0
+
+    for name, extractor_cls in EXTRACTORS.items():
+        try:
+            extractor = extractor_cls()
+        except ImportError as e:
+            print(f"[SKIP] {name}: {e}")
+            continue
+
+        records, pages_per_sec = run_backend(extractor, pages, args.repeat)
+        print(f"[BENCH] {name:6s} {pages_per_sec:10.1f} sayfa/saniye")
+
+        if extractor_cls is BeautifulSoupExtractor:
+            reference = records
+            continue
+
+        if reference is None:
+            continue
+
+        for (page_name, _), expected, actual in zip(pages, reference, records):
+            if expected != actual:
+                mismatches += 1
+                print(f"[DIFF] {name} - {page_name}")
+                print(f"       bs4 : {expected}")
+                print(f"       {name:4s}: {actual}")
+
+    if reference is not None:
+        cut_pages, saved, stream_mismatches = check_prefixes(BeautifulSoupExtractor(), pages, reference)
+        print(f"[STREAM] {cut_pages}/{len(pages)} sayfa erken kesildi, byte'ların %{saved * 100:.1f}'i indirilmedi")
+        mismatches += stream_mismatches
+
+    if mismatches:
+        print(f"[ERROR] {mismatches} sayfada farklı kayıt")
+        return 1
+
+    print("[OK] Tüm backend'ler aynı kayıtları üretti")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
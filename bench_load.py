@@ -0,0 +1,315 @@
+"""
+OFFLINE YÜK TESTİ
+- Ayrı bir süreçte yerel bir Doğtaş benzeri aiohttp sunucusu başlatır:
+  sitemap index, ürün sitemap'leri (10k - 200k URL) ve ürün sayfaları
+- Sunucuya gecikme, hata (500) ve 429 (Retry-After) enjekte edilebilir
+- DogtasSitemapScraper'ı uçtan uca bu sunucuya karşı çalıştırır
+- SKU/saniye, SKU başına p50/p95/p99 gecikme ve tepe RSS raporlar
+
+Kullanım:
+    python bench_load.py --urls 50000 --skus 1000 --latency-ms 50 --error-rate 0.01
+"""
+import sys
+import os
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import contextlib
+import multiprocessing
+
+from dogtas_other_scraper import DogtasSitemapScraper
+
+SKU_BASE = 3_000_000_000
+
+CATEGORIES = ['Yatak Odası', 'Yemek Odası', 'Oturma Grubu', 'Genç Odası', 'Doğtaş Home']
+COLLECTIONS = ['TOLEDO', 'VERONA', 'LUNA', 'ASPEN', 'MODENA', 'NOVA']
+PRODUCTS = ['Karyola', 'Komodin', 'Ayna', 'Gardırop', 'Konsol', 'Sehpa', 'Köşe Takımı']
+
+
+def product_sku(index: int) -> str:
+    return str(SKU_BASE + index)
+
+
+def product_fields(index: int) -> dict:
+    """Index'ten deterministik ürün alanları"""
+    rnd = random.Random(index)
+    liste = rnd.randrange(5_000, 150_000)
+    return {
+        'sku': product_sku(index),
+        'kategori': CATEGORIES[index % len(CATEGORIES)],
+        'koleksiyon': rnd.choice(COLLECTIONS),
+        'urun': rnd.choice(PRODUCTS),
+        'liste': liste,
+        'perakende': int(liste * rnd.uniform(0.6, 1.0)),
+    }
+
+
+def format_tl(value: int, kurus: bool = False) -> str:
+    """12500 -> '12.500 TL' (kurus=True: '12.500,00 TL')"""
+    text = f"{value:,}".replace(',', '.')
+    return f"{text},00 TL" if kurus else f"{text} TL"
+
+
+def render_product_page(index: int, padding_kb: int) -> bytes:
+    """get_product_detail_async'in beklediği işaretlemeyle ürün sayfası"""
+    f = product_fields(index)
+    json_ld = json.dumps({
+        '@context': 'https://schema.org',
+        '@type': 'Product',
+        'name': f"{f['koleksiyon']} {f['urun']}",
+        'sku': f['sku'],
+        'brand': {'@type': 'Brand', 'name': 'Doğtaş'},
+    }, ensure_ascii=False)
+    padding = "<script>var bundle='" + ("x" * (padding_kb * 1024)) + "';</script>"
+    return f"""<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>{f['koleksiyon']} {f['urun']}</title>
+<script type="application/ld+json">{json_ld}</script></head>
+<body>
+<ol class="breadcrumb"><li><a href="/">Ana Sayfa</a></li><li><a href="/k">{f['kategori']}</a></li><li>{f['urun']}</li></ol>
+<h1 class="title"><span>{f['koleksiyon']}</span> {f['urun']}</h1>
+<div class="sku">Ürün Kodu: {f['sku']}</div>
+<div class="price-box">
+  <span class="sale-price sale-variant-price">{format_tl(f['liste'])}</span>
+  <span class="discount-price">{format_tl(f['perakende'], kurus=True)}</span>
+</div>
+{padding}
+</body></html>""".encode('utf-8')
+
+
+def render_sitemap(base: str, sitemap_no: int, urls_per_sitemap: int, total_urls: int) -> bytes:
+    start = (sitemap_no - 1) * urls_per_sitemap
+    end = min(start + urls_per_sitemap, total_urls)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for index in range(start, end):
+        f = product_fields(index)
+        slug = f"{f['koleksiyon']}-{f['urun']}".lower().replace(' ', '-')
+        parts.append(f"<url><loc>{base}/urun/{slug}-{f['sku']}</loc>"
+                     f"<lastmod>2024-01-{index % 28 + 1:02d}</lastmod></url>")
+    parts.append('</urlset>')
+    return "".join(parts).encode('utf-8')
+
+
+def run_server(port: int, options: dict):
+    """Sahte Doğtaş sunucusu (ayrı süreçte çalışır)"""
+    from aiohttp import web
+
+    base = f"http://127.0.0.1:{port}"
+    total_urls = options['urls']
+    sitemap_count = options['sitemaps']
+    urls_per_sitemap = -(-total_urls // sitemap_count)
+    rnd = random.Random(options['seed'])
+    sitemap_bodies = {}
+
+    async def inject():
+        """Gecikme / hata / 429 enjeksiyonu; yanıt gerekiyorsa döndür"""
+        if options['latency_ms']:
+            jitter = rnd.uniform(0.5, 1.5)
+            await asyncio.sleep(options['latency_ms'] * jitter / 1000)
+        roll = rnd.random()
+        if roll < options['throttle_rate']:
+            return web.Response(status=429, headers={'Retry-After': str(options['retry_after'])})
+        if roll < options['throttle_rate'] + options['error_rate']:
+            return web.Response(status=500)
+        return None
+
+    async def sitemap_index(request):
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for no in range(1, sitemap_count + 1):
+            parts.append(f"<sitemap><loc>{base}/sitemap/products/{no}.xml</loc>"
+                         f"<lastmod>2024-01-01</lastmod></sitemap>")
+        parts.append('</sitemapindex>')
+        return web.Response(body="".join(parts).encode('utf-8'), content_type='application/xml')
+
+    async def sitemap(request):
+        no = int(request.match_info['no'])
+        if not 1 <= no <= sitemap_count:
+            raise web.HTTPNotFound()
+        if no not in sitemap_bodies:
+            sitemap_bodies[no] = render_sitemap(base, no, urls_per_sitemap, total_urls)
+        return web.Response(body=sitemap_bodies[no], content_type='application/xml')
+
+    async def product(request):
+        injected = await inject()
+        if injected is not None:
+            return injected
+        index = int(request.match_info['slug'].rsplit('-', 1)[-1]) - SKU_BASE
+        if not 0 <= index < total_urls:
+            raise web.HTTPNotFound()
+        return web.Response(body=render_product_page(index, options['page_kb']),
+                            content_type='text/html', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/sitemap.xml', sitemap_index)
+    app.router.add_get('/sitemap/products/{no}.xml', sitemap)
+    app.router.add_get('/urun/{slug}', product)
+    web.run_app(app, host='127.0.0.1', port=port, print=None, access_log=None)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(('127.0.0.1', port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"Sunucu {port} portunda açılmadı")
+
+
+def peak_rss_mb():
+    """Bu sürecin tepe RSS değeri (MB); ölçülemiyorsa None"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürür
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values, pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class TimedScraper(DogtasSitemapScraper):
+    """SKU başına süreyi ve sonuç durumunu kaydeden scraper"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self.outcomes = {}
+
+    async def scrape_sku_outcome(self, session, sku, prefix=""):
+        start = time.perf_counter()
+        status, result = await super().scrape_sku_outcome(session, sku, prefix)
+        self.latencies.append(time.perf_counter() - start)
+        self.outcomes[status] = self.outcomes.get(status, 0) + 1
+        return status, result
+
+
+def build_sku_list(options: dict):
+    """Katalogdan örneklenen SKU'lar + bulunamayacak SKU'lar"""
+    rnd = random.Random(options['seed'])
+    count = min(options['skus'], options['urls'])
+    sku_list = [product_sku(i) for i in rnd.sample(range(options['urls']), count)]
+    missing = int(count * options['missing_rate'])
+    sku_list[:missing] = [product_sku(options['urls'] + i) for i in range(missing)]
+    rnd.shuffle(sku_list)
+    return sku_list
+
+
+def run_benchmark(options: dict) -> dict:
+    port = free_port()
+    server = multiprocessing.Process(target=run_server, args=(port, options), daemon=True)
+    server.start()
+    try:
+        wait_for_port(port)
+        base = f"http://127.0.0.1:{port}"
+
+        scraper = TimedScraper(max_concurrent=options['concurrency'],
+                               html_backend=options['html_backend'])
+        scraper.sitemap_index_url = f"{base}/sitemap.xml"
+        scraper.sitemap_urls = [f"{base}/sitemap/products/{no}.xml"
+                                for no in range(1, options['sitemaps'] + 1)]
+        scraper.config['requests_per_second'] = options['rps']
+        scraper.config['worker_count'] = options['workers']
+
+        sku_list = build_sku_list(options)
+
+        output = sys.stdout if options['verbose'] else open(os.devnull, 'w', encoding='utf-8')
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            products = asyncio.run(scraper.scrape_from_sku_list_async(sku_list))
+        elapsed = time.perf_counter() - start
+        if output is not sys.stdout:
+            output.close()
+    finally:
+        server.terminate()
+        server.join()
+
+    latencies_ms = [lat * 1000 for lat in scraper.latencies]
+    return {
+        'urls': options['urls'],
+        'skus': len(sku_list),
+        'products': len(products),
+        'outcomes': scraper.outcomes,
+        'elapsed_s': round(elapsed, 3),
+        'skus_per_sec': round(len(sku_list) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': percentile(latencies_ms, 50),
+            'p95': percentile(latencies_ms, 95),
+            'p99': percentile(latencies_ms, 99),
+        },
+        'peak_rss_mb': peak_rss_mb(),
+        'options': options,
+    }
+
+
+def print_report(report: dict):
+    print("\n" + "=" * 80)
+    print("YÜK TESTİ SONUCU")
+    print("=" * 80)
+    print(f"Katalog: {report['urls']:,} URL  |  SKU: {report['skus']:,}  |  Ürün: {report['products']:,}")
+    print(f"Sonuçlar: {report['outcomes']}")
+    print(f"Süre: {report['elapsed_s']:.2f} s  |  Hız: {report['skus_per_sec']} SKU/saniye")
+    lat = report['latency_ms']
+    if lat['p50'] is not None:
+        print(f"SKU gecikmesi: p50 {lat['p50']:.1f} ms  p95 {lat['p95']:.1f} ms  p99 {lat['p99']:.1f} ms")
+    rss = report['peak_rss_mb']
+    print(f"Tepe RSS: {rss:.1f} MB" if rss is not None else "Tepe RSS: ölçülemedi")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Doğtaş yük testi")
+    parser.add_argument('--urls', type=int, default=10_000, help="Katalogdaki ürün URL sayısı")
+    parser.add_argument('--sitemaps', type=int, default=6, help="Ürün sitemap sayısı")
+    parser.add_argument('--skus', type=int, default=500, help="Taranacak SKU sayısı")
+    parser.add_argument('--missing-rate', type=float, default=0.05, help="Katalogda olmayan SKU oranı")
+    parser.add_argument('--latency-ms', type=float, default=50, help="Ürün sayfası ortalama gecikmesi")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 yanıt oranı")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="429 yanıt oranı")
+    parser.add_argument('--retry-after', type=int, default=1, help="429 Retry-After (saniye)")
+    parser.add_argument('--page-kb', type=int, default=100, help="Ürün sayfası dolgu boyutu (KB)")
+    parser.add_argument('--concurrency', type=int, default=5, help="Başlangıç eşzamanlılık limiti (AIMD)")
+    parser.add_argument('--workers', type=int, default=10, help="worker_count")
+    parser.add_argument('--rps', type=float, default=0, help="requests_per_second (0 = sınırsız)")
+    parser.add_argument('--html-backend', default='bs4')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help="Raporu JSON olarak bu dosyaya yaz")
+    parser.add_argument('--verbose', action='store_true', help="Scraper çıktısını göster")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = {key: value for key, value in vars(args).items() if key != 'json'}
+
+    report = run_benchmark(options)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"[SAVED] Rapor: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
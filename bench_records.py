@@ -0,0 +1,100 @@
+"""
+ÜRÜN KAYDI BELLEK BENCHMARK
+- Sentetik ham kayıtları eski dict yolu (copy + alan ekle/sil, duplikasyonda
+  copy) ve ProductRecord yolu ile validate edip duplike eder
+- tracemalloc ile iki yolun tuttuğu bellek ve tepe bellek değerini, ürün başına
+  byte olarak raporlar
+- İki yolun aynı kayıtları ürettiğini doğrular
+
+Kullanım:
+    python bench_records.py [--count N] [--seed S]
+"""
+import sys
+import io
+import gc
+import time
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+
+from bench_batch import make_records
+from dogtas_other_scraper import DataValidator, ProductRecord
+
+
+DUPLICATE_KATEGORI = "Genç Odası"
+TARGET_KATEGORI = "Yatak Odası"
+
+
+def dict_path(raw_records):
+    """ProductRecord öncesi yol: her adımda dict kopyası"""
+    products = []
+    for veri in raw_records:
+        validated = DataValidator.validate_product_data(veri).to_dict()
+        # Eski validate_product_data ham dict'i kopyalayıp alanları ekliyordu
+        copied = dict(veri)
+        copied.update(validated)
+        for field in ('orijinal_fiyat', 'fiyat', 'marka'):
+            copied.pop(field, None)
+        products.append(copied)
+        if copied.get('kategori') == DUPLICATE_KATEGORI:
+            duplicated = copied.copy()
+            duplicated['kategori'] = TARGET_KATEGORI
+            products.append(duplicated)
+    return products
+
+
+def record_path(raw_records):
+    products = []
+    for veri in raw_records:
+        record = DataValidator.validate_product_data(veri)
+        products.append(record)
+        if record.kategori == DUPLICATE_KATEGORI:
+            products.append(record.replace(kategori=TARGET_KATEGORI))
+    return products
+
+
+def measure(func, raw_records):
+    """(ürünler, tutulan byte, tepe byte, süre) döndür"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        products = func(raw_records)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return products, current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ürün kaydı bellek benchmark")
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Ham kategori string'leri her kayıtta ayrı nesne olsun (sayfadan parse edilmiş gibi)
+    raw_records = [
+        {key: "".join(value) if isinstance(value, str) else value for key, value in veri.items()}
+        for veri in make_records(args.count, args.seed)
+    ]
+    print(f"[INFO] {len(raw_records)} ham kayıt")
+
+    results = {}
+    for name, func in (('dict', dict_path), ('record', record_path)):
+        products, current, peak, elapsed = measure(func, raw_records)
+        results[name] = products
+        print(f"[BENCH] {name:6s}: {len(products)} ürün, tutulan {current / len(products):7.1f} B/ürün, "
+              f"tepe {peak / 2**20:7.1f} MB, {elapsed:6.3f} s")
+        del products
+
+    mismatches = sum(1 for exp, act in zip(results['dict'], results['record']) if act != exp)
+    if len(results['dict']) != len(results['record']) or mismatches:
+        print(f"[ERROR] {mismatches} farklı kayıt")
+        return 1
+
+    print("[OK] Aynı kayıtlar")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
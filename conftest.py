@@ -0,0 +1 @@
+# Testler dogtas_other_scraper'ı repo kökünden import eder
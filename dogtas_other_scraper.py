@@ -1,24 +1,67 @@
 """
 DOGTAS OTHER.XLSX SCRAPER
 - Other.xlsx'ten SKU okur
-- Her SKU için Doğtaş sitemap XML'lerinde arama yapar (1.xml - 6.xml)
+- Doğtaş ürün sitemap'lerini bir kez indirip SKU -> URL index'i oluşturur
+- Her SKU için index'te arama yapar
 - Ürün detaylarını çeker
 - dogtasCom.xlsx'e kaydeder
 """
+from __future__ import annotations
+
+import time
+
+# Modül yüklenmeye başladığı an (--startup-profile)
+MODULE_START = time.perf_counter()
+
 import sys
 import os
 import asyncio
-import aiohttp
-from bs4 import BeautifulSoup
+import argparse
 import json
-import time
 import re
-from datetime import datetime
+import csv
+import email.utils
+import bisect
+import contextlib
+import heapq
+import tempfile
+import sqlite3
+import hashlib
+import zlib
+import multiprocessing
+import socket
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
 from urllib.parse import urljoin, quote
-import pandas as pd
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, TYPE_CHECKING
 from pathlib import Path
-import xml.etree.ElementTree as ET
+
+# Ağır bağımlılıklar (aiohttp, bs4, lxml, openpyxl, pyarrow, ElementTree) ilk
+# kullanıldıkları yerde import edilir; exe açılışında main() hemen çıktı verir.
+if TYPE_CHECKING:
+    import aiohttp
+
+
+SITEMAP_NAMESPACES = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+# get_xml_async / get_page_async: 304 Not Modified yanıtı
+NOT_MODIFIED = object()
+
+# SKU sonuç durumları (journal)
+OUTCOME_FOUND = 'found'
+OUTCOME_FILTERED = 'filtered'
+OUTCOME_NOT_FOUND = 'not_found'
+OUTCOME_FAILED = 'failed'
+
+# Resume'da tekrar taranmayan durumlar (failed tekrar denenir)
+COMPLETED_OUTCOMES = (OUTCOME_FOUND, OUTCOME_FILTERED, OUTCOME_NOT_FOUND)
+
+# Ürün URL'lerindeki 10 haneli SKU (ör. ...-3030230100)
+SKU_IN_URL_PATTERN = re.compile(r'(?<!\d)(\d{10})(?!\d)')
 
 
 def get_base_dir():
@@ -28,6 +71,103 @@ def get_base_dir():
     return os.path.dirname(os.path.abspath(__file__))
 
 
+def intern_text(value):
+    """Boş olmayan string'i intern et (aynı kategori/koleksiyon tek nesneyi paylaşır)"""
+    return sys.intern(value) if value and type(value) is str else value
+
+
+class ProductRecord:
+    """Validate edilmiş ürün kaydı
+
+    Ürün başına dict yerine __slots__'lu nesne tutulur; kategori ve KOLEKSIYON
+    intern edilir, LISTE/PERAKENDE int (veya None) olur. Okuma tarafında dict
+    gibi davranır (get, [], in); JSON'a yazarken to_dict() kullanılır.
+    Kayıtlar değiştirilmez, farklı kategorili kopya replace() ile üretilir.
+    """
+
+    FIELDS = ('KOLEKSIYON', 'urun_adi', 'urun_adi_tam', 'sku', 'kategori', 'urun_url', 'LISTE', 'PERAKENDE')
+    __slots__ = FIELDS
+    __hash__ = None
+
+    def __init__(self, KOLEKSIYON=None, urun_adi=None, urun_adi_tam=None, sku=None,
+                 kategori=None, urun_url=None, LISTE=None, PERAKENDE=None):
+        self.KOLEKSIYON = intern_text(KOLEKSIYON)
+        self.urun_adi = urun_adi
+        self.urun_adi_tam = urun_adi_tam
+        self.sku = sku
+        self.kategori = intern_text(kategori)
+        self.urun_url = urun_url
+        self.LISTE = LISTE
+        self.PERAKENDE = PERAKENDE
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProductRecord':
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def astuple(self) -> Tuple:
+        """Alan sırasıyla değerler (parse worker'dan ana sürece taşımak için)"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def replace(self, **changes) -> 'ProductRecord':
+        """Verilen alanları değişmiş yeni kayıt; diğer alanlar aynı nesneleri paylaşır"""
+        values = self.to_dict()
+        values.update(changes)
+        return ProductRecord(**values)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.FIELDS
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ProductRecord):
+            return self.astuple() == other.astuple()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ProductRecord({self.to_dict()!r})"
+
+
+def dump_record(record) -> Optional[str]:
+    """Kaydı (ProductRecord veya --batch ham dict'i) JSON metnine çevir"""
+    if not record:
+        return None
+    if isinstance(record, ProductRecord):
+        record = record.to_dict()
+    return json.dumps(record, ensure_ascii=False)
+
+
+def load_record(text: Optional[str]):
+    """dump_record'un tersi: validate edilmiş kayıtlar ProductRecord, ham kayıtlar dict döner"""
+    if not text:
+        return None
+    return record_from_json(json.loads(text))
+
+
+def record_from_json(data: Optional[Dict]):
+    if data and 'LISTE' in data:
+        return ProductRecord.from_dict(data)
+    return data
+
+
+def json_default(value):
+    """json.dumps default'u: ProductRecord'ları dict olarak yaz"""
+    if isinstance(value, ProductRecord):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
 class DataValidator:
     """Ürün verilerini validate ve temizle"""
 
@@ -83,125 +223,302 @@ class DataValidator:
             return None
 
     @staticmethod
-    def validate_product_data(data: Dict) -> Dict:
-        """Tüm ürün verisini validate et ve temizle"""
-        validated = data.copy()
+    def validate_product_data(data: Dict) -> ProductRecord:
+        """Tüm ürün verisini validate et ve temizle
 
+        Yalnızca ProductRecord alanları taşınır; fiyat metinleri, marka vb. düşer.
+        """
         # Fiyat validasyonu - INT olarak kaydet
-        if validated.get('orijinal_fiyat'):
-            price_float = DataValidator.clean_price(validated['orijinal_fiyat'])
-            validated['LISTE'] = int(price_float) if price_float else None
-        else:
-            validated['LISTE'] = None
+        liste = perakende = None
+        if data.get('orijinal_fiyat'):
+            price_float = DataValidator.clean_price(data['orijinal_fiyat'])
+            liste = int(price_float) if price_float else None
 
-        if validated.get('fiyat'):
-            price_float = DataValidator.clean_price(validated['fiyat'])
-            validated['PERAKENDE'] = int(price_float) if price_float else None
-        else:
-            validated['PERAKENDE'] = None
+        if data.get('fiyat'):
+            price_float = DataValidator.clean_price(data['fiyat'])
+            perakende = int(price_float) if price_float else None
 
         # SKU validasyonu
-        if validated.get('sku'):
-            validated['sku'] = DataValidator.clean_sku(validated['sku'])
+        sku = data.get('sku')
+        if sku:
+            sku = DataValidator.clean_sku(sku)
 
         # String alanları temizle
-        for field in ['urun_adi', 'urun_adi_tam', 'KOLEKSIYON', 'kategori']:
-            if validated.get(field):
-                validated[field] = validated[field].strip()
-
-        # Gereksiz alanları kaldır
-        fields_to_remove = [
-            'orijinal_fiyat', 'indirimli_fiyat', 'fiyat',
-            'indirim_yuzdesi', 'kazanc', 'kampanya_metni',
-            'sepette_indirim', 'marka'
-        ]
-        for field in fields_to_remove:
-            validated.pop(field, None)
+        texts = {}
+        for field in ('urun_adi', 'urun_adi_tam', 'KOLEKSIYON', 'kategori'):
+            value = data.get(field)
+            texts[field] = value.strip() if value else value
+
+        return ProductRecord(sku=sku, urun_url=data.get('urun_url'), LISTE=liste, PERAKENDE=perakende,
+                             **texts)
+
+
+# Varsayılan filtre/duplikasyon kuralları (--rules veya dogtasCom_rules.json yoksa)
+DEFAULT_RULES = {
+    'filter': [
+        # Doğtaş Home kategorisini filtrele
+        {'kategori': "Doğtaş Home"},
+        # Kategori boş ve ürün adı filtreleme kelimelerini içeriyorsa
+        {'kategori': "", 'keywords': [
+            'Abajur', 'Halı', 'Biblo', 'Kırlent', 'Tablo', 'Sarkıt',
+            'Çerceve', 'Vazo', 'Mum', 'Obje', 'Küp', 'Saat',
+            'Lambader', 'Tabak', 'Şamdan'
+        ]},
+    ],
+    'duplicate': [
+        # Yemek Odası + (komodin veya ayna) -> Yatak Odası kopyası
+        {'kategori': "Yemek Odası", 'keywords': ['komodin', 'ayna'], 'target_kategori': "Yatak Odası"},
+    ],
+}
+
+# str.lower() 'I'yı 'i', 'İ'yi 'i̇' yapar; Türkçede I -> ı, İ -> i
+TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+
+def turkish_lower(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevir"""
+    return text.translate(TURKISH_LOWER).lower()
+
+
+def keywords_to_pattern(keywords) -> str:
+    """Anahtar kelimeleri ortak önekleri birleştirilmiş tek bir regex'e çevir
+
+    Düz 'a|b|c' alternasyonunda her konumda tüm kelimeler sırayla denenir;
+    trie'den üretilen desende her karakterde tek dal izlendiği için maliyet
+    kelime sayısı yüzlere çıksa da neredeyse sabit kalır.
+    """
+    trie = {}
+    for word in keywords:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Kelime burada bitebiliyorsa devamı opsiyonel (açgözlü: önce uzun kelime)
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class ProductRule:
+    """Kategori eşleşmesi + (opsiyonel) anahtar kelimelerden oluşan tek kural"""
+
+    def __init__(self, kategori: Optional[str] = None, keywords=(),
+                 fields=('urun_adi', 'urun_adi_tam'), target_kategori: Optional[str] = None):
+        self.kategori = kategori  # None: kategoriye bakılmaz
+        self.fields = tuple(fields)
+        self.target_kategori = target_kategori
+
+        # Küçük harfli kelime -> dosyadaki yazımı (loglar için)
+        self.keywords = {turkish_lower(keyword): keyword for keyword in keywords if keyword}
+        self.matcher = re.compile(keywords_to_pattern(self.keywords)) if self.keywords else None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProductRule":
+        unknown = set(data) - {'kategori', 'keywords', 'fields', 'target_kategori'}
+        if unknown:
+            raise ValueError(f"Bilinmeyen kural alanı: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def match(self, product: Dict) -> Optional[str]:
+        """Eşleşen anahtar kelime ('' = sadece kategori kuralı) veya None"""
+        if self.kategori is not None and (product.get('kategori') or '').strip() != self.kategori:
+            return None
+        if self.matcher is None:
+            return ''
+
+        for field in self.fields:
+            found = self.matcher.search(turkish_lower(product.get(field) or ''))
+            if found:
+                return self.keywords[found.group()]
+        return None
+
+
+# (yol, mtime, boyut) -> (filtre kuralları, duplikasyon kuralları)
+_RULES_CACHE: Dict[Tuple, Tuple[List[ProductRule], List[ProductRule]]] = {}
+
 
-        return validated
+def compile_rules(data: Dict) -> Tuple[List[ProductRule], List[ProductRule]]:
+    """Kural sözlüğünü derlenmiş (filtre, duplikasyon) kural listelerine çevir"""
+    filters = [ProductRule.from_dict(rule) for rule in data.get('filter', [])]
+    duplicates = [ProductRule.from_dict(rule) for rule in data.get('duplicate', [])]
+    for rule in duplicates:
+        if not rule.target_kategori:
+            raise ValueError("Duplikasyon kuralında target_kategori eksik")
+    return filters, duplicates
+
+
+def load_rules_file(path: str) -> Tuple[List[ProductRule], List[ProductRule]]:
+    """JSON veya YAML kural dosyasını oku ve derle (dosya değişmedikçe cache'ten)"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _RULES_CACHE:
+        with open(path, encoding='utf-8') as f:
+            if path.lower().endswith(('.yaml', '.yml')):
+                import yaml
+                data = yaml.safe_load(f) or {}
+            else:
+                data = json.load(f)
+        _RULES_CACHE[key] = compile_rules(data)
+    return _RULES_CACHE[key]
 
 
 class ProductFilter:
     """Ürün filtreleme kuralları"""
 
-    FILTER_KEYWORDS = [
-        'Abajur', 'Halı', 'Biblo', 'Kırlent', 'Tablo', 'Sarkıt',
-        'Çerceve', 'Vazo', 'Mum', 'Obje', 'Küp', 'Saat',
-        'Lambader', 'Tabak', 'Şamdan'
-    ]
+    FILTER_RULES, DUPLICATE_RULES = compile_rules(DEFAULT_RULES)
+
+    @staticmethod
+    def load_rules(path: str):
+        """Kuralları dosyadan yükle (varsayılanların yerine geçer)"""
+        ProductFilter.FILTER_RULES, ProductFilter.DUPLICATE_RULES = load_rules_file(path)
+        print(f"[RULES] {len(ProductFilter.FILTER_RULES)} filtre, "
+              f"{len(ProductFilter.DUPLICATE_RULES)} duplikasyon kuralı: {path}")
 
     @staticmethod
     def should_filter_product(product: Dict) -> bool:
         """Ürünü filtrelemeli miyiz?"""
-        kategori = product.get('kategori', '').strip()
-        urun_adi = product.get('urun_adi', '').strip()
-        urun_adi_tam = product.get('urun_adi_tam', '').strip()
+        for rule in ProductFilter.FILTER_RULES:
+            keyword = rule.match(product)
+            if keyword is None:
+                continue
 
-        # Doğtaş Home kategorisini filtrele
-        if kategori == "Doğtaş Home":
-            print(f"[FILTER] Doğtaş Home kategorisi: {urun_adi_tam}")
+            urun_adi_tam = (product.get('urun_adi_tam') or '').strip()
+            label = rule.kategori or ("Boş kategori" if rule.kategori == "" else "Tüm kategoriler")
+            if keyword:
+                print(f"[FILTER] {label} + {keyword}: {urun_adi_tam}")
+            else:
+                print(f"[FILTER] {label} kategorisi: {urun_adi_tam}")
             return True
 
-        # Kategori boş ve ürün adı filtreleme kelimelerini içeriyorsa
-        if not kategori:
-            combined_name = f"{urun_adi} {urun_adi_tam}".lower()
-            for keyword in ProductFilter.FILTER_KEYWORDS:
-                if keyword.lower() in combined_name:
-                    print(f"[FILTER] Boş kategori + {keyword}: {urun_adi_tam}")
-                    return True
-
         return False
 
     @staticmethod
-    def apply_duplication_rules(products: List[Dict]) -> List[Dict]:
+    def duplicates(product: ProductRecord) -> List[ProductRecord]:
+        """Ürünün duplikasyon kurallarıyla üretilen kopyaları (kural sırasıyla)"""
+        result = []
+        for rule in ProductFilter.DUPLICATE_RULES:
+            if rule.match(product) is None:
+                continue
+            result.append(product.replace(kategori=rule.target_kategori))
+            print(f"[DUPLICATE] {product.get('kategori')} -> {rule.target_kategori}: {product.get('urun_adi_tam')}")
+        return result
+
+    @staticmethod
+    def apply_duplication_rules(products: List[ProductRecord]) -> List[ProductRecord]:
         """Duplikasyon kuralları uygula"""
         result = []
 
         for product in products:
             result.append(product)
+            result.extend(ProductFilter.duplicates(product))
+
+        return result
 
-            kategori = product.get('kategori', '').strip()
-            urun_adi = product.get('urun_adi', '').lower()
-            urun_adi_tam = product.get('urun_adi_tam', '').lower()
 
-            # Yemek Odası + (komodin veya ayna) kontrolü
-            if kategori == "Yemek Odası":
-                if 'komodin' in urun_adi or 'komodin' in urun_adi_tam or \
-                   'ayna' in urun_adi or 'ayna' in urun_adi_tam:
-                    duplicated = product.copy()
-                    duplicated['kategori'] = "Yatak Odası"
-                    result.append(duplicated)
-                    print(f"[DUPLICATE] Yemek Odası -> Yatak Odası: {product.get('urun_adi_tam')}")
+# read_other_xlsx: uyarıda örnek olarak gösterilen en fazla geçersiz satır
+INVALID_ROW_SAMPLES = 10
+
+
+def is_valid_sku(sku_str: str) -> bool:
+    """10 haneli ve 3 ile başlayan SKU kontrolü"""
+    return sku_str.isdigit() and len(sku_str) == 10 and sku_str.startswith('3')
 
-        return result
+
+def iter_first_column(file_path: str):
+    """Dosyanın ilk sütununu (satır no, değer) olarak akıt: xlsx, csv veya txt"""
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext in ('.csv', '.txt'):
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            if ext == '.csv':
+                for row_no, row in enumerate(csv.reader(f), 1):
+                    yield row_no, row[0] if row else None
+            else:
+                for row_no, line in enumerate(f, 1):
+                    yield row_no, line
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        for row_no, (value,) in enumerate(
+                sheet.iter_rows(min_col=1, max_col=1, values_only=True), 1):
+            yield row_no, value
+    finally:
+        workbook.close()
 
 
 def read_other_xlsx(file_path: str) -> List[str]:
-    """Other.xlsx dosyasından SKU verilerini oku"""
+    """Other.xlsx (veya csv/txt) dosyasından SKU verilerini oku
+
+    Sadece ilk sütun akış halinde okunur; SKU'lar giriş sırası korunarak tekilleştirilir.
+    xlsx'te ilk satır başlıktır; csv/txt'de ilk satır geçersizse başlık sayılır.
+    """
     try:
         if not os.path.exists(file_path):
             print(f"[ERROR] Other.xlsx bulunamadı: {file_path}")
             return []
 
-        df = pd.read_excel(file_path, engine='openpyxl')
-
-        if df.empty:
-            print("[WARNING] Other.xlsx boş")
-            return []
-
-        # İlk sütunu al
-        first_column = df.iloc[:, 0]
+        is_excel = os.path.splitext(file_path)[1].lower() not in ('.csv', '.txt')
 
         # SKU listesi
         sku_list = []
-        for value in first_column:
+        seen = set()
+        duplicates = 0
+        # Geçersiz satırlar: ilk INVALID_ROW_SAMPLES tanesi örnek, kalanı yalnızca sayılır
+        invalid_count = 0
+        invalid_rows = []
+
+        for row_no, value in iter_first_column(file_path):
+            if value is None:
+                continue
+
+            # Sayısal hücreler (3030230100 / 3030230100.0)
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
             sku_str = str(value).strip()
 
-            # 10 haneli ve 3 ile başlayan kontrolü
-            if sku_str.isdigit() and len(sku_str) == 10 and sku_str.startswith('3'):
-                sku_list.append(sku_str)
+            if row_no == 1 and (is_excel or not is_valid_sku(sku_str)):
+                continue
+            if not sku_str:
+                continue
+
+            if not is_valid_sku(sku_str):
+                invalid_count += 1
+                if len(invalid_rows) < INVALID_ROW_SAMPLES:
+                    invalid_rows.append((row_no, sku_str))
+                continue
+
+            if sku_str in seen:
+                duplicates += 1
+                continue
+
+            seen.add(sku_str)
+            sku_list.append(sku_str)
+
+        if not sku_list and not invalid_count:
+            print("[WARNING] Other.xlsx boş")
+            return []
+
+        if invalid_count:
+            print(f"[WARNING] {invalid_count} geçersiz satır atlandı")
+            for row_no, sku_str in invalid_rows:
+                print(f"          Satır {row_no}: {sku_str!r}")
+            if invalid_count > len(invalid_rows):
+                print(f"          ... ve {invalid_count - len(invalid_rows)} satır daha")
+
+        if duplicates:
+            print(f"[INFO] {duplicates} tekrarlanan SKU atlandı")
 
-        print(f"[OK] Other.xlsx'den {len(sku_list)} SKU okundu")
+        print(f"[OK] {os.path.basename(file_path)}'den {len(sku_list)} SKU okundu")
         return sku_list
 
     except Exception as e:
@@ -209,466 +526,4126 @@ def read_other_xlsx(file_path: str) -> List[str]:
         return []
 
 
-class DogtasSitemapScraper:
-    """Sitemap XML ile Doğtaş ürün scraper"""
-
-    def __init__(self, max_concurrent=2):
-        self.base_url = "https://www.dogtas.com"
-        self.max_concurrent = max_concurrent
-        self.semaphore = None
-
-        # Sitemap XML URL'leri
-        self.sitemap_urls = [
-            "https://www.dogtas.com/sitemap/products/1.xml",
-            "https://www.dogtas.com/sitemap/products/2.xml",
-            "https://www.dogtas.com/sitemap/products/3.xml",
-            "https://www.dogtas.com/sitemap/products/4.xml",
-            "https://www.dogtas.com/sitemap/products/5.xml",
-            "https://www.dogtas.com/sitemap/products/6.xml",
-        ]
+class RunMetrics:
+    """Aşama bazlı sayaçlar ve gecikme histogramları
 
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
+    Histogramlar sabit bucket'larla tutulur (Prometheus gibi); bellek kullanımı
+    ölçüm sayısından bağımsızdır. Rapor JSON ve Prometheus text formatında yazılabilir.
+    """
 
-        self.config = {
-            'initial_timeout': 20,
-            'max_timeout': 90,
-            'retry_count': 3,
-            'backoff_factor': 2,
-            'rate_limit_delay': 1,  # Sitemap için daha hızlı
-        }
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
 
-    async def get_page_async(self, session: aiohttp.ClientSession, url: str, attempt=1):
-        """Adaptive timeout ve retry logic ile asenkron sayfa çekme"""
-        max_attempts = self.config['retry_count']
-        timeout = self.config['initial_timeout'] * (self.config['backoff_factor'] ** (attempt - 1))
-        timeout = min(timeout, self.config['max_timeout'])
+    def __init__(self):
+        self.reset()
 
-        try:
-            async with self.semaphore:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-                    response.raise_for_status()
-                    html = await response.text()
-                    return BeautifulSoup(html, 'html.parser')
+    def reset(self):
+        self.started_at = time.time()
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Dict] = {}
 
-        except asyncio.TimeoutError:
-            if attempt < max_attempts:
-                wait_time = 2 ** attempt
-                print(f"[TIMEOUT] Deneme {attempt}/{max_attempts} - Bekleniyor {wait_time}s...")
-                await asyncio.sleep(wait_time)
-                return await self.get_page_async(session, url, attempt + 1)
-            else:
-                print(f"[ERROR] Timeout - Maksimum deneme: {url}")
-                return None
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
 
-        except Exception as e:
-            if attempt < max_attempts:
-                wait_time = attempt * 1.5
-                print(f"[ERROR] {e} - Tekrar deneniyor ({attempt}/{max_attempts})...")
-                await asyncio.sleep(wait_time)
-                return await self.get_page_async(session, url, attempt + 1)
-            else:
-                print(f"[ERROR] Başarısız: {url} - {e}")
-                return None
+    def inc(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
 
-    async def get_xml_async(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
-        """XML sitemap dosyasını indir"""
+    def observe(self, stage: str, seconds: float):
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms[stage] = {
+                'buckets': [0] * (len(self.BUCKETS) + 1), 'sum': 0.0, 'count': 0
+            }
+        hist['buckets'][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        hist['sum'] += seconds
+        hist['count'] += 1
+
+    @contextlib.contextmanager
+    def timer(self, stage: str):
+        """with METRICS.timer('page_fetch'): ... (await içeren bloklarda da çalışır)"""
+        start = time.perf_counter()
         try:
-            async with self.semaphore:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    response.raise_for_status()
-                    xml_content = await response.text()
-                    return xml_content
-        except Exception as e:
-            print(f"[ERROR] XML indirme hatası {url}: {e}")
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def quantile(self, stage: str, q: float) -> Optional[float]:
+        """Histogramdan yaklaşık yüzdelik (bucket üst sınırı)"""
+        hist = self.histograms.get(stage)
+        if not hist or not hist['count']:
             return None
+        rank = q * hist['count']
+        seen = 0
+        for bound, count in zip(self.BUCKETS + (float('inf'),), hist['buckets']):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def report(self) -> Dict:
+        stages = {}
+        for stage, hist in self.histograms.items():
+            stages[stage] = {
+                'count': hist['count'],
+                'sum_s': round(hist['sum'], 6),
+                'mean_s': round(hist['sum'] / hist['count'], 6) if hist['count'] else None,
+                'p50_s': self.quantile(stage, 0.50),
+                'p95_s': self.quantile(stage, 0.95),
+                'p99_s': self.quantile(stage, 0.99),
+                'buckets': {
+                    str(bound): count
+                    for bound, count in zip(self.BUCKETS + ('+Inf',), hist['buckets'])
+                },
+            }
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'duration_s': round(time.time() - self.started_at, 3),
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'stages': stages,
+        }
 
-    def find_sku_in_xml(self, xml_content: str, sku: str) -> Optional[str]:
-        """XML içinde SKU'yu ara ve URL döndür"""
-        if not xml_content:
-            return None
-
-        try:
-            # XML namespace
-            namespaces = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-
-            root = ET.fromstring(xml_content)
-
-            # Tüm <loc> etiketlerini kontrol et
-            for url_elem in root.findall('ns:url', namespaces):
-                loc_elem = url_elem.find('ns:loc', namespaces)
-                if loc_elem is not None and loc_elem.text:
-                    url = loc_elem.text.strip()
-                    # SKU URL içinde geçiyor mu?
-                    if sku in url:
-                        return url
+    def write_json(self, filepath: str, extra: Optional[Dict] = None):
+        report = self.report()
+        if extra:
+            report.update(extra)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, filepath: str):
+        """Prometheus text exposition formatı (node_exporter textfile collector için)"""
+        lines = [
+            "# HELP dogtas_run_duration_seconds Tarama süresi",
+            "# TYPE dogtas_run_duration_seconds gauge",
+            f"dogtas_run_duration_seconds {time.time() - self.started_at:.3f}",
+            "# HELP dogtas_run_timestamp_seconds Tarama başlangıcı",
+            "# TYPE dogtas_run_timestamp_seconds gauge",
+            f"dogtas_run_timestamp_seconds {self.started_at:.0f}",
+        ]
+        for name in sorted(self.counters):
+            metric = f"dogtas_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {self.counters[name]}")
+
+        for name in sorted(self.gauges):
+            metric = f"dogtas_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {self.gauges[name]:.3f}")
+
+        lines.append("# HELP dogtas_stage_seconds Aşama gecikmesi")
+        lines.append("# TYPE dogtas_stage_seconds histogram")
+        for stage in sorted(self.histograms):
+            hist = self.histograms[stage]
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS + ('+Inf',), hist['buckets']):
+                cumulative += count
+                lines.append(f'dogtas_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'dogtas_stage_seconds_sum{{stage="{stage}"}} {hist["sum"]:.6f}')
+            lines.append(f'dogtas_stage_seconds_count{{stage="{stage}"}} {hist["count"]}')
+
+        # Yarım dosya okunmasın diye önce geçici dosyaya yaz
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, filepath)
+
+    def print_summary(self):
+        if not self.histograms:
+            return
+        print(f"\n{'Aşama':<18}{'Adet':>8}{'Toplam (s)':>12}{'Ort. (ms)':>11}{'p95 (ms)':>10}")
+        for stage, hist in self.histograms.items():
+            p95 = self.quantile(stage, 0.95)
+            p95_text = f"<={p95 * 1000:.0f}" if p95 not in (None, float('inf')) else ">60000"
+            print(f"{stage:<18}{hist['count']:>8}{hist['sum']:>12.2f}"
+                  f"{hist['sum'] / hist['count'] * 1000:>11.1f}{p95_text:>10}")
+        if self.counters:
+            print("Sayaçlar: " + ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items())))
+
+
+# Tarama boyunca ölçümlerin toplandığı global kayıt
+METRICS = RunMetrics()
+
+
+class RunProfiler:
+    """--profile modu: aşama bazlı cProfile, örnekleyici yığın profili, tracemalloc
+    ve event loop gecikmesi
+
+    stage() aşama sınırını işaretler: biten aşamanın cProfile istatistikleri, CPU
+    süresi ve önceki snapshot'a göre en çok bellek ayıran satırlar saklanır.
+    Örnekleyici thread ana thread'in yığınını sample_interval'da bir okur; aşama
+    adı kök çerçeve olacak şekilde collapsed-stack (flamegraph.pl, speedscope)
+    dosyasına yazılır. Ağ beklemeleri event loop'un select çağrısında görünür.
+    Parse worker süreçleri profillenmez (süreleri html_parse aşamasındadır).
+    """
+
+    def __init__(self, output_base: str, sample_interval: float = 0.005,
+                 lag_interval: float = 0.05, top_n: int = 15):
+        self.output_base = output_base
+        self.sample_interval = sample_interval
+        self.lag_interval = lag_interval
+        self.top_n = top_n
+        self.stage_name = 'startup'
+        self.stages: List[Dict] = []
+        # collapsed yığın -> örnek sayısı
+        self.samples: Dict[str, int] = {}
+        # aşama -> [ölçüm sayısı, toplam gecikme, en büyük gecikme]
+        self.loop_lag: Dict[str, List[float]] = {}
+        self.profile = None
+        self.snapshot = None
+        self.sampler = None
+        self.stopped = None
+
+    def start(self):
+        import threading
+        import tracemalloc
+
+        tracemalloc.start()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.begin_stage()
+
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(target=self.sample_stacks, args=(threading.main_thread().ident,),
+                                        name='profile-sampler', daemon=True)
+        self.sampler.start()
+
+    def begin_stage(self):
+        import cProfile
+        self.stage_started = time.perf_counter()
+        self.stage_cpu = time.process_time()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def end_stage(self):
+        """Biten aşamanın CPU, bellek ve fonksiyon istatistiklerini sakla
+
+        Snapshot karşılaştırması pahalıdır; write()'a bırakılır, aşama sınırında
+        yalnızca snapshot alınır.
+        """
+        import tracemalloc
+
+        self.profile.disable()
+        wall = time.perf_counter() - self.stage_started
+        cpu = time.process_time() - self.stage_cpu
+        current, peak = tracemalloc.get_traced_memory()
+        self.stages.append({
+            'name': self.stage_name,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'memory_mb': current / 2**20,
+            'peak_mb': peak / 2**20,
+            'before': self.snapshot,
+            'profile': self.profile,
+        })
+        tracemalloc.reset_peak()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.stages[-1]['after'] = self.snapshot
+
+    def stage(self, name: str):
+        """Önceki aşamayı kapat, name aşamasını başlat"""
+        if name == self.stage_name:
+            return
+        self.end_stage()
+        self.stage_name = name
+        self.begin_stage()
+
+    def sample_stacks(self, thread_id: int):
+        """Örnekleyici thread: ana thread'in yığınını collapsed biçimde say"""
+        while not self.stopped.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            key = ";".join([self.stage_name] + frames[::-1])
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    async def watch_loop(self):
+        """Event loop gecikmesi: lag_interval'lık uykunun ne kadar geç uyandığı"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - start - self.lag_interval)
+            METRICS.observe('loop_lag', lag)
+            stats = self.loop_lag.setdefault(self.stage_name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += lag
+            stats[2] = max(stats[2], lag)
+
+    def stop(self):
+        """Profillemeyi bitir ve dosyaları yaz"""
+        import tracemalloc
+
+        self.stopped.set()
+        self.sampler.join()
+        self.end_stage()
+        tracemalloc.stop()
+        self.write()
+
+    def top_allocations(self, stage: Dict) -> List:
+        """Aşamada en çok bellek ayıran satırlar (tracemalloc ve import makinesi hariç)"""
+        import tracemalloc
+
+        skip = (tracemalloc.__file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>')
+        stats = stage['after'].compare_to(stage['before'], 'lineno')
+        return [stat for stat in stats if stat.traceback[0].filename not in skip][:self.top_n]
+
+    def write(self):
+        import io
+        import pstats
+
+        # Tüm aşamaların birleşik cProfile çıktısı (snakeviz, pstats ile açılır)
+        combined = pstats.Stats(self.stages[0]['profile'])
+        for stage in self.stages[1:]:
+            combined.add(stage['profile'])
+        combined.dump_stats(f"{self.output_base}.prof")
+
+        with open(f"{self.output_base}.folded", 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        lines = [f"{'Aşama':<16}{'Süre (s)':>10}{'CPU (s)':>10}{'Bellek (MB)':>13}{'Tepe (MB)':>11}"
+                 f"{'Loop lag ort/maks (ms)':>26}"]
+        for stage in self.stages:
+            lag = self.loop_lag.get(stage['name'])
+            lag_text = f"{lag[1] / lag[0] * 1000:.1f} / {lag[2] * 1000:.1f}" if lag else "-"
+            lines.append(f"{stage['name']:<16}{stage['wall_s']:>10.2f}{stage['cpu_s']:>10.2f}"
+                         f"{stage['memory_mb']:>13.1f}{stage['peak_mb']:>11.1f}{lag_text:>26}")
+        summary = "\n".join(lines)
+
+        report = [summary]
+        for stage in self.stages:
+            stream = io.StringIO()
+            stats = pstats.Stats(stage['profile'], stream=stream)
+            stats.sort_stats('tottime').print_stats(self.top_n)
+            report.append(f"\n{'='*80}\n[{stage['name']}] En çok CPU harcayan fonksiyonlar (tottime)\n{'='*80}")
+            report.append(stream.getvalue().strip())
+            report.append(f"\n[{stage['name']}] En çok bellek ayıran satırlar (aşama başına fark)")
+            for stat in self.top_allocations(stage):
+                report.append(f"  {stat}")
+
+        with open(f"{self.output_base}.txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(report) + "\n")
+
+        print(f"\n[PROFILE]\n{summary}")
+        print(f"[SAVED] Profil: {os.path.basename(self.output_base)}.txt (aşama raporu), "
+              f".prof (cProfile), .folded (flamegraph)")
+
+
+# --profile ile oluşturulur; kapalıyken aşama sınırları yalnızca None kontrolüdür
+PROFILER: Optional[RunProfiler] = None
+
+
+def profile_stage(name: str):
+    if PROFILER is not None:
+        PROFILER.stage(name)
+
+
+class TokenBucket:
+    """Asenkron token bucket hız sınırlayıcı (saniyede rate istek, capacity kadar burst)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Sunucu Retry-After bildirdiğinde tüm istekleri bu süre kadar durdur"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Bir token al, yoksa token dolana kadar bekle"""
+        wait = self.paused_until - time.monotonic()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.paused_until - time.monotonic()
+
+        if self.rate <= 0:
+            return
+
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD eşzamanlılık kontrolü (async with ile kullanılır)
+
+    Gecikme taban değerin latency_factor katının altındaki her başarılı istekte
+    limit 1/limit artar (her tam pencerede +1). 429/503 veya timeout'ta limit
+    decrease_factor ile çarpılır; art arda düşüşler cooldown ile sınırlanır.
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float,
+                 latency_factor: float = 2.0, decrease_factor: float = 0.5, cooldown: float = 2.0):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_factor = latency_factor
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    async def on_success(self, latency: float):
+        """Başarılı yanıt: gecikme sağlıklıysa limiti artır, yeni slot açıldıysa bekleyenleri uyandır"""
+        # Taban gecikme: en düşük gecikme, yavaşça yukarı kayarak güncellenir
+        if self.baseline is None:
+            self.baseline = latency
+        else:
+            self.baseline = min(latency, self.baseline * 1.01)
+
+        if latency <= self.baseline * self.latency_factor:
+            slots = int(self.limit)
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            if int(self.limit) > slots:
+                async with self.condition:
+                    self.condition.notify_all()
+        METRICS.set_gauge('concurrency_limit', self.limit)
+
+    def on_congestion(self, reason: str):
+        """429/503/timeout: limiti çarpımsal azalt"""
+        METRICS.inc(f'congestion_{reason}')
+        now = time.monotonic()
+        if now - self.last_decrease < self.cooldown:
+            return
+        self.last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        METRICS.set_gauge('concurrency_limit', self.limit)
+        print(f"[THROTTLE] {reason} - eşzamanlılık limiti {self.limit:.1f}")
+
+
+class CircuitBreaker:
+    """Art arda hatalarda tüm sayfa isteklerini durduran devre kesici
+
+    failure_threshold ardışık hatada devre açılır ve open_seconds boyunca istek
+    atılmaz. Süre dolunca tek bir deneme (probe) isteği gönderilir; başarılıysa
+    devre kapanır, başarısızsa açık kalma süresi iki katına çıkar (max_open_seconds'a kadar).
+    Probe'u bekleyenler her durum değişikliğinde (kapanma, başarısız veya yarım
+    kalan probe) uyanıp open_until'i yeniden kontrol eder.
+    """
+
+    def __init__(self, failure_threshold: int, open_seconds: float, max_open_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = open_seconds
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.probe_id = 0
+        self.closed_event = asyncio.Event()
+        self.closed_event.set()
+        # Her durum değişikliğinde set edilip yenisiyle değiştirilir
+        self.changed = asyncio.Event()
+
+    @property
+    def is_open(self) -> bool:
+        return not self.closed_event.is_set()
+
+    async def before_request(self) -> int:
+        """Devre kapalıysa hemen döner; açıksa kapanana veya probe sırası gelene kadar bekler.
+
+        Probe isteği gönderecek çağrı için probe kimliği (> 0), diğerleri için 0 döner.
+        Probe sahibi sonucu bildirmeden çıkarsa end_probe() ile probe'u bırakmalıdır.
+        """
+        while self.is_open:
+            wait = self.open_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            if not self.probing:
+                self.probing = True
+                self.probe_id += 1
+                return self.probe_id
+            await self.changed.wait()
+        return 0
+
+    def notify(self):
+        """Bekleyenleri uyandır (durumu yeniden kontrol ederler)"""
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def end_probe(self, probe_id: int):
+        """Sonuç bildirilmeden biten (iptal edilen, hata veren) probe'u bırak"""
+        if self.probing and self.probe_id == probe_id:
+            self.probing = False
+            self.notify()
+
+    def record_success(self):
+        self.failures = 0
+        if self.is_open:
+            print("[BREAKER] Deneme başarılı - istekler devam ediyor")
+            METRICS.inc('breaker_closed')
+            self.probing = False
+            self.open_seconds = self.base_open_seconds
+            self.closed_event.set()
+            self.notify()
+
+    def record_failure(self):
+        self.failures += 1
+        if self.is_open:
+            if self.probing:
+                # Probe başarısız: daha uzun süre açık kal
+                self.probing = False
+                self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+                self.open_until = time.monotonic() + self.open_seconds
+                print(f"[BREAKER] Deneme başarısız - {self.open_seconds:.0f}s bekleniyor")
+                self.notify()
+            return
+
+        if self.failures >= self.failure_threshold:
+            self.open_until = time.monotonic() + self.open_seconds
+            self.closed_event.clear()
+            METRICS.inc('breaker_opened')
+            print(f"[BREAKER] {self.failures} ardışık hata - istekler {self.open_seconds:.0f}s durduruldu")
+
+
+class ThrottledError(Exception):
+    """Sunucu 429/503 ile yavaşlamamızı istedi"""
+
+    def __init__(self, status: int, retry_after: Optional[float]):
+        super().__init__(f"HTTP {status}" + (f" (Retry-After: {retry_after:.0f}s)" if retry_after else ""))
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After başlığı: saniye veya HTTP tarihi"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # "-0000" bölgesi naive datetime döner; HTTP tarihleri her zaman UTC'dir
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class SitemapCache:
+    """Sitemap girdilerini ve ETag/Last-Modified bilgilerini SQLite'ta saklar"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # --worker süreçleri aynı cache dosyasını paylaşabilir: kilit için bekle
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sitemaps (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                lastmod TEXT,
+                fetched_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                sitemap_url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                loc TEXT NOT NULL,
+                lastmod TEXT,
+                PRIMARY KEY (sitemap_url, position)
+            ) WITHOUT ROWID;
+        """)
+
+    def load_sitemaps(self) -> Dict[str, Dict]:
+        """Cache'teki sitemap'lerin doğrulama bilgilerini döndür"""
+        rows = self.conn.execute("SELECT url, etag, last_modified, lastmod FROM sitemaps")
+        return {
+            url: {'etag': etag, 'last_modified': last_modified, 'lastmod': lastmod or ""}
+            for url, etag, last_modified, lastmod in rows
+        }
 
-            return None
+    def load_entries(self, sitemap_url: str) -> List[Tuple[str, str]]:
+        """Sitemap'in (loc, lastmod) girdilerini sırasıyla döndür"""
+        rows = self.conn.execute(
+            "SELECT loc, lastmod FROM entries WHERE sitemap_url = ? ORDER BY position",
+            (sitemap_url,)
+        )
+        return [(loc, lastmod or "") for loc, lastmod in rows]
+
+    def save_sitemap(self, sitemap_url: str, validators: Dict, lastmod: str,
+                     entries: List[Tuple[str, str]]):
+        """Sitemap girdilerini ve doğrulama bilgilerini yaz"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sitemaps VALUES (?, ?, ?, ?, ?)",
+                (sitemap_url, validators.get('etag'), validators.get('last_modified'),
+                 lastmod, time.time())
+            )
+            self.conn.execute("DELETE FROM entries WHERE sitemap_url = ?", (sitemap_url,))
+            self.conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                ((sitemap_url, pos, loc, entry_lastmod)
+                 for pos, (loc, entry_lastmod) in enumerate(entries))
+            )
+
+    def touch_sitemap(self, sitemap_url: str, lastmod: str):
+        """304 sonrası index lastmod değerini güncelle"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE sitemaps SET lastmod = ?, fetched_at = ? WHERE url = ?",
+                (lastmod, time.time(), sitemap_url)
+            )
+
+    def prune(self, keep_urls: List[str]):
+        """Artık index'te olmayan sitemap'leri sil"""
+        keep = set(keep_urls)
+        stale = [url for url in self.load_sitemaps() if url not in keep]
+        if not stale:
+            return
+        with self.conn:
+            self.conn.executemany("DELETE FROM sitemaps WHERE url = ?", ((u,) for u in stale))
+            self.conn.executemany("DELETE FROM entries WHERE sitemap_url = ?", ((u,) for u in stale))
+
+    def close(self):
+        self.conn.close()
+
+
+class PageCache:
+    """Ürün sayfası yanıt cache'i (SQLite)
+
+    Gövdeler sıkıştırılmış olarak içerik hash'i ile (content-addressed) saklanır;
+    her URL için ETag/Last-Modified, gövde hash'i ve çıkarılmış kayıt tutulur.
+    Akışla kesilen sayfaların yalnızca hash'i tutulur, gövdesi saklanmaz.
+    Toplam gövde boyutu max_bytes'ı aşınca en uzun süredir kullanılmayan URL'ler silinir.
+    """
+
+    def __init__(self, db_path: str, ttl: float, max_bytes: int):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # --worker süreçleri aynı cache dosyasını paylaşabilir: kilit için bekle
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                record TEXT,
+                extractor TEXT,
+                fetched_at REAL,
+                accessed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+            CREATE TABLE IF NOT EXISTS bodies (
+                hash TEXT PRIMARY KEY,
+                data BLOB,
+                size INTEGER
+            ) WITHOUT ROWID;
+        """)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
 
-        except Exception as e:
-            print(f"[ERROR] XML parse hatası: {e}")
+    @staticmethod
+    def body_hash(html: str) -> str:
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """URL'in cache bilgisini döndür (fresh: TTL içinde mi)"""
+        row = self.conn.execute(
+            "SELECT etag, last_modified, body_hash, record, extractor, fetched_at FROM pages WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if not row:
             return None
 
-    async def search_sku_in_sitemaps(self, session: aiohttp.ClientSession, sku: str) -> Optional[str]:
-        """SKU'yu tüm sitemap XML'lerinde ara (1-6)"""
-        for idx, sitemap_url in enumerate(self.sitemap_urls, 1):
-            try:
-                # XML indir
-                xml_content = await self.get_xml_async(session, sitemap_url)
-
-                if xml_content:
-                    # SKU'yu ara
-                    product_url = self.find_sku_in_xml(xml_content, sku)
+        etag, last_modified, body_hash, record, extractor, fetched_at = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body_hash': body_hash,
+            'record': load_record(record),
+            'extractor': extractor,
+            'fresh': self.ttl > 0 and time.time() - fetched_at < self.ttl,
+        }
 
-                    if product_url:
-                        print(f"[XML-{idx}]", end=" ")
-                        return product_url
+    def load_body(self, body_hash: str) -> Optional[str]:
+        row = self.conn.execute("SELECT data FROM bodies WHERE hash = ?", (body_hash,)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def touch(self, url: str, revalidated: bool = False, validators: Optional[Dict] = None):
+        """Kullanım zamanını (ve yeniden doğrulandıysa fetched_at'i) güncelle
+
+        validators verilirse son yanıtın ETag/Last-Modified değerleri de yazılır.
+        """
+        now = time.time()
+        with self.conn:
+            if validators is not None:
+                self.conn.execute(
+                    "UPDATE pages SET accessed_at = ?, fetched_at = ?, etag = ?, last_modified = ? WHERE url = ?",
+                    (now, now, validators.get('etag'), validators.get('last_modified'), url)
+                )
+            elif revalidated:
+                self.conn.execute("UPDATE pages SET accessed_at = ?, fetched_at = ? WHERE url = ?",
+                                  (now, now, url))
+            else:
+                self.conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+
+    def store(self, url: str, validators: Dict, html: str, body_hash: str,
+              record: Optional[Dict], extractor: str, partial: bool = False):
+        """Yanıtı ve çıkarılmış kaydı yaz, gerekirse LRU tahliyesi yap
+
+        partial=True ise html sayfa başıdır (PagePrefix): tam gövde gibi saklanmaz,
+        backend değişince load_body None döner ve sayfa yeniden çekilir.
+        """
+        now = time.time()
+        with self.conn:
+            exists = partial or self.conn.execute(
+                "SELECT 1 FROM bodies WHERE hash = ?", (body_hash,)).fetchone()
+            if not exists:
+                data = zlib.compress(html.encode('utf-8'))
+                self.conn.execute("INSERT INTO bodies VALUES (?, ?, ?)", (body_hash, data, len(data)))
+                self.total_bytes += len(data)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, validators.get('etag'), validators.get('last_modified'), body_hash,
+                 dump_record(record), extractor, now, now)
+            )
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Toplam boyut sınırın %90'ına inene kadar en eski kullanılan URL'leri sil"""
+        target = self.max_bytes * 0.9
+        with self.conn:
+            while self.total_bytes > target:
+                urls = [row[0] for row in self.conn.execute(
+                    "SELECT url FROM pages ORDER BY accessed_at LIMIT 100")]
+                if not urls:
+                    break
+                self.conn.executemany("DELETE FROM pages WHERE url = ?", ((u,) for u in urls))
+                self.conn.execute(
+                    "DELETE FROM bodies WHERE hash NOT IN (SELECT body_hash FROM pages WHERE body_hash IS NOT NULL)"
+                )
+                self.total_bytes = self.conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class RunJournal:
+    """SKU sonuçlarını JSONL dosyasına ekleyen journal
+
+    İlk satır kayıt modudur ({"mode": "record"} veya "batch": ham kayıtlar), sonraki
+    her satır bir SKU sonucudur; fsync her fsync_every kayıtta veya fsync_interval
+    saniyede bir yapılır. resume=True ise mevcut journal okunur ve tamamlanmış
+    SKU'lar completed içinde tutulur, aksi halde journal sıfırlanır.
+    """
+
+    def __init__(self, path: str, resume: bool = False, mode: str = 'record',
+                 fsync_every: int = 50, fsync_interval: float = 2.0):
+        self.path = path
+        self.mode = mode
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.completed: Dict[str, Dict] = self.load(path) if resume else {}
+        if resume:
+            self.truncate_partial_line(path)
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        if self.file.tell() == 0:
+            self.file.write(json.dumps({'mode': mode}) + "\n")
 
-                # Kısa bekleme
-                await asyncio.sleep(0.5)
+    @staticmethod
+    def truncate_partial_line(path: str):
+        """Çökmede yarım kalan son satırı sil; yeni kayıtlar ona eklenip bozulmasın"""
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if not end:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Son tam satırın sonunu geriye doğru parça parça ara
+            position = end
+            while position > 0:
+                step = min(64 * 1024, position)
+                f.seek(position - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline >= 0:
+                    f.truncate(position - step + newline + 1)
+                    return
+                position -= step
+            f.truncate(0)
 
-            except Exception as e:
-                print(f"[ERROR] Sitemap {idx} hatası: {e}")
-                continue
+    @staticmethod
+    def read_mode(path: str) -> Optional[str]:
+        """Journal'ın kayıt modu; mod satırı olmayan eski journal'larda ilk kayıttan çıkarılır"""
+        if not os.path.exists(path):
+            return None
 
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if 'mode' in entry:
+                    return entry['mode']
+                if entry.get('record'):
+                    return 'record' if 'LISTE' in entry['record'] else 'batch'
         return None
 
-    def baslik_ayikla(self, baslik_etiketi):
-        """Başlık etiketinden koleksiyon adını ve ürün adını ayıklar"""
-        if not baslik_etiketi:
-            return "", ""
+    @staticmethod
+    def load(path: str) -> Dict[str, Dict]:
+        """Journal'daki tamamlanmış SKU'ları döndür (aynı SKU için son satır geçerli)"""
+        entries = {}
+        if not os.path.exists(path):
+            return entries
+
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Çökme sırasında yarım kalmış son satır
+                    continue
+                if 'sku' not in entry:
+                    continue
+                entry['record'] = record_from_json(entry['record'])
+                entries[entry['sku']] = entry
+
+        return {sku: entry for sku, entry in entries.items() if entry['status'] in COMPLETED_OUTCOMES}
+
+    def record(self, sku: str, status: str, record: Optional[Dict]):
+        """SKU sonucunu journal'a ekle"""
+        entry = {'sku': sku, 'status': status, 'record': record, 'ts': time.time()}
+        self.file.write(json.dumps(entry, ensure_ascii=False, default=json_default) + "\n")
+        self.pending += 1
+
+        if self.pending >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.flush()
+
+    def flush(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+class DeltaStore:
+    """--delta modu için SKU başına son sonuç (SQLite)
+
+    Her SKU için ürün URL'i, tarandığı andaki sitemap <lastmod> değeri, sonuç
+    durumu ve kayıt saklanır. Sonraki çalıştırmada lastmod'u değişmemiş ürünler
+    tekrar çekilmez, kayıtları buradan alınır.
+    """
+
+    def __init__(self, db_path: str, commit_every: int = 100):
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self.pending = 0
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS skus (
+                sku TEXT PRIMARY KEY,
+                url TEXT,
+                lastmod TEXT,
+                status TEXT,
+                record TEXT,
+                kind TEXT,
+                scraped_at REAL
+            ) WITHOUT ROWID;
+        """)
+
+    def get(self, sku: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT url, lastmod, status, record, kind FROM skus WHERE sku = ?", (sku,)
+        ).fetchone()
+        if not row:
+            return None
 
-        koleksiyon_adi = ""
-        span_etiketi = baslik_etiketi.find('span')
-        if span_etiketi:
-            koleksiyon_adi = span_etiketi.get_text(strip=True)
+        url, lastmod, status, record, kind = row
+        return {
+            'url': url,
+            'lastmod': lastmod or "",
+            'status': status,
+            'record': load_record(record),
+            'kind': kind,
+        }
 
-        urun_adi = ""
-        if span_etiketi and span_etiketi.next_sibling:
-            urun_adi = span_etiketi.next_sibling.strip()
-        elif baslik_etiketi:
-            urun_adi = baslik_etiketi.get_text(strip=True)
+    def update(self, sku: str, url: str, lastmod: str, status: str, record: Optional[Dict], kind: str):
+        """SKU sonucunu yaz (commit her commit_every kayıtta bir)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO skus VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (sku, url, lastmod, status, dump_record(record),
+             kind, time.time())
+        )
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def record_prices(record: Optional[Dict]) -> Tuple[Optional[int], Optional[int]]:
+    """Kaydın (LISTE, PERAKENDE) fiyatları; --batch modundaki ham kayıtlar önce validate edilir"""
+    if not record:
+        return None, None
+    if 'LISTE' not in record:
+        record = DataValidator.validate_product_data(record)
+    return record.get('LISTE'), record.get('PERAKENDE')
+
+
+def price_change(sku: str, old: Optional[Dict], new: Dict) -> Optional[Dict]:
+    """Yeni ürün veya fiyatı değişen ürün için rapor satırı, değişiklik yoksa None"""
+    old_liste, old_perakende = record_prices(old)
+    new_liste, new_perakende = record_prices(new)
+
+    if old and (old_liste, old_perakende) == (new_liste, new_perakende):
+        return None
 
-        return koleksiyon_adi, urun_adi
+    return {
+        'sku': sku,
+        'urun_adi_tam': new.get('urun_adi_tam'),
+        'eski_LISTE': old_liste,
+        'yeni_LISTE': new_liste,
+        'eski_PERAKENDE': old_perakende,
+        'yeni_PERAKENDE': new_perakende,
+        'durum': "değişti" if old else "yeni",
+    }
+
+
+class WorkQueue:
+    """Paylaşılan SQLite iş kuyruğu (--coordinator / --worker / --merge)
+
+    SKU'lar giriş sırasıyla yüklenir. Worker'lar batch'leri süreli kiralar (lease),
+    çalıştıkça heartbeat ile uzatır ve sonuçları geri yazar; süresi dolan kiralar
+    (çöken/duran worker) başka worker'a verilir. Dosya başka makinelerle paylaşılan
+    bir dizinde de kullanılabilsin diye WAL yerine varsayılan rollback journal kullanılır.
+    Worker event loop'u bloklamamak için metotları asyncio.to_thread ile çağırır;
+    bağlantı lock ile tek thread'e sıralanır.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 60.0):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        # isolation_level=None: işlemler BEGIN IMMEDIATE ile açıkça başlatılır
+        self.conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                position INTEGER PRIMARY KEY,
+                sku TEXT NOT NULL,
+                status TEXT NOT NULL,
+                outcome TEXT,
+                record TEXT,
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS items_status ON items (status, position);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Yazma kilidini baştan alan işlem (eşzamanlı claim'ler aynı satırı alamaz)"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def load(self, sku_list: List[str], meta: Dict[str, str]):
+        """Kuyruğu sıfırla ve SKU listesini yükle"""
+        with self.transaction():
+            self.conn.execute("DELETE FROM items")
+            self.conn.execute("DELETE FROM meta")
+            self.conn.executemany(
+                "INSERT INTO items (position, sku, status) VALUES (?, ?, 'pending')",
+                enumerate(sku_list)
+            )
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def claim(self, worker_id: str, batch_size: int, lease_seconds: float) -> List[Tuple[int, str]]:
+        """Bekleyen veya kirası dolmuş en fazla batch_size SKU'yu kirala"""
+        now = time.time()
+        with self.transaction():
+            batch = self.conn.execute(
+                "SELECT position, sku FROM items "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY position LIMIT ?",
+                (now, batch_size)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE items SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE position = ?",
+                ((worker_id, now + lease_seconds, position) for position, _ in batch)
+            )
+        return batch
+
+    def heartbeat(self, worker_id: str, lease_seconds: float):
+        """Worker'ın tüm kiralarını uzat"""
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE items SET lease_until = ? WHERE status = 'leased' AND worker = ?",
+                (time.time() + lease_seconds, worker_id)
+            )
+
+    def complete(self, worker_id: str, results: List[Tuple[int, str, Optional[Dict]]], max_attempts: int):
+        """Sonuçları yaz; başarısız SKU'lar max_attempts'e kadar kuyruğa geri döner"""
+        with self.transaction():
+            for position, outcome, record in results:
+                if outcome == OUTCOME_FAILED:
+                    self.conn.execute(
+                        "UPDATE items SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'done' END, "
+                        "outcome = ?, worker = NULL, lease_until = NULL "
+                        "WHERE position = ? AND status = 'leased' AND worker = ?",
+                        (max_attempts, outcome, position, worker_id)
+                    )
+                else:
+                    # Kira başka worker'a geçmiş olsa da sonuç geçerli; ilk yazan kazanır
+                    self.conn.execute(
+                        "UPDATE items SET status = 'done', outcome = ?, record = ?, worker = NULL, "
+                        "lease_until = NULL WHERE position = ? AND status != 'done'",
+                        (outcome, dump_record(record), position)
+                    )
+
+    def set_outcomes(self, skus: List[str], outcomes: List[str]) -> List[Tuple[str, str]]:
+        """--batch birleştirmesi: OUTCOME_FOUND dışına çıkan SKU'ların sonucunu yaz,
+        (sku, sonuç) listesini döndür"""
+        changed = list({
+            sku: outcome for sku, outcome in zip(skus, outcomes) if outcome != OUTCOME_FOUND
+        }.items())
+        with self.transaction():
+            self.conn.executemany(
+                "UPDATE items SET outcome = ?, record = NULL WHERE sku = ?",
+                ((outcome, sku) for sku, outcome in changed)
+            )
+        return changed
+
+    def progress(self) -> Dict[str, int]:
+        """Durum başına SKU sayısı (pending / leased / done)"""
+        with self.lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status"))
+
+    def unfinished(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM items WHERE status != 'done'").fetchone()[0]
+
+    def results(self):
+        """(sku, durum, sonuç, kayıt) giriş sırasıyla"""
+        rows = self.conn.execute("SELECT sku, status, outcome, record FROM items ORDER BY position")
+        for sku, status, outcome, record in rows:
+            yield sku, status, outcome, load_record(record)
+
+    def close(self):
+        self.conn.close()
+
+
+class HttpArchive:
+    """--record / --replay için HTTP yanıt arşivi (SQLite, gövdeler zlib ile)
+
+    Kayıt modunda get_page_async ve get_xml_async'in aldığı her yanıt (durum,
+    başlıklar, gövde, ilk byte ve toplam süre) veya hata (timeout, aiohttp istisnası)
+    geliş sırasıyla yazılır. Replay modunda aynı URL'in yanıtları kayıt sırasıyla
+    geri verilir, tükenince son yanıt tekrarlanır. timing='original' ise kayıttaki
+    gecikmeler beklenir, 'fast' ise beklenmez.
+    """
+
+    def __init__(self, path: str, mode: str, timing: str = 'original', commit_every: int = 100):
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.commit_every = commit_every
+        self.pending = 0
+
+        if mode == 'record' and os.path.exists(path):
+            os.remove(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                seq INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER,
+                reason TEXT,
+                headers TEXT,
+                charset TEXT,
+                encoding TEXT,
+                body BLOB,
+                ttfb REAL,
+                elapsed REAL,
+                error TEXT
+            );
+        """)
+
+        # Replay: URL -> kayıt sırası listesi ve sıradaki yanıtın konumu
+        self.sequences: Dict[str, List[int]] = {}
+        self.cursors: Dict[str, int] = {}
+        if mode == 'replay':
+            for seq, url in self.conn.execute("SELECT seq, url FROM responses ORDER BY seq"):
+                self.sequences.setdefault(url, []).append(seq)
+
+    def add(self, url: str, status: Optional[int] = None, reason: str = "", headers=(),
+            charset: Optional[str] = None, encoding: Optional[str] = None, body: bytes = b"",
+            ttfb: float = 0.0, elapsed: float = 0.0, error: Optional[str] = None):
+        self.conn.execute(
+            "INSERT INTO responses (url, status, reason, headers, charset, encoding, body, ttfb, elapsed, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, status, reason, json.dumps(list(headers), ensure_ascii=False), charset, encoding,
+             zlib.compress(body), ttfb, elapsed, error)
+        )
+        METRICS.inc('archive_recorded')
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.flush()
+
+    def next_entry(self, url: str) -> Optional[Dict]:
+        """URL'in sıradaki kayıtlı yanıtı (arşivde yoksa None)"""
+        sequence = self.sequences.get(url)
+        if not sequence:
+            return None
+        position = self.cursors.get(url, 0)
+        self.cursors[url] = position + 1
+        seq = sequence[min(position, len(sequence) - 1)]
+
+        status, reason, headers, charset, encoding, body, ttfb, elapsed, error = self.conn.execute(
+            "SELECT status, reason, headers, charset, encoding, body, ttfb, elapsed, error "
+            "FROM responses WHERE seq = ?", (seq,)
+        ).fetchone()
+        return {
+            'status': status,
+            'reason': reason,
+            'headers': [tuple(pair) for pair in json.loads(headers)],
+            'charset': charset,
+            'encoding': encoding,
+            'body': zlib.decompress(body),
+            'ttfb': ttfb,
+            'elapsed': elapsed,
+            'error': error,
+        }
 
-    async def get_product_detail_async(self, session: aiohttp.ClientSession, url: str):
-        """Asenkron ürün detay çekme"""
+    def wrap(self, session):
+        """HTTP oturumunu moda göre kaydeden veya arşivden yanıtlayan oturumla sar"""
+        if self.mode == 'record':
+            return RecordingSession(session, self)
+        return ReplaySession(session, self)
+
+    def flush(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class ArchivedResponse:
+    """Arşivdeki yanıt; get_page_async/get_xml_async'in kullandığı aiohttp yanıt arayüzü"""
+
+    def __init__(self, url: str, status: int, reason: str, headers, body: bytes,
+                 charset: Optional[str], encoding: Optional[str], body_delay: float = 0.0):
+        from multidict import CIMultiDict, CIMultiDictProxy
+
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.body = body
+        self.content_length = len(body)
+        self.charset = charset
+        self.encoding = encoding or 'utf-8'
+        # Gövdenin ilk byte'tan sonra gelme süresi (replay timing='original')
+        self.body_delay = body_delay
+        self.content = self
+        # Akışla okunan byte sayısı (kesilen yanıtın kalanı buradan devam eder)
+        self.position = 0
+
+    async def wait_body(self):
+        if self.body_delay > 0:
+            await asyncio.sleep(self.body_delay)
+            self.body_delay = 0.0
+
+    async def read(self) -> bytes:
+        await self.wait_body()
+        return self.body
+
+    async def iter_chunked(self, size: int):
+        await self.wait_body()
+        while self.position < len(self.body):
+            chunk = self.body[self.position:self.position + size]
+            self.position += len(chunk)
+            yield chunk
+
+    def get_encoding(self) -> str:
+        return self.encoding
+
+    def raise_for_status(self):
+        import aiohttp
+        from multidict import CIMultiDict, CIMultiDictProxy
+        from yarl import URL
+
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(URL(self.url), 'GET', CIMultiDictProxy(CIMultiDict()), URL(self.url))
+            raise aiohttp.ClientResponseError(request_info, (), status=self.status, message=self.reason,
+                                              headers=self.headers)
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingSession:
+    """Gerçek oturumla istek atıp yanıtları HttpArchive'a yazan oturum
+
+    Gövde her zaman tamamen okunur (akışla kesilen sayfalar da arşivde tam olur);
+    çağırana aynı gövdeyi veren ArchivedResponse döner.
+    """
+
+    def __init__(self, session, archive: HttpArchive):
+        self.session = session
+        self.archive = archive
+
+    @contextlib.asynccontextmanager
+    async def get(self, url: str, **kwargs):
+        import aiohttp
+
+        start = time.perf_counter()
         try:
-            soup = await self.get_page_async(session, url)
-            if not soup:
-                return None
+            async with self.session.get(url, **kwargs) as response:
+                ttfb = time.perf_counter() - start
+                body = await response.read()
+                archived = ArchivedResponse(url, response.status, response.reason or "",
+                                            list(response.headers.items()), body,
+                                            response.charset, response.get_encoding())
+                self.archive.add(url, response.status, archived.reason, response.headers.items(),
+                                 response.charset, archived.encoding, body, ttfb,
+                                 time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            self.archive.add(url, error='timeout', elapsed=time.perf_counter() - start)
+            raise
+        except aiohttp.ClientError as e:
+            # Hata türü de yazılır: replay aynı aiohttp istisnasını üretir
+            self.archive.add(url, error=f"{type(e).__name__}: {e}", elapsed=time.perf_counter() - start)
+            raise
+        yield archived
 
-            veri = {
-                'KOLEKSIYON': "",
-                'urun_adi': "",
-                'urun_adi_tam': "",
-                'sku': "",
-                'orijinal_fiyat': "",
-                'fiyat': "",
-                'kategori': "",
-                'marka': "",
-                'urun_url': url
-            }
+    def __getattr__(self, name):
+        return getattr(self.session, name)
 
-            # Başlık
-            baslik_etiketi = soup.find('h1', class_='title')
-            veri['KOLEKSIYON'], veri['urun_adi'] = self.baslik_ayikla(baslik_etiketi)
 
-            # Tam ürün adı oluştur
-            if veri['KOLEKSIYON'] and veri['urun_adi']:
-                veri['urun_adi_tam'] = f"{veri['KOLEKSIYON']} {veri['urun_adi']}"
-            else:
-                veri['urun_adi_tam'] = veri['urun_adi']
+class ReplaySession:
+    """İstekleri ağa çıkmadan HttpArchive'dan yanıtlayan oturum
 
-            # Eger sadece koleksiyon varsa ve ürün adı yoksa, None dön
-            if veri['KOLEKSIYON'] and not veri['urun_adi']:
-                return None
+    Arşivde olmayan URL'ler 404 olarak döner (replay_misses sayacı).
+    """
 
-            # SKU
-            sku_etiketi = soup.find(class_='sku')
-            if sku_etiketi:
-                sku_metni = sku_etiketi.get_text(strip=True)
-                sku_eslesme = re.search(r'(\d+)', sku_metni)
-                veri['sku'] = sku_eslesme.group(1) if sku_eslesme else ""
-
-            # Kategori (breadcrumb)
-            breadcrumb_elem = soup.find('ol', class_='breadcrumb')
-            if breadcrumb_elem:
-                breadcrumb_items = []
-                for li in breadcrumb_elem.find_all('li'):
-                    text = li.get_text(strip=True)
-                    if text and text not in ['Ana Sayfa', 'Home']:
-                        breadcrumb_items.append(text)
-
-                if len(breadcrumb_items) >= 1:
-                    veri['kategori'] = breadcrumb_items[0]
-
-            # Marka (JSON-LD)
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            for script in json_ld_scripts:
+    def __init__(self, session, archive: HttpArchive):
+        self.session = session
+        self.archive = archive
+
+    @staticmethod
+    def archived_error(error: str) -> Exception:
+        """Arşivdeki "Tür: mesaj" hatasından aiohttp istisnasını kur
+
+        Yalnızca mesajla kurulamayan türlerde (ör. ClientConnectorError) en yakın
+        üst sınıf kullanılır; tür adı olmayan eski kayıtlar ClientConnectionError olur.
+        """
+        import aiohttp
+
+        name, _, message = error.partition(': ')
+        error_class = getattr(aiohttp, name, None)
+        if not (isinstance(error_class, type) and issubclass(error_class, aiohttp.ClientError)):
+            error_class, message = aiohttp.ClientConnectionError, error
+        for base in error_class.__mro__:
+            if issubclass(base, aiohttp.ClientError):
                 try:
-                    data = json.loads(script.string)
-                    if data.get('@type') == 'Product':
-                        if 'brand' in data:
-                            brand_info = data['brand']
-                            if isinstance(brand_info, dict):
-                                veri['marka'] = brand_info.get('name', '')
-                            else:
-                                veri['marka'] = str(brand_info)
-                        break
-                except:
+                    exception = base(message)
+                    str(exception)
+                    return exception
+                except (TypeError, AttributeError):
                     continue
+        return aiohttp.ClientError(message)
+
+    @contextlib.asynccontextmanager
+    async def get(self, url: str, **kwargs):
+        entry = self.archive.next_entry(url)
+        if entry is None:
+            METRICS.inc('replay_misses')
+            yield ArchivedResponse(url, 404, "Not in archive", [], b"", None, None)
+            return
+
+        METRICS.inc('replay_hits')
+        original = self.archive.timing == 'original'
+        if entry['error']:
+            if original:
+                await asyncio.sleep(entry['elapsed'])
+            if entry['error'] == 'timeout':
+                raise asyncio.TimeoutError()
+            raise self.archived_error(entry['error'])
+
+        if original:
+            await asyncio.sleep(entry['ttfb'])
+        yield ArchivedResponse(url, entry['status'], entry['reason'], entry['headers'], entry['body'],
+                               entry['charset'], entry['encoding'],
+                               entry['elapsed'] - entry['ttfb'] if original else 0.0)
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class SitemapStreamParser:
+    """Sitemap XML'ini parça parça parse eden artımlı parser
+
+    feed() her parçadan tamamlanan (loc, lastmod) çiftlerini döndürür ve işlenen
+    elemanları temizler; bellek kullanımı sitemap boyutundan bağımsız kalır.
+    """
+
+    def __init__(self, tag: str = 'url'):
+        import xml.etree.ElementTree as ET
+
+        self.parser = ET.XMLPullParser(events=('start', 'end'))
+        self.root = None
+        ns = SITEMAP_NAMESPACES['ns']
+        self.item_tag = f'{{{ns}}}{tag}'
+        self.loc_tag = f'{{{ns}}}loc'
+        self.lastmod_tag = f'{{{ns}}}lastmod'
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, str]]:
+        self.parser.feed(chunk)
+        return self._collect()
+
+    def close(self) -> List[Tuple[str, str]]:
+        self.parser.close()
+        return self._collect()
+
+    def _collect(self) -> List[Tuple[str, str]]:
+        entries = []
+        for event, elem in self.parser.read_events():
+            if event == 'start':
+                if self.root is None:
+                    self.root = elem
+                continue
 
-            # FIYAT DETAYLARI
-            # Orijinal fiyat
-            original_price_elem = soup.select_one('.sale-price.sale-variant-price, .sale-price.blc')
-            if original_price_elem:
-                veri['orijinal_fiyat'] = original_price_elem.get_text(strip=True)
-
-            # İndirimli fiyat
-            discount_price_elem = soup.select_one('.discount-price, .new-sale-price')
-            if discount_price_elem:
-                veri['fiyat'] = discount_price_elem.get_text(strip=True)
-
-            # Eger indirimli fiyat yoksa, orijinal fiyatı kullan
-            if not veri['fiyat'] and veri['orijinal_fiyat']:
-                veri['fiyat'] = veri['orijinal_fiyat']
-
-            # Hala fiyat yoksa, kapsamlı arama
-            if not veri['fiyat']:
-                all_prices = soup.find_all(class_=lambda x: x and 'price' in x.lower())
-                for p in all_prices:
-                    text = p.get_text(strip=True)
-                    if 'TL' in text and any(c.isdigit() for c in text):
-                        veri['fiyat'] = text
-                        break
-
-            # VALIDASYON
-            validated_veri = DataValidator.validate_product_data(veri)
+            if elem.tag != self.item_tag:
+                continue
 
-            # BOŞ ÜRÜN KONTROLÜ
-            if not validated_veri.get('urun_adi_tam') or not validated_veri.get('urun_adi_tam').strip():
-                return None
+            loc = elem.findtext(self.loc_tag)
+            if loc and loc.strip():
+                lastmod = elem.findtext(self.lastmod_tag) or ""
+                entries.append((loc.strip(), lastmod.strip()))
 
-            return validated_veri
+            # İşlenen elemanı ve kökteki referansını bırak
+            elem.clear()
+            self.root.clear()
+        return entries
 
-        except Exception as e:
-            print(f"[ERROR] Ürün detay hatası {url}: {str(e)}")
-            return None
 
-    async def search_and_scrape_sku(self, session: aiohttp.ClientSession, sku: str):
-        """SKU ile sitemap XML'lerinde ara ve ürün detayını çek"""
-        try:
-            print(f"[SEARCH] SKU: {sku}", end=" ")
+class ProductExtractor(ABC):
+    """Ürün sayfası HTML'inden veri çıkaran backend'lerin ortak akışı
 
-            # Sitemap XML'lerinde ara (1-6)
-            product_url = await self.search_sku_in_sitemaps(session, sku)
+    Alt sınıflar parse() ile dokümanı oluşturur ve alan bazlı metotları uygular;
+    kayıt birleştirme ve validasyon bu sınıfta tek yerdedir.
+    """
 
-            if not product_url:
-                print("- Ürün bulunamadı")
-                return None
+    name = ""
 
-            print(f"- Link bulundu", end=" ")
+    BREADCRUMB_SKIP = ['Ana Sayfa', 'Home']
 
-            # Ürün detayını çek
-            result = await self.get_product_detail_async(session, product_url)
+    # Sayfa başından (PagePrefix) çıkarılan kayıtta dolu olması gereken alanlar.
+    # marka validasyonda atıldığı için JSON-LD beklenmez.
+    PREFIX_REQUIRED_FIELDS = ('urun_adi', 'sku', 'kategori', 'orijinal_fiyat', 'fiyat')
 
-            if result:
-                # Filtreleme kontrolü
-                if not ProductFilter.should_filter_product(result):
-                    print(f"- OK: {result.get('urun_adi_tam')}")
-                    return result
-                else:
-                    print(f"- Filtrelendi")
-                    return None
-            else:
-                print("- Detay çekilemedi")
-                return None
+    @abstractmethod
+    def parse(self, html: str):
+        """HTML'den backend dokümanını oluştur"""
 
-        except Exception as e:
-            print(f"[ERROR] SKU {sku} arama hatası: {e}")
-            return None
+    @abstractmethod
+    def title(self, doc) -> Optional[Tuple[str, str]]:
+        """(koleksiyon, ürün adı); başlık ayıklanamıyorsa None"""
 
-    async def scrape_from_sku_list_async(self, sku_list: List[str]):
-        """SKU listesinden ürünleri çek"""
-        if not sku_list:
-            print("[INFO] SKU listesi boş")
-            return []
+    @abstractmethod
+    def sku_text(self, doc) -> Optional[str]:
+        """.sku elemanının metni"""
 
-        print(f"\n{'='*80}")
-        print(f"OTHER.XLSX TARAMASI")
-        print(f"{'='*80}")
-        print(f"[INFO] {len(sku_list)} SKU taranacak...")
+    @abstractmethod
+    def breadcrumb_texts(self, doc) -> List[str]:
+        """Breadcrumb li metinleri"""
 
-        products = []
-        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+    @abstractmethod
+    def json_ld_texts(self, doc) -> List[Optional[str]]:
+        """application/ld+json script içerikleri"""
 
-        connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
-        timeout = aiohttp.ClientTimeout(total=60)
+    @abstractmethod
+    def original_price_text(self, doc) -> Optional[str]:
+        """Orijinal (liste) fiyat metni"""
 
-        async with aiohttp.ClientSession(
-            headers=self.headers,
-            connector=connector,
-            timeout=timeout
-        ) as session:
+    @abstractmethod
+    def discount_price_text(self, doc) -> Optional[str]:
+        """İndirimli fiyat metni"""
 
-            for idx, sku in enumerate(sku_list, 1):
-                print(f"[{idx}/{len(sku_list)}] ", end="")
+    @abstractmethod
+    def price_texts(self, doc):
+        """Sınıfında 'price' geçen tüm elemanların metinleri (doküman sırasında)"""
 
-                result = await self.search_and_scrape_sku(session, sku)
+    def extract(self, html: str, url: str) -> Optional[Dict]:
+        """Ham ürün verisini çıkar (validasyon öncesi)"""
+        doc = self.parse(html)
 
-                if result:
-                    products.append(result)
+        veri = {
+            'KOLEKSIYON': "",
+            'urun_adi': "",
+            'urun_adi_tam': "",
+            'sku': "",
+            'orijinal_fiyat': "",
+            'fiyat': "",
+            'kategori': "",
+            'marka': "",
+            'urun_url': url
+        }
 
-                # SKU arası bekleme
-                await asyncio.sleep(self.config['rate_limit_delay'])
+        # Başlık
+        baslik = self.title(doc)
+        if baslik is None:
+            return None
+        veri['KOLEKSIYON'], veri['urun_adi'] = baslik
 
-        print(f"\n[OK] Tarama tamamlandı")
-        print(f"     Toplam: {len(products)} ürün bulundu")
+        # Tam ürün adı oluştur
+        if veri['KOLEKSIYON'] and veri['urun_adi']:
+            veri['urun_adi_tam'] = f"{veri['KOLEKSIYON']} {veri['urun_adi']}"
+        else:
+            veri['urun_adi_tam'] = veri['urun_adi']
 
-        return products
+        # Eger sadece koleksiyon varsa ve ürün adı yoksa, None dön
+        if veri['KOLEKSIYON'] and not veri['urun_adi']:
+            return None
 
+        # SKU
+        sku_metni = self.sku_text(doc)
+        if sku_metni is not None:
+            sku_eslesme = re.search(r'(\d+)', sku_metni)
+            veri['sku'] = sku_eslesme.group(1) if sku_eslesme else ""
 
-def save_to_excel(products: List[Dict], filepath: str):
-    """Ürünleri Excel'e kaydet"""
-    if not products:
-        print("[WARNING] Kaydedilecek ürün yok")
-        return
+        # Kategori (breadcrumb)
+        breadcrumb_items = [
+            text for text in self.breadcrumb_texts(doc)
+            if text and text not in self.BREADCRUMB_SKIP
+        ]
+        if len(breadcrumb_items) >= 1:
+            veri['kategori'] = breadcrumb_items[0]
 
-    # DataFrame oluştur
-    df = pd.DataFrame(products)
+        # Marka (JSON-LD)
+        for script_text in self.json_ld_texts(doc):
+            try:
+                data = json.loads(script_text)
+                if data.get('@type') == 'Product':
+                    if 'brand' in data:
+                        brand_info = data['brand']
+                        if isinstance(brand_info, dict):
+                            veri['marka'] = brand_info.get('name', '')
+                        else:
+                            veri['marka'] = str(brand_info)
+                    break
+            except:
+                continue
 
-    # urun_adi_tam'a göre A-Z sıralama
-    if 'urun_adi_tam' in df.columns:
-        df = df.sort_values(by='urun_adi_tam', ascending=True, na_position='last')
-        df = df.reset_index(drop=True)
+        # FIYAT DETAYLARI
+        # Orijinal fiyat
+        original_price = self.original_price_text(doc)
+        if original_price is not None:
+            veri['orijinal_fiyat'] = original_price
+
+        # İndirimli fiyat
+        discount_price = self.discount_price_text(doc)
+        if discount_price is not None:
+            veri['fiyat'] = discount_price
+
+        # Eger indirimli fiyat yoksa, orijinal fiyatı kullan
+        if not veri['fiyat'] and veri['orijinal_fiyat']:
+            veri['fiyat'] = veri['orijinal_fiyat']
+
+        # Hala fiyat yoksa, kapsamlı arama
+        if not veri['fiyat']:
+            for text in self.price_texts(doc):
+                if 'TL' in text and any(c.isdigit() for c in text):
+                    veri['fiyat'] = text
+                    break
+
+        return veri
+
+    def extract_record(self, html: str, url: str, raw: bool = False,
+                       partial: bool = False) -> Optional[ProductRecord]:
+        """Ürün verisini çıkar, validate et; boş ürünlerde None döndür
+
+        raw=True ise validasyon yapılmadan ham veri döner (BatchProcessor için).
+        partial=True ise html sayfanın yalnızca başıdır (PagePrefix); gerekli
+        alanlardan biri eksikse None döner ve çağıran tam sayfaya düşer.
+        """
+        with METRICS.timer('html_parse'):
+            veri = self.extract(html, url)
+        if veri and partial and not all(veri[field] for field in self.PREFIX_REQUIRED_FIELDS):
+            return None
+        if not veri or raw:
+            return veri
 
-    # Sütun sıralaması
-    columns_order = [
-        'kategori', 'KOLEKSIYON', 'sku', 'urun_adi_tam', 'urun_adi',
-        'LISTE', 'PERAKENDE', 'urun_url'
-    ]
+        # VALIDASYON
+        with METRICS.timer('validate'):
+            validated_veri = DataValidator.validate_product_data(veri)
 
-    existing_columns = [col for col in columns_order if col in df.columns]
-    df = df[existing_columns]
+        # BOŞ ÜRÜN KONTROLÜ
+        if not validated_veri.get('urun_adi_tam') or not validated_veri.get('urun_adi_tam').strip():
+            return None
 
-    # Excel'e kaydet
-    df.to_excel(filepath, index=False, engine='openpyxl')
-    print(f"[SAVED] Excel: {filepath} ({len(df)} satır)")
+        return validated_veri
 
 
-def print_statistics(products: List[Dict]):
-    """İstatistikleri yazdır"""
-    print("\n" + "="*80)
-    print("ÖZET İSTATİSTİKLER")
-    print("="*80)
-    print(f"Toplam Ürün: {len(products)}")
+class BeautifulSoupExtractor(ProductExtractor):
+    """BeautifulSoup (html.parser) backend'i"""
 
-    # Kategorilere göre dağılım
-    kategoriler = {}
-    for p in products:
-        kat = p.get('kategori', 'Bilinmiyor')
-        if kat:
-            kategoriler[kat] = kategoriler.get(kat, 0) + 1
+    name = "bs4"
 
-    print(f"\nKategoriler:")
-    for kat, sayi in sorted(kategoriler.items(), key=lambda x: x[1], reverse=True):
-        print(f"  - {kat}: {sayi} ürün")
+    def __init__(self):
+        from bs4 import BeautifulSoup, NavigableString
 
-    # Fiyat istatistikleri
-    liste_prices = [p.get('LISTE') for p in products if p.get('LISTE')]
-    perakende_prices = [p.get('PERAKENDE') for p in products if p.get('PERAKENDE')]
+        self.BeautifulSoup = BeautifulSoup
+        self.NavigableString = NavigableString
 
-    if liste_prices:
-        print(f"\nLİSTE Fiyat İstatistikleri:")
-        print(f"  - Ortalama: {sum(liste_prices)/len(liste_prices):,.0f} TL")
-        print(f"  - Minimum: {min(liste_prices):,} TL")
-        print(f"  - Maksimum: {max(liste_prices):,} TL")
+    def parse(self, html: str):
+        return self.BeautifulSoup(html, 'html.parser')
 
-    if perakende_prices:
-        print(f"\nPERAKENDE Fiyat İstatistikleri:")
-        print(f"  - Ortalama: {sum(perakende_prices)/len(perakende_prices):,.0f} TL")
-        print(f"  - Minimum: {min(perakende_prices):,} TL")
-        print(f"  - Maksimum: {max(perakende_prices):,} TL")
+    def title(self, doc) -> Optional[Tuple[str, str]]:
+        return self.baslik_ayikla(doc.find('h1', class_='title'))
 
+    def baslik_ayikla(self, baslik_etiketi):
+        """Başlık etiketinden koleksiyon adını ve ürün adını ayıklar (ayıklanamıyorsa None)"""
+        if not baslik_etiketi:
+            return "", ""
 
-def main():
-    """Ana fonksiyon"""
-    # Stdout'u flush et
-    sys.stdout.reconfigure(line_buffering=True)
+        koleksiyon_adi = ""
+        span_etiketi = baslik_etiketi.find('span')
+        if span_etiketi:
+            koleksiyon_adi = span_etiketi.get_text(strip=True)
 
-    print("="*80, flush=True)
-    print("DOGTAS OTHER.XLSX SCRAPER", flush=True)
-    print("Other.xlsx'ten SKU okur -> Sitemap XML'de arar -> dogtasCom.xlsx'e kaydeder", flush=True)
-    print("="*80, flush=True)
+        urun_adi = ""
+        sibling = span_etiketi.next_sibling if span_etiketi else None
+        if isinstance(sibling, self.NavigableString):
+            urun_adi = sibling.strip()
+        elif sibling is not None:
+            # Span'ı doğrudan bir etiket izliyor: lxml backend'i gibi başlık ayıklanamaz
+            return None
+        elif baslik_etiketi:
+            urun_adi = baslik_etiketi.get_text(strip=True)
 
-    # Other.xlsx yolu
-    other_xlsx_path = r"D:\GoogleDrive\PRG\Fiyat\Etiket\Other.xlsx"
+        return koleksiyon_adi, urun_adi
 
-    # Linux ortamında test için alternatif yol
-    if not os.path.exists(other_xlsx_path):
-        other_xlsx_path = os.path.join(get_base_dir(), "Other.xlsx")
+    def sku_text(self, doc) -> Optional[str]:
+        sku_etiketi = doc.find(class_='sku')
+        return sku_etiketi.get_text(strip=True) if sku_etiketi else None
 
-    if not os.path.exists(other_xlsx_path):
-        print(f"[ERROR] Other.xlsx bulunamadı: {other_xlsx_path}")
-        print("[INFO] Lütfen Other.xlsx dosyasını script ile aynı dizine koyun")
-        return
+    def breadcrumb_texts(self, doc) -> List[str]:
+        breadcrumb_elem = doc.find('ol', class_='breadcrumb')
+        if not breadcrumb_elem:
+            return []
+        return [li.get_text(strip=True) for li in breadcrumb_elem.find_all('li')]
+
+    def json_ld_texts(self, doc) -> List[Optional[str]]:
+        return [script.string for script in doc.find_all('script', type='application/ld+json')]
+
+    def original_price_text(self, doc) -> Optional[str]:
+        elem = doc.select_one('.sale-price.sale-variant-price, .sale-price.blc')
+        return elem.get_text(strip=True) if elem else None
+
+    def discount_price_text(self, doc) -> Optional[str]:
+        elem = doc.select_one('.discount-price, .new-sale-price')
+        return elem.get_text(strip=True) if elem else None
+
+    def price_texts(self, doc):
+        for p in doc.find_all(class_=lambda x: x and 'price' in x.lower()):
+            yield p.get_text(strip=True)
+
+
+def _xpath_class(name: str) -> str:
+    """CSS .name seçicisinin XPath karşılığı"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlExtractor(ProductExtractor):
+    """lxml backend'i: seçiciler XPath olarak bir kez derlenir"""
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+
+        self.lxml_html = lxml_html
+        self.html_parser = lxml_html.HTMLParser(encoding='utf-8')
+
+        self.xp_title = etree.XPath(f"(//h1[{_xpath_class('title')}])[1]")
+        self.xp_span = etree.XPath("(.//span)[1]")
+        # get_text() gibi script/style içeriği ve yorumlar hariç metin düğümleri
+        self.xp_text = etree.XPath(".//text()[not(parent::script) and not(parent::style)]")
+        self.xp_sku = etree.XPath(f"(//*[{_xpath_class('sku')}])[1]")
+        self.xp_breadcrumb = etree.XPath(f"(//ol[{_xpath_class('breadcrumb')}])[1]")
+        self.xp_li = etree.XPath(".//li")
+        self.xp_json_ld = etree.XPath("//script[@type='application/ld+json']")
+        self.xp_original_price = etree.XPath(
+            f"(//*[{_xpath_class('sale-price')} and {_xpath_class('sale-variant-price')}]"
+            f" | //*[{_xpath_class('sale-price')} and {_xpath_class('blc')}])[1]"
+        )
+        self.xp_discount_price = etree.XPath(
+            f"(//*[{_xpath_class('discount-price')}] | //*[{_xpath_class('new-sale-price')}])[1]"
+        )
+        self.xp_price = etree.XPath(
+            "//*[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+            "'abcdefghijklmnopqrstuvwxyz'), 'price')]"
+        )
+
+    def _text(self, elem) -> str:
+        """BeautifulSoup get_text(strip=True) karşılığı"""
+        return "".join(t.strip() for t in self.xp_text(elem) if t.strip())
+
+    def _first(self, xpath, doc):
+        found = xpath(doc)
+        return found[0] if found else None
+
+    def parse(self, html: str):
+        return self.lxml_html.document_fromstring(html.encode('utf-8'), parser=self.html_parser)
+
+    def title(self, doc) -> Optional[Tuple[str, str]]:
+        baslik_etiketi = self._first(self.xp_title, doc)
+        if baslik_etiketi is None:
+            return "", ""
+
+        koleksiyon_adi = ""
+        span_etiketi = self._first(self.xp_span, baslik_etiketi)
+        if span_etiketi is not None:
+            koleksiyon_adi = self._text(span_etiketi)
+
+        if span_etiketi is not None and span_etiketi.tail is not None:
+            urun_adi = span_etiketi.tail.strip()
+        elif span_etiketi is not None and span_etiketi.getnext() is not None:
+            # Span'ı doğrudan bir etiket izliyorsa bs4 backend'i de başlığı ayıklayamaz
+            return None
+        else:
+            urun_adi = self._text(baslik_etiketi)
+
+        return koleksiyon_adi, urun_adi
+
+    def sku_text(self, doc) -> Optional[str]:
+        elem = self._first(self.xp_sku, doc)
+        return self._text(elem) if elem is not None else None
+
+    def breadcrumb_texts(self, doc) -> List[str]:
+        breadcrumb_elem = self._first(self.xp_breadcrumb, doc)
+        if breadcrumb_elem is None:
+            return []
+        return [self._text(li) for li in self.xp_li(breadcrumb_elem)]
+
+    def json_ld_texts(self, doc) -> List[Optional[str]]:
+        return [script.text for script in self.xp_json_ld(doc)]
+
+    def original_price_text(self, doc) -> Optional[str]:
+        elem = self._first(self.xp_original_price, doc)
+        return self._text(elem) if elem is not None else None
+
+    def discount_price_text(self, doc) -> Optional[str]:
+        elem = self._first(self.xp_discount_price, doc)
+        return self._text(elem) if elem is not None else None
+
+    def price_texts(self, doc):
+        for elem in self.xp_price(doc):
+            yield self._text(elem)
+
+
+EXTRACTORS = {
+    BeautifulSoupExtractor.name: BeautifulSoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+
+def extractor_class(backend: str) -> type:
+    """Config'teki isme göre HTML backend sınıfı (bs4/lxml import edilmez)"""
+    if backend not in EXTRACTORS:
+        raise ValueError(f"Bilinmeyen HTML backend: {backend} (seçenekler: {', '.join(EXTRACTORS)})")
+    return EXTRACTORS[backend]
+
+
+def create_extractor(backend: str) -> ProductExtractor:
+    """Config'teki isme göre HTML backend'i oluştur"""
+    return extractor_class(backend)()
+
+
+# Parse worker süreçlerindeki backend örnekleri (süreç başına bir kez oluşturulur)
+_WORKER_EXTRACTORS: Dict[str, ProductExtractor] = {}
+
+
+def extract_record_in_worker(backend: str, html: str, url: str, raw: bool = False,
+                             partial: bool = False) -> Tuple[Optional[Dict], Dict[str, float]]:
+    """ProcessPoolExecutor'da çalışır: validate edilmiş kaydı ve aşama sürelerini döndür"""
+    extractor = _WORKER_EXTRACTORS.get(backend)
+    if extractor is None:
+        extractor = _WORKER_EXTRACTORS[backend] = create_extractor(backend)
+
+    # Worker'daki ölçümler ana sürece süre olarak taşınır
+    METRICS.reset()
+    record = extractor.extract_record(html, url, raw, partial)
+    if isinstance(record, ProductRecord):
+        # Sınıf yerine değerler taşınır (spawn'da __main__ modül adı farklıdır)
+        record = record.astuple()
+    return record, {stage: hist['sum'] for stage, hist in METRICS.histograms.items()}
+
+
+class PagePrefix(str):
+    """Akış erken kesildiğinde get_page_async'in döndürdüğü sayfa başı
+
+    Yanıt hemen kapatılmaz: sayfa başındaki alanlar yetmezse kalan gövde aynı
+    yanıttan okunur (DogtasSitemapScraper.read_page_rest). Yanıt ve eşzamanlılık
+    slotu exits'te tutulur; sahibi işi bitince close() çağırır.
+    """
+
+    response = None
+    # Okunmuş byte'lar (kesme noktasından sonrası dahil)
+    buffer = b""
+    exits: Optional[contextlib.AsyncExitStack] = None
+    # close(): kalan gövde en fazla bu kadarsa okunup atılır (bağlantı yeniden kullanılır)
+    drain_bytes = 0
+    chunk_size = 16 * 1024
+
+    async def close(self):
+        """Açık yanıtı bırak, ardından eşzamanlılık slotunu serbest bırak
+
+        Kalan gövde drain_bytes'ı aşmıyorsa okunup atılır ve bağlantı havuza döner
+        (yeni TCP/TLS el sıkışması gerekmez); aşıyorsa bağlantı kapatılır.
+        """
+        exits, self.exits = self.exits, None
+        if exits is None:
+            return
+        try:
+            drained = 0
+            async for chunk in self.response.content.iter_chunked(self.chunk_size):
+                drained += len(chunk)
+                if drained > self.drain_bytes:
+                    break
+            else:
+                METRICS.inc('page_bytes_drained', drained)
+                self.response.release()
+                return
+            METRICS.inc('page_stream_closes')
+            self.response.close()
+        except Exception:
+            self.response.close()
+        finally:
+            await exits.aclose()
+
+
+class ProductPrefixScanner:
+    """Akan ürün sayfasında gerekli alanların işaretlerini arar
+
+    feed() her parçayla çağrılır; başlık (h1.title), .sku, ol.breadcrumb ve iki
+    fiyat elemanının doküman sırasındaki ilk örnekleri kapandığında kesme
+    noktasını (byte) döndürür. İndirimli fiyat isteğe bağlıdır: liste fiyatını
+    içeren eleman onsuz kapanırsa sayfada indirim yok sayılır. Script/style
+    içerikleri ve yorumlar atlanır, böylece sayfa sonundaki büyük script
+    paketleri hiç indirilmez.
+    """
+
+    TAG = re.compile(rb'<(!--|/?[a-zA-Z][\w-]*)([^>]*)>')
+    CLASS_ATTR = re.compile(rb'(?:^|\s)class\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.I)
+    RAW_TEXT_END = {
+        b'script': re.compile(rb'</script\s*>', re.I),
+        b'style': re.compile(rb'</style\s*>', re.I),
+    }
+
+    # Alan -> (etiket adı, sınıflar) eşleşmesi; extractor seçicileriyle aynı
+    MARKERS = {
+        'title': lambda name, classes: name == b'h1' and 'title' in classes,
+        'sku': lambda name, classes: 'sku' in classes,
+        'breadcrumb': lambda name, classes: name == b'ol' and 'breadcrumb' in classes,
+        'original_price': lambda name, classes: 'sale-price' in classes and (
+            'sale-variant-price' in classes or 'blc' in classes),
+        'discount_price': lambda name, classes: 'discount-price' in classes or 'new-sale-price' in classes,
+    }
+    # Fiyat kutusu (liste fiyatının üst elemanı) bunlarsız kapanırsa eksik sayılır
+    OPTIONAL_MARKERS = ('discount_price',)
+    VOID_TAGS = {b'area', b'base', b'br', b'col', b'embed', b'hr', b'img', b'input', b'link',
+                 b'meta', b'param', b'source', b'track', b'wbr'}
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.pos = 0
+        self.starts: Dict[str, Tuple[bytes, int]] = {}
+        self.ends: Dict[str, int] = {}
+        self.absent: set = set()
+        self.close_patterns: Dict[bytes, re.Pattern] = {}
+        # Açık elemanların adları ve liste fiyatı elemanının yığındaki yeri
+        self.open: List[bytes] = []
+        self.price_depth: Optional[int] = None
+
+    def classes(self, attrs: bytes) -> set:
+        found = self.CLASS_ATTR.search(attrs)
+        if not found:
+            return set()
+        value = next(group for group in found.groups() if group is not None)
+        return set(value.decode('utf-8', 'replace').split())
+
+    def find_close(self, name: bytes, start: int) -> Optional[int]:
+        """start'taki açık etiketin (iç içe aynı etiketler sayılarak) kapanış sonu"""
+        pattern = self.close_patterns.get(name)
+        if pattern is None:
+            pattern = self.close_patterns[name] = re.compile(rb'<(/?)' + re.escape(name) + rb'\b[^>]*>', re.I)
+
+        depth = 1
+        for found in pattern.finditer(self.buffer, start):
+            depth += -1 if found.group(1) else 1
+            if depth == 0:
+                return found.end()
+        return None
+
+    def feed(self, chunk: bytes) -> Optional[int]:
+        """Parçayı ekle; tüm alanlar tamamlandıysa kesme noktasını döndür"""
+        self.buffer += chunk
+
+        while len(self.starts) + len(self.absent) < len(self.MARKERS):
+            tag = self.TAG.search(self.buffer, self.pos)
+            if not tag:
+                break
+            name = tag.group(1).lower()
+
+            if name == b'!--':
+                end = self.buffer.find(b'-->', tag.start() + 4)
+                if end < 0:
+                    break
+                self.pos = end + 3
+                continue
+
+            if name in self.RAW_TEXT_END:
+                end = self.RAW_TEXT_END[name].search(self.buffer, tag.end())
+                if not end:
+                    break
+                self.pos = end.end()
+                continue
+
+            self.pos = tag.end()
+            if name.startswith(b'/'):
+                self.close_element(name[1:])
+                continue
+            if name not in self.VOID_TAGS and not tag.group(2).endswith(b'/'):
+                self.open.append(name)
+
+            classes = self.classes(tag.group(2))
+            if not classes:
+                continue
+            for marker, matches in self.MARKERS.items():
+                if marker not in self.starts and matches(name, classes):
+                    self.starts[marker] = (name, tag.end())
+                    if marker == 'original_price':
+                        self.price_depth = len(self.open) - 1
+
+        for marker, (name, start) in self.starts.items():
+            if marker not in self.ends:
+                end = self.find_close(name, start)
+                if end is not None:
+                    self.ends[marker] = end
+
+        if len(self.ends) + len(self.absent) == len(self.MARKERS):
+            return max(self.ends.values())
+        return None
+
+    def close_element(self, name: bytes):
+        """Kapanış etiketi: eşleşen açık elemanı (ve kapatılmamış çocuklarını) yığından çıkar"""
+        for depth in range(len(self.open) - 1, -1, -1):
+            if self.open[depth] == name:
+                del self.open[depth:]
+                break
+        else:
+            return
+        # Fiyat kutusu kapandı: içinde başlamamış isteğe bağlı alanlar sayfada yok
+        if self.price_depth is not None and len(self.open) < self.price_depth:
+            self.absent.update(marker for marker in self.OPTIONAL_MARKERS if marker not in self.starts)
+            self.price_depth = None
+
+
+class DogtasSitemapScraper:
+    """Sitemap XML ile Doğtaş ürün scraper"""
+
+    def __init__(self, max_concurrent=2, sitemap_cache_path: Optional[str] = None,
+                 html_backend: str = 'bs4', page_cache_path: Optional[str] = None):
+        self.base_url = "https://www.dogtas.com"
+        # Başlangıç eşzamanlılık limiti; tarama sırasında AIMD ile ayarlanır
+        self.max_concurrent = max_concurrent
+        self.concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+        self.breaker: Optional[CircuitBreaker] = None
+
+        # Son taramada dead-letter tekrarından sonra da çekilemeyen SKU'lar
+        self.failed_skus: List[str] = []
+        self.price_changes: List[Dict] = []
+        # Son taramada döndürülen ürünlerin SKU'ları (ürünlerle aynı sırada)
+        self.product_skus: List[str] = []
+        # --batch: OUTCOME_FOUND sayılan SKU -> sayaç adı (toplu işleme sonucu düzeltilir)
+        self.found_counters: Dict[str, str] = {}
+        self.rate_limiter = None
+
+        # SKU -> ürün URL index'i (run başına bir kez oluşturulur)
+        self.sku_index: Optional[Dict[str, str]] = None
+        self.url_lastmod: Dict[str, str] = {}
+        self.sku_index_lock = asyncio.Lock()
+
+        # URL -> uçuştaki kayıt isteği (aynı URL'e eşzamanlı çağrılar tek isteği bekler)
+        self.inflight_records: Dict[str, asyncio.Future] = {}
+        # URL -> çıkarılmış kayıt; yalnızca birden fazla giriş SKU'sunun çıktığı URL'ler,
+        # son SKU'ya verilene kadar tutulur (servis modunda None)
+        self.record_memo: Optional[Dict[str, Dict]] = None
+        # URL -> kaydı henüz almamış giriş SKU sayısı (plan_record_memo)
+        self.memo_pending: Dict[str, int] = {}
+
+        # Sitemap'lerin diskteki cache'i (run'lar arası)
+        self.sitemap_cache = SitemapCache(sitemap_cache_path) if sitemap_cache_path else None
+        self.cached_sitemaps: Dict[str, Dict] = {}
+
+        # Ürün sitemap'lerini listeleyen sitemap index
+        self.sitemap_index_url = "https://www.dogtas.com/sitemap.xml"
+
+        # Sitemap index okunamazsa kullanılacak sabit liste
+        self.sitemap_urls = [
+            "https://www.dogtas.com/sitemap/products/1.xml",
+            "https://www.dogtas.com/sitemap/products/2.xml",
+            "https://www.dogtas.com/sitemap/products/3.xml",
+            "https://www.dogtas.com/sitemap/products/4.xml",
+            "https://www.dogtas.com/sitemap/products/5.xml",
+            "https://www.dogtas.com/sitemap/products/6.xml",
+        ]
+
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+
+        self.config = {
+            'initial_timeout': 20,
+            'max_timeout': 90,
+            'retry_count': 3,
+            'backoff_factor': 2,
+            'requests_per_second': 3.0,  # Token bucket: saniyedeki istek üst sınırı, AIMD bunun altında çalışır (0 = kapalı)
+            'rate_limit_burst': 4,  # Token bucket kapasitesi
+            'worker_count': 16,  # Eşzamanlı işlenen SKU sayısı
+            'min_concurrency': 1,  # AIMD: eşzamanlı istek limiti alt sınırı
+            'max_concurrency': 16,  # AIMD: eşzamanlı istek limiti üst sınırı
+            'latency_factor': 2.0,  # AIMD: taban gecikmenin bu katını aşan yanıtta limit artmaz
+            'max_retry_after': 120,  # Retry-After en fazla bu kadar beklenir (sn)
+            'breaker_failure_threshold': 5,  # Devre kesici: bu kadar ardışık hatada istekler durur
+            'breaker_open_seconds': 30,  # Devre kesici: ilk bekleme (sn)
+            'breaker_max_open_seconds': 300,  # Devre kesici: en uzun bekleme (sn)
+            'xml_chunk_size': 64 * 1024,  # Sitemap akış parçası (byte)
+            'html_backend': html_backend,  # Ürün sayfası ayrıştırıcı: 'bs4' veya 'lxml'
+            'parse_workers': None,  # HTML parse süreç sayısı (0 = event loop'ta, None = otomatik)
+            'batch_postprocess': False,  # True: ham kayıtlar sonda BatchProcessor ile işlenir
+            'stream_extract': True,  # Ürün alanları gelince sayfanın kalanını indirme
+            'stream_chunk_size': 16 * 1024,  # Ürün sayfası akış parçası (byte)
+            'stream_drain_bytes': 256 * 1024,  # Kesilen yanıtın kalanı bu kadarsa okunur, bağlantı havuza döner
+            'queue_batch_size': 64,  # --worker: tek seferde kiralanan SKU sayısı
+            'queue_lease_seconds': 120,  # --worker: kira süresi (heartbeat ile uzatılır)
+            'queue_poll_interval': 5,  # --worker: iş yokken kiraların dolmasını bekleme aralığı (sn)
+            'queue_max_attempts': 2,  # --worker: başarısız SKU en fazla bu kadar denenir
+            'service_record_ttl': 900,  # --serve: kaydın bellekte geçerli kaldığı süre (sn)
+            'service_refresh_interval': 600,  # --serve: index yenileme aralığı (sn)
+            'service_max_records': 50_000,  # --serve: bellekte tutulan en fazla kayıt (LRU, not_found dahil)
+            'service_max_batch': 100,  # --serve: /prices isteğinde en fazla SKU
+            'page_cache_ttl': 3600,  # Bu süre içinde cache'teki sayfa istek atılmadan kullanılır (sn)
+            'page_cache_max_bytes': 200 * 1024 * 1024,  # Sayfa cache'i boyut sınırı
+        }
+
+        # HTML backend ilk parse'ta oluşturulur (--serve/--merge bs4/lxml import etmez);
+        # isim burada doğrulanır
+        extractor_class(self.config['html_backend'])
+        self._extractor: Optional[ProductExtractor] = None
+
+        # HTML parse süreç havuzu (tarama sırasında açılır; None = event loop'ta parse)
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
+
+        # --record / --replay: oturum bu arşive kaydeder veya arşivden yanıtlar
+        self.http_archive: Optional[HttpArchive] = None
+
+        # Ürün sayfası cache'i (TTL + boyut bazlı LRU)
+        self.page_cache = PageCache(
+            page_cache_path, self.config['page_cache_ttl'], self.config['page_cache_max_bytes']
+        ) if page_cache_path else None
+
+    async def read_page_prefix(self, response) -> str:
+        """Gövdeyi parça parça oku; ürün alanları tamamlanınca okumayı kes"""
+        scanner = ProductPrefixScanner()
+        cut = None
+        async for chunk in response.content.iter_chunked(self.config['stream_chunk_size']):
+            cut = scanner.feed(chunk)
+            if cut is not None:
+                break
+
+        METRICS.inc('page_bytes', len(scanner.buffer))
+        if cut is None or len(scanner.buffer) == response.content_length:
+            # Gövdenin tamamı okundu (kesilecek bir şey kalmadı)
+            return bytes(scanner.buffer).decode(response.charset)
+
+        # Kalan gövde şimdilik okunmaz; yanıt PagePrefix kapatılınca bırakılır
+        METRICS.inc('page_stream_cuts')
+        prefix = PagePrefix(bytes(scanner.buffer[:cut]).decode(response.charset))
+        prefix.response = response
+        prefix.buffer = bytes(scanner.buffer)
+        prefix.drain_bytes = self.config['stream_drain_bytes']
+        prefix.chunk_size = self.config['stream_chunk_size']
+        return prefix
+
+    async def read_page_rest(self, prefix: PagePrefix) -> str:
+        """Kesilen yanıtın kalanını okuyup tam sayfayı döndür (yanıt bırakılır)"""
+        try:
+            body = bytearray(prefix.buffer)
+            async for chunk in prefix.response.content.iter_chunked(self.config['stream_chunk_size']):
+                body.extend(chunk)
+            METRICS.inc('page_bytes', len(body) - len(prefix.buffer))
+            return bytes(body).decode(prefix.response.charset)
+        finally:
+            await prefix.close()
+
+    async def get_page_async(self, session: aiohttp.ClientSession, url: str, attempt=1,
+                             validators: Optional[Dict] = None, stream: bool = False):
+        """Adaptive timeout ve retry logic ile asenkron sayfa çekme (ham HTML döndürür)
+
+        validators verilirse koşullu istek gönderilir ve yanıttaki ETag/Last-Modified ile
+        güncellenir. 304 yanıtında NOT_MODIFIED döner. stream=True ise ürün alanları
+        tamamlanınca okuma kesilir ve sayfa başı PagePrefix olarak döner; yanıt ve
+        eşzamanlılık slotu açık kalır, çağıran PagePrefix.close() (veya read_page_rest)
+        ile bırakmalıdır.
+        """
+        import aiohttp
+
+        max_attempts = self.config['retry_count']
+        timeout = self.config['initial_timeout'] * (self.config['backoff_factor'] ** (attempt - 1))
+        timeout = min(timeout, self.config['max_timeout'])
+
+        request_headers = {}
+        if validators:
+            if validators.get('etag'):
+                request_headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                request_headers['If-Modified-Since'] = validators['last_modified']
+
+        probe = 0
+        try:
+            if self.breaker:
+                probe = await self.breaker.before_request()
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            async with contextlib.AsyncExitStack() as exits:
+                # Slot yanıtla birlikte tutulur: akışla kesilen yanıt açık kaldıkça bırakılmaz
+                await exits.enter_async_context(self.concurrency)
+                with METRICS.timer('page_fetch'):
+                    start = time.perf_counter()
+                    async with contextlib.AsyncExitStack() as response_exits:
+                        response = await response_exits.enter_async_context(
+                            session.get(url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=timeout))
+                        )
+                        METRICS.inc('page_requests')
+                        if response.status in (429, 503):
+                            raise ThrottledError(response.status,
+                                                 parse_retry_after(response.headers.get('Retry-After')))
+                        if response.status == 304:
+                            METRICS.inc('page_not_modified')
+                            await self.concurrency.on_success(time.perf_counter() - start)
+                            self.record_fetch_result(True)
+                            if validators is not None:
+                                # 304 yeni değer gönderdiyse onu sakla, göndermediyse eskisi geçerli
+                                validators['etag'] = response.headers.get('ETag') or validators.get('etag')
+                                validators['last_modified'] = (response.headers.get('Last-Modified')
+                                                               or validators.get('last_modified'))
+                            return NOT_MODIFIED
+
+                        response.raise_for_status()
+                        if stream and response.charset:
+                            html = await self.read_page_prefix(response)
+                            if isinstance(html, PagePrefix):
+                                # Yanıtı ve slotu bırakmak PagePrefix'e geçer
+                                exits.push_async_exit(response_exits.pop_all())
+                                html.exits = exits.pop_all()
+                        else:
+                            body = await response.read()
+                            METRICS.inc('page_bytes', len(body))
+                            html = body.decode(response.get_encoding())
+                    await self.concurrency.on_success(time.perf_counter() - start)
+                    self.record_fetch_result(True)
+
+                    if validators is not None:
+                        validators['etag'] = response.headers.get('ETag')
+                        validators['last_modified'] = response.headers.get('Last-Modified')
+
+                    return html
+
+        except asyncio.TimeoutError:
+            METRICS.inc('page_timeouts')
+            self.concurrency.on_congestion('timeout')
+            if self.record_fetch_result(False):
+                # Devre açıldı: tekrar denemek yerine SKU dead-letter'a düşer
+                METRICS.inc('page_failures')
+                return None
+            if attempt < max_attempts:
+                METRICS.inc('page_retries')
+                wait_time = 2 ** attempt
+                print(f"[TIMEOUT] Deneme {attempt}/{max_attempts} - Bekleniyor {wait_time}s...")
+                await asyncio.sleep(wait_time)
+                return await self.get_page_async(session, url, attempt + 1, validators, stream)
+            else:
+                print(f"[ERROR] Timeout - Maksimum deneme: {url}")
+                METRICS.inc('page_failures')
+                return None
+
+        except ThrottledError as e:
+            METRICS.inc('page_throttled')
+            self.concurrency.on_congestion(f'http_{e.status}')
+            # Sunucu yanıt veriyor: devre kesici için hata değil (AIMD yavaşlatır)
+            self.record_fetch_result(True)
+            if attempt < max_attempts:
+                METRICS.inc('page_retries')
+                wait_time = self.throttle_wait(e, attempt)
+                print(f"[THROTTLE] {e} - Deneme {attempt}/{max_attempts} - Bekleniyor {wait_time:.0f}s...")
+                await asyncio.sleep(wait_time)
+                return await self.get_page_async(session, url, attempt + 1, validators, stream)
+            else:
+                print(f"[ERROR] {e} - Maksimum deneme: {url}")
+                METRICS.inc('page_failures')
+                return None
+
+        except Exception as e:
+            METRICS.inc('page_errors')
+            # 4xx: sunucu ayakta, devre kesici için hata sayılmaz
+            status = getattr(e, 'status', None)
+            if self.record_fetch_result(status is not None and status < 500):
+                METRICS.inc('page_failures')
+                return None
+            if attempt < max_attempts:
+                METRICS.inc('page_retries')
+                wait_time = attempt * 1.5
+                print(f"[ERROR] {e} - Tekrar deneniyor ({attempt}/{max_attempts})...")
+                await asyncio.sleep(wait_time)
+                return await self.get_page_async(session, url, attempt + 1, validators, stream)
+            else:
+                print(f"[ERROR] Başarısız: {url} - {e}")
+                METRICS.inc('page_failures')
+                return None
+
+        finally:
+            if probe:
+                # İptal edilen probe sonuç bildirmemiş olabilir: bekleyenler takılmasın
+                self.breaker.end_probe(probe)
+
+    def throttle_wait(self, error: ThrottledError, attempt: int) -> float:
+        """429/503 sonrası bekleme süresi: Retry-After varsa ona uy (tüm istekler için), yoksa normal bekleme"""
+        if error.retry_after is None:
+            return 2 ** attempt
+        wait_time = min(error.retry_after, self.config['max_retry_after'])
+        if self.rate_limiter:
+            self.rate_limiter.pause(wait_time)
+        return wait_time
+
+    def record_fetch_result(self, server_ok: bool) -> bool:
+        """Sayfa isteği sonucunu devre kesiciye bildir; devre açıksa True döndür"""
+        if not self.breaker:
+            return False
+        if server_ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return self.breaker.is_open
+
+    async def get_xml_async(self, session: aiohttp.ClientSession, url: str,
+                            validators: Optional[Dict] = None, tag: str = 'url', attempt=1):
+        """XML sitemap dosyasını parça parça indirip (loc, lastmod) listesini döndür
+
+        Yanıt gövdesi bellekte tutulmaz, parçalar geldikçe SitemapStreamParser'a verilir.
+        validators verilirse (etag, last_modified) koşullu istek gönderilir ve
+        yanıttaki yeni değerlerle güncellenir. 304 yanıtında NOT_MODIFIED döner.
+        429/503 yanıtları sayfa isteklerindeki gibi Retry-After kadar beklenip tekrar denenir.
+        """
+        import aiohttp
+        import xml.etree.ElementTree as ET
+
+        request_headers = {}
+        if validators:
+            if validators.get('etag'):
+                request_headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                request_headers['If-Modified-Since'] = validators['last_modified']
+
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            async with self.concurrency:
+                with METRICS.timer('sitemap_fetch'):
+                    async with session.get(url, headers=request_headers,
+                                           timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        METRICS.inc('sitemap_requests')
+                        if response.status in (429, 503):
+                            raise ThrottledError(response.status,
+                                                 parse_retry_after(response.headers.get('Retry-After')))
+                        if response.status == 304:
+                            METRICS.inc('sitemap_not_modified')
+                            return NOT_MODIFIED
+
+                        response.raise_for_status()
+
+                        parser = SitemapStreamParser(tag)
+                        entries = []
+                        async for chunk in response.content.iter_chunked(self.config['xml_chunk_size']):
+                            METRICS.inc('sitemap_bytes', len(chunk))
+                            entries.extend(parser.feed(chunk))
+                        entries.extend(parser.close())
+
+                        if validators is not None:
+                            validators['etag'] = response.headers.get('ETag')
+                            validators['last_modified'] = response.headers.get('Last-Modified')
+
+                        return entries
+        except asyncio.TimeoutError:
+            METRICS.inc('sitemap_errors')
+            self.concurrency.on_congestion('timeout')
+            print(f"[ERROR] XML indirme zaman aşımı {url}")
+            return None
+        except ThrottledError as e:
+            METRICS.inc('sitemap_throttled')
+            self.concurrency.on_congestion(f'http_{e.status}')
+            max_attempts = self.config['retry_count']
+            if attempt < max_attempts:
+                METRICS.inc('sitemap_retries')
+                wait_time = self.throttle_wait(e, attempt)
+                print(f"[THROTTLE] {e} - Sitemap deneme {attempt}/{max_attempts} - Bekleniyor {wait_time:.0f}s...")
+                await asyncio.sleep(wait_time)
+                return await self.get_xml_async(session, url, validators, tag, attempt + 1)
+            METRICS.inc('sitemap_errors')
+            print(f"[ERROR] {e} - Maksimum deneme: {url}")
+            return None
+        except ET.ParseError as e:
+            METRICS.inc('sitemap_errors')
+            print(f"[ERROR] XML parse hatası {url}: {e}")
+            return None
+        except Exception as e:
+            METRICS.inc('sitemap_errors')
+            print(f"[ERROR] XML indirme hatası {url}: {e}")
+            return None
+
+    async def load_sitemap_entries(self, session: aiohttp.ClientSession, url: str,
+                                   lastmod: str = "", tag: str = 'url') -> List[Tuple[str, str]]:
+        """Sitemap girdilerini cache'ten veya koşullu istekle al"""
+        cache = self.sitemap_cache
+        cached = self.cached_sitemaps.get(url)
+
+        # Index'teki lastmod değişmediyse istek atmadan cache'i kullan
+        if cached and lastmod and cached['lastmod'] == lastmod:
+            return cache.load_entries(url)
+
+        validators = {
+            'etag': cached['etag'] if cached else None,
+            'last_modified': cached['last_modified'] if cached else None,
+        }
+        entries = await self.get_xml_async(session, url, validators, tag=tag)
+
+        if entries is NOT_MODIFIED:
+            if lastmod and cached['lastmod'] != lastmod:
+                cache.touch_sitemap(url, lastmod)
+            return cache.load_entries(url)
+
+        if entries is None:
+            # İndirme başarısız: eski cache varsa onunla devam et
+            return cache.load_entries(url) if cached else []
+
+        # Boş sitemap da saklanır: sonraki run'da lastmod/304 ile tekrar indirilmez
+        if cache:
+            cache.save_sitemap(url, validators, lastmod, entries)
+        return entries
+
+    async def discover_sitemaps(self, session: aiohttp.ClientSession) -> List[Tuple[str, str]]:
+        """Sitemap index'ten ürün sitemap'lerini (url, lastmod) bul, bulunamazsa sabit listeyi kullan"""
+        entries = await self.load_sitemap_entries(session, self.sitemap_index_url, tag='sitemap')
+        sitemaps = [(loc, lastmod) for loc, lastmod in entries if '/sitemap/products/' in loc]
+
+        if not sitemaps:
+            print(f"[WARNING] Sitemap index okunamadı, sabit liste kullanılıyor")
+            return [(url, "") for url in self.sitemap_urls]
+
+        print(f"[OK] Sitemap index: {len(sitemaps)} ürün sitemap'i bulundu")
+        return sitemaps
+
+    async def build_sku_index(self, session: aiohttp.ClientSession) -> Dict[str, str]:
+        """Tüm ürün sitemap'lerini paralel al (cache + koşullu istek) ve SKU -> URL index'i oluştur"""
+        self.cached_sitemaps = self.sitemap_cache.load_sitemaps() if self.sitemap_cache else {}
+
+        sitemaps = await self.discover_sitemaps(session)
+
+        sitemap_entries = await asyncio.gather(
+            *(self.load_sitemap_entries(session, url, lastmod) for url, lastmod in sitemaps)
+        )
+
+        sku_index = {}
+        url_lastmod = {}
+        # Sitemap sırası korunur: aynı SKU birden fazla URL'de ise ilk bulunan kazanır
+        for entries in sitemap_entries:
+            for url, lastmod in entries:
+                url_lastmod[url] = lastmod
+                for sku in SKU_IN_URL_PATTERN.findall(url):
+                    sku_index.setdefault(sku, url)
+
+        if self.sitemap_cache:
+            self.sitemap_cache.prune([self.sitemap_index_url] + [url for url, _ in sitemaps])
+
+        self.sku_index = sku_index
+        self.url_lastmod = url_lastmod
+        print(f"[OK] SKU index: {len(sku_index)} SKU, {len(url_lastmod)} URL, {len(sitemaps)} sitemap")
+        return sku_index
+
+    async def search_sku_in_sitemaps(self, session: aiohttp.ClientSession, sku: str) -> Optional[str]:
+        """SKU'yu sitemap index'inde ara (index yoksa bir kez oluşturulur)"""
+        if self.sku_index is None:
+            async with self.sku_index_lock:
+                if self.sku_index is None:
+                    await self.build_sku_index(session)
+
+        with METRICS.timer('sitemap_lookup'):
+            return self.sku_index.get(sku)
+
+    async def extract_record_async(self, html: str, url: str) -> Optional[Dict]:
+        """HTML'den kaydı parse worker havuzunda (yoksa event loop'ta) çıkar
+
+        html bir PagePrefix ise eksik alanlı kayıtlar None döner (bkz. fetch_record).
+        """
+        partial = isinstance(html, PagePrefix)
+        if self.parse_pool is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                record, timings = await loop.run_in_executor(
+                    self.parse_pool, extract_record_in_worker, self.config['html_backend'], str(html), url,
+                    self.config['batch_postprocess'], partial
+                )
+                for stage, seconds in timings.items():
+                    METRICS.observe(stage, seconds)
+                return ProductRecord(*record) if isinstance(record, tuple) else record
+            except BrokenProcessPool as e:
+                print(f"[WARNING] Parse havuzu çöktü, event loop'ta devam ediliyor: {e}")
+                self.parse_pool = None
+
+        return self.extractor.extract_record(html, url, self.config['batch_postprocess'], partial)
+
+    @property
+    def extractor(self) -> ProductExtractor:
+        """HTML backend'i (ilk kullanımda oluşturulur)"""
+        if self._extractor is None or self._extractor.name != self.config['html_backend']:
+            self._extractor = create_extractor(self.config['html_backend'])
+        return self._extractor
+
+    @property
+    def record_kind(self) -> str:
+        """Sayfa cache'indeki kaydın türü: backend adı (+ batch modunda ham kayıt)"""
+        name = extractor_class(self.config['html_backend']).name
+        if self.config['batch_postprocess']:
+            return f"{name}-raw"
+        return name
+
+    def shutdown_parse_pool(self):
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+
+    def resolve_parse_workers(self) -> int:
+        """parse_workers: None ise exe'de 0 (inline), script'te CPU sayısı - 1"""
+        workers = self.config['parse_workers']
+        if workers is None:
+            workers = 0 if getattr(sys, 'frozen', False) else max(1, (os.cpu_count() or 2) - 1)
+        return workers
+
+    async def fetch_record(self, session: aiohttp.ClientSession, url: str, html: str,
+                           validators: Optional[Dict] = None) -> Tuple[Optional[str], Optional[Dict]]:
+        """HTML'den kaydı çıkar; sayfa başı (PagePrefix) yetmezse aynı yanıtın kalanını okuyup tekrar dene
+
+        (kullanılan html, kayıt) döndürür; tam sayfa alınamazsa html None olur.
+        """
+        import aiohttp
+
+        record = await self.extract_record_async(html, url)
+        if record is not None or not isinstance(html, PagePrefix):
+            return html, record
+
+        # Akışta bulunan alanlar eksik çıktı: okunan byte'lar korunur, yanıtın kalanı okunur
+        METRICS.inc('page_stream_fallbacks')
+        try:
+            html = await self.read_page_rest(html)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            # Bağlantı yarıda koptu: tam sayfa yeniden istenir
+            print(f"[WARNING] Sayfanın kalanı okunamadı, tekrar çekiliyor: {url} - {e}")
+            if validators is not None:
+                validators.clear()
+            html = await self.get_page_async(session, url, validators=validators)
+        if not html:
+            return None, None
+        return html, await self.extract_record_async(html, url)
+
+    async def get_product_detail_async(self, session: aiohttp.ClientSession, url: str,
+                                       revalidate: bool = False):
+        """Asenkron ürün detay çekme (revalidate=True: cache TTL içinde olsa da sunucuya sor)"""
+        stream = self.config['stream_extract']
+        html = None
+        try:
+            if not self.page_cache:
+                html = await self.get_page_async(session, url, stream=stream)
+                if not html:
+                    return None
+                _, record = await self.fetch_record(session, url, html)
+                return record
+
+            cached = self.page_cache.lookup(url)
+            if cached and cached['fresh'] and not revalidate and cached['extractor'] == self.record_kind:
+                self.page_cache.touch(url)
+                METRICS.inc('page_cache_fresh_hits')
+                return cached['record']
+
+            validators = {
+                'etag': cached['etag'] if cached else None,
+                'last_modified': cached['last_modified'] if cached else None,
+            }
+            html = await self.get_page_async(session, url, validators=validators, stream=stream)
+
+            if html is NOT_MODIFIED:
+                html = None
+                if cached['extractor'] == self.record_kind:
+                    self.page_cache.touch(url, revalidated=True, validators=validators)
+                    METRICS.inc('page_cache_revalidated_hits')
+                    return cached['record']
+                # Backend değişmiş: kayıt saklanan gövdeden yeniden çıkarılır
+                html = self.page_cache.load_body(cached['body_hash'])
+                if not html:
+                    # Gövde tahliye edilmiş (veya sayfa başıydı): koşulsuz istek, saklanacak değerler bu yanıttan
+                    validators = {}
+                    html = await self.get_page_async(session, url, validators=validators, stream=stream)
+
+            if not html:
+                return None
+
+            body_hash = PageCache.body_hash(html)
+            if cached and body_hash == cached['body_hash'] and cached['extractor'] == self.record_kind:
+                # Gövde (veya akışla alınan sayfa başı) değişmemiş: HTML parse edilmez,
+                # yanıtın yeni ETag/Last-Modified değerleri saklanır
+                self.page_cache.touch(url, revalidated=True, validators=validators)
+                METRICS.inc('page_cache_unchanged_hits')
+                return cached['record']
+
+            fetched = html
+            html, record = await self.fetch_record(session, url, html, validators)
+            if not html:
+                return None
+            if html is not fetched:
+                body_hash = PageCache.body_hash(html)
+            self.page_cache.store(url, validators, html, body_hash, record, self.record_kind,
+                                  partial=isinstance(html, PagePrefix))
+            return record
+
+        except Exception as e:
+            print(f"[ERROR] Ürün detay hatası {url}: {str(e)}")
+            return None
+
+        finally:
+            # Akışla kesilen yanıt hâlâ açıksa (kayıt sayfa başından çıktı) kapat
+            if isinstance(html, PagePrefix):
+                await html.close()
+
+    def plan_record_memo(self, skus) -> int:
+        """Taranacak SKU'ları URL başına say; birden fazla SKU'nun çıktığı URL'ler memo'lanır
+
+        Her çağrı sayıları ekler (work queue batch'leri). Memo'lanacak URL sayısını döndürür.
+        """
+        if self.record_memo is None or not self.sku_index:
+            return 0
+        counts: Dict[str, int] = {}
+        for sku in skus:
+            url = self.sku_index.get(sku)
+            if url:
+                counts[url] = counts.get(url, 0) + 1
+        for url, count in counts.items():
+            if count > 1:
+                self.memo_pending[url] = self.memo_pending.get(url, 0) + count
+        return len(self.memo_pending)
+
+    def release_record_memo(self, url: str) -> Optional[Dict]:
+        """Bir SKU URL'in kaydını istedi: memo'daki kaydı döndür, son SKU ise memo'dan at"""
+        remaining = self.memo_pending.get(url)
+        if remaining is None:
+            return None
+        if remaining > 1:
+            self.memo_pending[url] = remaining - 1
+            return self.record_memo.get(url)
+        del self.memo_pending[url]
+        return self.record_memo.pop(url, None)
+
+    async def get_product_record(self, session: aiohttp.ClientSession, url: str,
+                                 revalidate: bool = False):
+        """Ürün kaydını single-flight olarak çek
+
+        Aynı URL için eşzamanlı çağrılar tek isteğin sonucunu paylaşır. Birden fazla
+        giriş SKU'sunun çıktığı URL'lerin başarılı kayıtları record_memo'da son SKU'ya
+        verilene kadar tutulur; aynı sayfaya çıkan varyant SKU'lar sayfayı tekrar
+        çekmez ve parse etmez. Tek SKU'lu URL'ler memo'da hiç tutulmaz.
+        """
+        memoized = self.release_record_memo(url) if self.record_memo is not None else None
+
+        inflight = self.inflight_records.get(url)
+        if inflight is not None:
+            METRICS.inc('record_singleflight_shared')
+            return await asyncio.shield(inflight)
+
+        if memoized is not None and not revalidate:
+            METRICS.inc('record_memo_hits')
+            return memoized
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight_records[url] = future
+        record = None
+        try:
+            record = await self.get_product_detail_async(session, url, revalidate)
+            # Beklerken diğer SKU'lar kaydı paylaşmış olabilir: hâlâ bekleyen varsa sakla
+            if record is not None and url in self.memo_pending:
+                self.record_memo[url] = record
+            return record
+        finally:
+            # Lider iptal edilse de bekleyenler None (başarısız) ile devam eder
+            del self.inflight_records[url]
+            future.set_result(record)
+
+    async def scrape_sku_outcome(self, session: aiohttp.ClientSession, sku: str,
+                                 prefix: str = "", revalidate: bool = False) -> Tuple[str, Optional[Dict]]:
+        """SKU ile sitemap index'inde ara, ürün detayını çek; (sonuç durumu, ürün) döndür"""
+        try:
+            # Sitemap index'inde ara
+            product_url = await self.search_sku_in_sitemaps(session, sku)
+
+            if not product_url:
+                print(f"{prefix}[SEARCH] SKU: {sku} - Ürün bulunamadı")
+                return OUTCOME_NOT_FOUND, None
+
+            # Ürün detayını çek
+            result = await self.get_product_record(session, product_url, revalidate)
+
+            if result and self.config['batch_postprocess']:
+                # Validasyon ve filtreleme sonda BatchProcessor ile toplu yapılır
+                print(f"{prefix}[SEARCH] SKU: {sku} - Link bulundu - OK (ham)")
+                return OUTCOME_FOUND, result
+
+            if result:
+                # Filtreleme kontrolü
+                with METRICS.timer('filter'):
+                    filtered = ProductFilter.should_filter_product(result)
+                if not filtered:
+                    print(f"{prefix}[SEARCH] SKU: {sku} - Link bulundu - OK: {result.get('urun_adi_tam')}")
+                    return OUTCOME_FOUND, result
+                else:
+                    print(f"{prefix}[SEARCH] SKU: {sku} - Link bulundu - Filtrelendi")
+                    return OUTCOME_FILTERED, None
+            else:
+                print(f"{prefix}[SEARCH] SKU: {sku} - Link bulundu - Detay çekilemedi")
+                return OUTCOME_FAILED, None
+
+        except Exception as e:
+            print(f"[ERROR] SKU {sku} arama hatası: {e}")
+            return OUTCOME_FAILED, None
+
+    async def search_and_scrape_sku(self, session: aiohttp.ClientSession, sku: str, prefix: str = ""):
+        """SKU ile sitemap index'inde ara ve ürün detayını çek"""
+        _, result = await self.scrape_sku_outcome(session, sku, prefix)
+        return result
+
+    @contextlib.asynccontextmanager
+    async def scraping_session(self, memo: bool = True):
+        """Tarama altyapısını kur: AIMD limiter, token bucket, devre kesici, parse havuzu,
+        HTTP oturumu ve SKU index'i; çıkışta parse havuzunu kapat
+
+        memo=True ise plan_record_memo ile seçilen URL'lerin kayıtları memo'lanır.
+        """
+        import aiohttp
+
+        profile_stage('session_setup')
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            self.max_concurrent, self.config['min_concurrency'], self.config['max_concurrency'],
+            latency_factor=self.config['latency_factor']
+        )
+        self.rate_limiter = TokenBucket(self.config['requests_per_second'], self.config['rate_limit_burst'])
+        self.breaker = CircuitBreaker(
+            self.config['breaker_failure_threshold'],
+            self.config['breaker_open_seconds'],
+            self.config['breaker_max_open_seconds'],
+        )
+
+        connector = aiohttp.TCPConnector(
+            limit=self.config['max_concurrency'], limit_per_host=self.config['max_concurrency']
+        )
+        timeout = aiohttp.ClientTimeout(total=60)
+
+        parse_workers = self.resolve_parse_workers()
+        if parse_workers > 0:
+            self.parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+            print(f"[INFO] HTML parse: {parse_workers} süreç")
+
+        self.record_memo = {} if memo else None
+        self.memo_pending = {}
+        lag_watch = asyncio.create_task(PROFILER.watch_loop()) if PROFILER is not None else None
+        try:
+            async with aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=timeout
+            ) as session:
+                if self.http_archive is not None:
+                    session = self.http_archive.wrap(session)
+
+                # SKU -> URL index'i tek seferde oluştur
+                profile_stage('sitemap_index')
+                await self.build_sku_index(session)
+                profile_stage('scrape')
+                yield session
+        finally:
+            if lag_watch is not None:
+                lag_watch.cancel()
+            self.record_memo = None
+            self.memo_pending = {}
+            self.shutdown_parse_pool()
+
+    def skip_unchanged(self, queue: asyncio.Queue, delta: DeltaStore, deliver,
+                       journal: Optional[RunJournal] = None) -> asyncio.Queue:
+        """Delta modu: sitemap lastmod'u değişmemiş SKU'ları önceki kayıtla doldur (deliver(sku, kayıt))
+
+        Yeni, URL'i/lastmod'u değişmiş, lastmod'u bilinmeyen veya önceki denemesi
+        başarısız SKU'lar taranmak üzere döndürülen kuyruğa alınır.
+        """
+        remaining: asyncio.Queue = asyncio.Queue()
+        skipped = 0
+        while not queue.empty():
+            idx, sku = queue.get_nowait()
+            url = self.sku_index.get(sku)
+            lastmod = self.url_lastmod.get(url, "") if url else ""
+            previous = delta.get(sku) if url and lastmod else None
+
+            if (previous and previous['url'] == url and previous['lastmod'] == lastmod
+                    and previous['kind'] == self.record_kind
+                    and previous['status'] in (OUTCOME_FOUND, OUTCOME_FILTERED)):
+                deliver(sku, previous['record'])
+                if journal:
+                    journal.record(sku, previous['status'], previous['record'])
+                skipped += 1
+            else:
+                remaining.put_nowait((idx, sku))
+
+        METRICS.inc('delta_skipped', skipped)
+        print(f"[DELTA] {skipped} SKU değişmemiş (önceki kayıt), {remaining.qsize()} SKU taranacak")
+        return remaining
+
+    def record_delta(self, delta: DeltaStore, sku: str, status: str, record: Optional[Dict]):
+        """Taranan SKU'nun sonucunu delta store'a yaz, fiyat değişikliğini kaydet"""
+        if status not in (OUTCOME_FOUND, OUTCOME_FILTERED):
+            return
+
+        url = self.sku_index.get(sku)
+        if status == OUTCOME_FOUND:
+            previous = delta.get(sku)
+            change = price_change(sku, previous['record'] if previous else None, record)
+            if change:
+                self.price_changes.append(change)
+
+        delta.update(sku, url, self.url_lastmod.get(url, ""), status, record, self.record_kind)
+
+    def apply_batch_outcomes(self, outcomes: List[str], journal: Optional[RunJournal] = None,
+                             delta: Optional[DeltaStore] = None):
+        """--batch: BatchProcessor'ın belirlediği gerçek sonuçları geri yaz
+
+        Tarama sırasında ham kayıtlar OUTCOME_FOUND sayılır; filtrelenen veya boş
+        çıkan ürünlerin sayaçları, journal ve delta satırları ile fiyat değişiklikleri
+        kayıt kayıt yoldaki sonuca göre düzeltilir.
+        """
+        changed = {
+            sku: outcome for sku, outcome in zip(self.product_skus, outcomes) if outcome != OUTCOME_FOUND
+        }
+        for sku, outcome in changed.items():
+            counter = self.found_counters.get(sku)
+            if counter:
+                METRICS.inc(counter, -1)
+                METRICS.inc(counter[:-len(OUTCOME_FOUND)] + outcome)
+            if journal:
+                journal.record(sku, outcome, None)
+            if delta:
+                url = self.sku_index.get(sku) if self.sku_index else None
+                delta.update(sku, url, self.url_lastmod.get(url, "") if url else "", outcome, None,
+                             self.record_kind)
+
+        failed = [sku for sku, outcome in changed.items() if outcome == OUTCOME_FAILED]
+        self.failed_skus.extend(sku for sku in failed if sku not in self.failed_skus)
+        self.price_changes = [change for change in self.price_changes if change['sku'] not in changed]
+
+        if journal:
+            journal.flush()
+        if delta:
+            delta.flush()
+        if changed:
+            print(f"[BATCH] {len(changed)} SKU sonucu güncellendi "
+                  f"({len(changed) - len(failed)} filtrelendi, {len(failed)} boş ürün)")
+
+    async def scrape_batch(self, session: aiohttp.ClientSession,
+                           batch: List[Tuple[int, str]]) -> List[Tuple[int, str, Optional[Dict]]]:
+        """Kiralanan batch'i worker_count eşzamanlı görevle tara: (sıra, durum, kayıt) listesi"""
+        results = []
+        work: asyncio.Queue = asyncio.Queue()
+        for item in batch:
+            work.put_nowait(item)
+        self.plan_record_memo(sku for _, sku in batch)
+
+        async def worker():
+            while True:
+                try:
+                    position, sku = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                status, record = await self.scrape_sku_outcome(session, sku, f"[{position + 1}] ")
+                METRICS.inc(f'sku_{status}')
+                results.append((position, status, record))
+
+        await asyncio.gather(*(worker() for _ in range(max(1, min(self.config['worker_count'], len(batch))))))
+        return results
+
+    async def scrape_work_queue_async(self, work_queue: WorkQueue, worker_id: str) -> int:
+        """Paylaşılan kuyruktan batch kiralayıp tara; kuyrukta iş kalmayınca döner
+
+        Taranan SKU sayısını döndürür.
+        """
+        lease_seconds = self.config['queue_lease_seconds']
+        done = 0
+
+        async with self.scraping_session() as session:
+            async def heartbeat():
+                # Tek bir başarısız uzatma (ör. "database is locked") kiraları bırakmamalı:
+                # hata loglanır, sonraki aralıkta tekrar denenir
+                while True:
+                    await asyncio.sleep(lease_seconds / 3)
+                    try:
+                        await asyncio.to_thread(work_queue.heartbeat, worker_id, lease_seconds)
+                    except Exception as e:
+                        METRICS.inc('queue_heartbeat_errors')
+                        print(f"[WARNING] {worker_id}: kira uzatılamadı - {e}")
+
+            beat = asyncio.create_task(heartbeat())
+            try:
+                while True:
+                    batch = await asyncio.to_thread(
+                        work_queue.claim, worker_id, self.config['queue_batch_size'], lease_seconds
+                    )
+                    if not batch:
+                        if not await asyncio.to_thread(work_queue.unfinished):
+                            break
+                        # Kalan SKU'lar başka worker'larda kiralı: dolan kiralar geri alınır
+                        await asyncio.sleep(self.config['queue_poll_interval'])
+                        continue
+
+                    results = await self.scrape_batch(session, batch)
+                    await asyncio.to_thread(
+                        work_queue.complete, worker_id, results, self.config['queue_max_attempts']
+                    )
+                    done += len(batch)
+                    progress = await asyncio.to_thread(work_queue.progress)
+                    print(f"[QUEUE] {worker_id}: {done} SKU tarandı, kuyruk: {progress}")
+            finally:
+                beat.cancel()
+                # Heartbeat beklenmedik bir hatayla durduysa burada görünür
+                try:
+                    await beat
+                except asyncio.CancelledError:
+                    pass
+
+        return done
 
-    # SKU'ları oku
-    print(f"\n[INFO] Other.xlsx okunuyor: {other_xlsx_path}")
-    sku_list = read_other_xlsx(other_xlsx_path)
+    async def scrape_from_sku_list_async(self, sku_list: List[str], journal: Optional[RunJournal] = None,
+                                         delta: Optional[DeltaStore] = None, emit=None):
+        """SKU listesinden ürünleri eşzamanlı worker'larla çek (sonuçlar giriş sırasında)
 
-    if not sku_list:
-        print("[ERROR] Other.xlsx'ten SKU okunamadı")
+        journal verilirse her SKU sonucu journal'a yazılır; journal'da tamamlanmış
+        görünen SKU'lar (--resume) tekrar taranmaz, kayıtları journal'dan alınır.
+        delta verilirse sitemap lastmod'u değişmemiş ürünler de tekrar çekilmez.
+        emit verilirse her kayıt tamamlandığında emit(giriş satırı, kayıt) çağrılır,
+        sonuçlar bellekte tutulmaz ve boş liste döner.
+        """
+        if not sku_list:
+            print("[INFO] SKU listesi boş")
+            return []
+
+        print(f"\n{'='*80}")
+        print(f"OTHER.XLSX TARAMASI")
+        print(f"{'='*80}")
+
+        results: Optional[List[Optional[Dict]]] = [None] * len(sku_list) if emit is None else None
+        queue: asyncio.Queue = asyncio.Queue()
+        resumed = 0
+        product_count = 0
+
+        # Tekrarlanan SKU'lar bir kez taranır, sonuç tüm satırlarına verilir
+        positions: Dict[str, List[int]] = {}
+        for idx, sku in enumerate(sku_list):
+            positions.setdefault(sku, []).append(idx)
+        duplicates = len(sku_list) - len(positions)
+        if duplicates:
+            METRICS.inc('sku_duplicates', duplicates)
+            print(f"[INFO] {duplicates} tekrarlanan SKU tek sefer taranacak")
+
+        def deliver(sku: str, record: Optional[Dict]):
+            """SKU'nun kaydını tüm giriş satırlarına ver"""
+            nonlocal product_count
+            if not record:
+                return
+            for idx in positions[sku]:
+                product_count += 1
+                if results is None:
+                    emit(idx, record)
+                else:
+                    results[idx] = record
+
+        for sku, indexes in positions.items():
+            entry = journal.completed.get(sku) if journal else None
+            if entry:
+                deliver(sku, entry['record'])
+                resumed += 1
+            else:
+                queue.put_nowait((indexes[0], sku))
+
+        if resumed:
+            print(f"[RESUME] {resumed} SKU journal'dan alındı")
+        print(f"[INFO] {queue.qsize()} SKU taranacak...")
+
+        self.failed_skus = []
+        self.price_changes = []
+        self.found_counters = {}
+
+        if not queue.empty():
+            async with self.scraping_session() as session:
+                if delta:
+                    queue = self.skip_unchanged(queue, delta, deliver, journal)
+                # Aynı URL'e çıkan SKU sayıları: yalnızca paylaşılan URL'lerin kaydı memo'lanır
+                scan = [queue.get_nowait() for _ in range(queue.qsize())]
+                self.plan_record_memo(sku for _, sku in scan)
+                for item in scan:
+                    queue.put_nowait(item)
+
+                async def worker(work: asyncio.Queue, counter_prefix: str, failed: List):
+                    while True:
+                        try:
+                            idx, sku = work.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        prefix = f"[{idx + 1}/{len(sku_list)}] "
+                        status, result = await self.scrape_sku_outcome(session, sku, prefix)
+                        METRICS.inc(f'{counter_prefix}{status}')
+                        if status == OUTCOME_FOUND and self.config['batch_postprocess']:
+                            self.found_counters[sku] = f'{counter_prefix}{status}'
+                        deliver(sku, result)
+                        if journal:
+                            journal.record(sku, status, result)
+                        if delta:
+                            self.record_delta(delta, sku, status, result)
+                        if status == OUTCOME_FAILED:
+                            failed.append((idx, sku))
+
+                async def run_pass(work: asyncio.Queue, counter_prefix: str) -> List:
+                    failed = []
+                    worker_count = max(1, min(self.config['worker_count'], work.qsize()))
+                    await asyncio.gather(*(worker(work, counter_prefix, failed) for _ in range(worker_count)))
+                    return failed
+
+                dead_letters = await run_pass(queue, 'sku_')
+
+                # Dead-letter: başarısız SKU'lar sonda bir kez daha denenir
+                if dead_letters:
+                    print(f"\n[RETRY] {len(dead_letters)} başarısız SKU tekrar deneniyor...")
+                    retry_queue: asyncio.Queue = asyncio.Queue()
+                    for item in sorted(dead_letters):
+                        retry_queue.put_nowait(item)
+                    still_failed = await run_pass(retry_queue, 'sku_retry_')
+                    self.failed_skus = [sku for _, sku in sorted(still_failed)]
+
+            print(f"[INFO] Son eşzamanlılık limiti: {self.concurrency.limit:.1f}")
+
+        if journal:
+            journal.flush()
+        if delta:
+            delta.flush()
+
+        if self.failed_skus:
+            print(f"[WARNING] {len(self.failed_skus)} SKU çekilemedi: {', '.join(self.failed_skus[:20])}"
+                  + (" ..." if len(self.failed_skus) > 20 else ""))
+
+        if results is None:
+            products = []
+            self.product_skus = []
+        else:
+            products = [result for result in results if result]
+            self.product_skus = [sku for sku, result in zip(sku_list, results) if result]
+
+        print(f"\n[OK] Tarama tamamlandı")
+        print(f"     Toplam: {product_count} ürün bulundu")
+
+        return products
+
+
+class PriceLookupService:
+    """Uzun süre çalışan fiyat sorgulama servisi (--serve)
+
+    HTTP oturumu, SKU -> URL index'i ve çıkarılmış kayıtların TTL cache'i bellekte
+    tutulur (en fazla service_max_records kayıt, en eski kullanılan atılır). Cache'teki SKU'lar milisaniyede, cache dışındakiler tek sayfa isteğiyle
+    yanıtlanır. Arka planda index periyodik yenilenir; sitemap lastmod'u değişen
+    cache'li ürünler yeniden çekilir.
+
+    GET  /price/{sku}          tek SKU
+    GET  /prices?sku=a,b       birden fazla SKU
+    POST /prices {"skus": []}  birden fazla SKU
+    GET  /health               index ve cache durumu
+    """
+
+    def __init__(self, scraper: DogtasSitemapScraper):
+        self.scraper = scraper
+        self.ttl = scraper.config['service_record_ttl']
+        self.refresh_interval = scraper.config['service_refresh_interval']
+        self.max_records = scraper.config['service_max_records']
+        self.max_batch = scraper.config['service_max_batch']
+        # SKU -> (çekildiği an, url, lastmod, durum, kayıt); sıra = son kullanım (LRU)
+        self.records: OrderedDict[str, Tuple[float, Optional[str], str, str, Optional[Dict]]] = OrderedDict()
+        self.session = None
+        self.index_built_at = 0.0
+
+    async def lookup(self, sku: str) -> Dict:
+        """SKU'nun fiyat kaydı: TTL içindeyse cache'ten, değilse tek sayfa isteğiyle"""
+        sku = sku.strip()
+        cached = self.records.get(sku)
+        now = time.time()
+        if cached and now - cached[0] < self.ttl:
+            METRICS.inc('lookup_cache_hits')
+            self.records.move_to_end(sku)
+            fetched_at, _, _, status, record = cached
+            return {'sku': sku, 'status': status, 'record': record,
+                    'cached': True, 'age_s': round(now - fetched_at, 1)}
+
+        METRICS.inc('lookup_misses')
+        with METRICS.timer('lookup'):
+            status, record = await self.fetch(sku)
+        return {'sku': sku, 'status': status, 'record': record, 'cached': False, 'age_s': 0.0}
+
+    async def fetch(self, sku: str, revalidate: bool = False) -> Tuple[str, Optional[Dict]]:
+        """SKU'yu çek ve cache'e yaz (başarısız sonuçlar cache'lenmez)"""
+        status, record = await self.scraper.scrape_sku_outcome(self.session, sku, "[SERVE] ", revalidate)
+        if status != OUTCOME_FAILED:
+            url = self.scraper.sku_index.get(sku)
+            self.records[sku] = (time.time(), url, self.scraper.url_lastmod.get(url, ""), status, record)
+            self.records.move_to_end(sku)
+            while len(self.records) > self.max_records:
+                self.records.popitem(last=False)
+                METRICS.inc('service_evictions')
+        return status, record
+
+    async def refresh(self):
+        """Index'i yenile; URL'i veya lastmod'u değişen cache'li SKU'ları tekrar çek"""
+        await self.scraper.build_sku_index(self.session)
+        self.index_built_at = time.time()
+
+        now = time.time()
+        changed = []
+        for sku, (fetched_at, url, lastmod, _, _) in list(self.records.items()):
+            if now - fetched_at >= self.ttl:
+                # Süresi dolmuş: ilk sorguda çekilir
+                del self.records[sku]
+                continue
+            current_url = self.scraper.sku_index.get(sku)
+            if current_url != url or self.scraper.url_lastmod.get(current_url, "") != lastmod:
+                changed.append(sku)
+
+        if changed:
+            print(f"[REFRESH] {len(changed)} SKU değişmiş, yeniden çekiliyor")
+            await asyncio.gather(*(self.fetch(sku, revalidate=True) for sku in changed))
+        METRICS.inc('service_refreshes')
+
+    async def refresher(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"[ERROR] Arka plan yenileme hatası: {e}")
+
+    async def handle_price(self, request):
+        from aiohttp import web
+
+        result = await self.lookup(request.match_info['sku'])
+        status = {OUTCOME_FOUND: 200, OUTCOME_FAILED: 502}.get(result['status'], 404)
+        return web.json_response(result, status=status, dumps=self.dumps)
+
+    async def handle_prices(self, request):
+        from aiohttp import web
+
+        if request.method == 'POST':
+            try:
+                skus = (await request.json()).get('skus', [])
+            except (ValueError, AttributeError):
+                skus = None
+            if not isinstance(skus, list) or not all(
+                    isinstance(sku, (str, int)) and not isinstance(sku, bool) for sku in skus):
+                return web.json_response({'error': 'Gövde {"skus": [...]} olmalı'}, status=400)
+        else:
+            skus = [sku for sku in request.query.get('sku', '').split(',') if sku.strip()]
+
+        if len(skus) > self.max_batch:
+            return web.json_response({'error': f'En fazla {self.max_batch} SKU sorgulanabilir'}, status=400)
+
+        results = await asyncio.gather(*(self.lookup(str(sku)) for sku in skus))
+        return web.json_response({'results': results}, dumps=self.dumps)
+
+    async def handle_health(self, request):
+        from aiohttp import web
+
+        return web.json_response({
+            'indexed_skus': len(self.scraper.sku_index or {}),
+            'cached_records': len(self.records),
+            'index_age_s': round(time.time() - self.index_built_at, 1),
+            'counters': METRICS.counters,
+        }, dumps=self.dumps)
+
+    @staticmethod
+    def dumps(data) -> str:
+        return json.dumps(data, ensure_ascii=False, default=json_default)
+
+    async def serve(self, host: str, port: int):
+        """Servisi başlat; kesilene (Ctrl+C) kadar çalışır"""
+        from aiohttp import web
+
+        # Servis uzun süre çalışır: kayıtlar kendi TTL cache'inde tutulur, memo kapalı
+        async with self.scraper.scraping_session(memo=False) as session:
+            self.session = session
+            self.index_built_at = time.time()
+
+            app = web.Application()
+            app.router.add_get('/price/{sku}', self.handle_price)
+            app.router.add_get('/prices', self.handle_prices)
+            app.router.add_post('/prices', self.handle_prices)
+            app.router.add_get('/health', self.handle_health)
+
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            refresher = asyncio.create_task(self.refresher())
+            try:
+                await web.TCPSite(runner, host, port).start()
+                print(f"[SERVE] http://{host}:{port}/price/<sku> dinleniyor (Ctrl+C ile çıkış)")
+                await asyncio.Event().wait()
+            finally:
+                refresher.cancel()
+                await runner.cleanup()
+
+
+# Çıktı dosyalarındaki sütun sırası
+OUTPUT_COLUMNS = [
+    'kategori', 'KOLEKSIYON', 'sku', 'urun_adi_tam', 'urun_adi',
+    'LISTE', 'PERAKENDE', 'urun_url'
+]
+
+# Sayısal çıktı sütunları (Parquet şeması)
+INT_COLUMNS = ('LISTE', 'PERAKENDE')
+
+
+class OutputSink(ABC):
+    """Satırları sırayla yazan çıktı hedefi"""
+
+    label = ""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.rows = 0
+
+    @abstractmethod
+    def write(self, row: List):
+        """Bir satır yaz (OUTPUT_COLUMNS sırasıyla)"""
+
+    @abstractmethod
+    def close(self):
+        """Kalan satırları yazıp dosyayı kapat"""
+
+    def abort(self):
+        """Yazma hata ile kesildi: dosyayı kapat ve yarım çıktıyı sil"""
+        with contextlib.suppress(Exception):
+            self.close()
+        with contextlib.suppress(OSError):
+            os.remove(self.filepath)
+
+
+class XlsxSink(OutputSink):
+    """openpyxl write-only (streaming) xlsx yazıcı"""
+
+    label = "Excel"
+
+    def __init__(self, filepath: str):
+        super().__init__(filepath)
+        from openpyxl import Workbook
+
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Sheet1")
+        self.sheet.append(OUTPUT_COLUMNS)
+
+    def write(self, row: List):
+        self.sheet.append(row)
+        self.rows += 1
+
+    def close(self):
+        self.workbook.save(self.filepath)
+
+
+class CsvSink(OutputSink):
+    """CSV yazıcı (Excel'de Türkçe karakterler için UTF-8 BOM)"""
+
+    label = "CSV"
+
+    def __init__(self, filepath: str):
+        super().__init__(filepath)
+        self.file = open(filepath, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(OUTPUT_COLUMNS)
+
+    def write(self, row: List):
+        self.writer.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink(OutputSink):
+    """pyarrow ile row group'lar halinde Parquet yazıcı"""
+
+    label = "Parquet"
+
+    def __init__(self, filepath: str, batch_size: int = 10_000):
+        super().__init__(filepath)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([
+            (col, pa.int64() if col in INT_COLUMNS else pa.string()) for col in OUTPUT_COLUMNS
+        ])
+        self.writer = pq.ParquetWriter(filepath, self.schema)
+        self.batch_size = batch_size
+        self.batch: List[List] = []
+
+    def write(self, row: List):
+        self.batch.append(row)
+        self.rows += 1
+        if len(self.batch) >= self.batch_size:
+            self._write_batch()
+
+    def _write_batch(self):
+        if not self.batch:
+            return
+        columns = list(zip(*self.batch))
+        table = self.pa.Table.from_arrays(
+            [self.pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+        self.writer.write_table(table)
+        self.batch = []
+
+    def close(self):
+        self._write_batch()
+        self.writer.close()
+
+
+OUTPUT_SINKS = {
+    'xlsx': XlsxSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+}
+
+
+class SortedProductWriter:
+    """Ürünleri urun_adi_tam'a göre A-Z sıralayıp çıktı hedeflerine yazar
+
+    Kayıtlar add() ile artımlı alınır; bellekte run_size kayıt biriktiğinde sıralı
+    bir run olarak geçici dosyaya yazılır. close() tüm run'ları heapq.merge ile
+    birleştirip hedeflere akıtır (external merge sort). urun_adi_tam'ı olmayanlar sona gider.
+    """
+
+    def __init__(self, sinks: List[OutputSink], run_size: int = 20_000):
+        self.sinks = sinks
+        self.run_size = run_size
+        self.buffer: List[Tuple] = []
+        self.runs: List[str] = []
+        self.seq = 0
+
+    @staticmethod
+    def sort_key(record: Dict) -> Tuple:
+        name = record.get('urun_adi_tam')
+        return (name is None, name or "")
+
+    def add(self, record: Dict, order: Optional[Tuple] = None):
+        """Kaydı ekle; order eşit isimlerdeki sırayı belirler (verilmezse ekleme sırası)"""
+        row = [record.get(col) for col in OUTPUT_COLUMNS]
+        # order: eşit isimlerde giriş sırası korunur
+        self.buffer.append((self.sort_key(record), order or (self.seq,), row))
+        self.seq += 1
+        if len(self.buffer) >= self.run_size:
+            self._spill()
+
+    def _spill(self):
+        self.buffer.sort()
+        fd, path = tempfile.mkstemp(prefix='dogtas_sort_', suffix='.jsonl')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for key, order, row in self.buffer:
+                f.write(json.dumps([key, order, row], ensure_ascii=False) + "\n")
+        self.runs.append(path)
+        self.buffer = []
+
+    @staticmethod
+    def _read_run(path: str):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                key, order, row = json.loads(line)
+                yield tuple(key), tuple(order), row
+
+    def close(self, sinks: Optional[List[OutputSink]] = None) -> int:
+        """Sıralı satırları tüm hedeflere yaz, yazılan satır sayısını döndür
+
+        sinks verilirse (dosyalar yazma anına kadar açılmaz) bunlara yazılır. Hata
+        olursa tüm hedefler kapatılır ve yarım dosyalar silinir.
+        """
+        if sinks is not None:
+            self.sinks = sinks
+        self.buffer.sort()
+        completed = False
+        try:
+            merged = heapq.merge(self.buffer, *(self._read_run(path) for path in self.runs))
+            for _, _, row in merged:
+                for sink in self.sinks:
+                    sink.write(row)
+            completed = True
+        finally:
+            try:
+                self._close_sinks(completed)
+            finally:
+                self.discard()
+        return self.seq
+
+    def _close_sinks(self, completed: bool):
+        """Hedeflerin hepsini kapat (biri hata verse de); yazma yarım kaldıysa sil"""
+        error = None
+        for sink in self.sinks:
+            if not completed:
+                sink.abort()
+                continue
+            try:
+                sink.close()
+            except Exception as e:
+                sink.abort()
+                error = error or e
+        if error:
+            raise error
+
+    def discard(self):
+        """Bellekteki ve geçici dosyalardaki satırları bırak"""
+        self.buffer = []
+        for path in self.runs:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        self.runs = []
+
+
+class ProductOutput:
+    """Taranan ürünleri tamamlandıkça çıktıya akıtır (--batch olmayan taramalar)
+
+    Duplikasyon kuralları ve istatistikler kayıt başına uygulanır, satırlar
+    SortedProductWriter'a verilir; tarama boyunca ürün listesi tutulmaz. order
+    (giriş satırı) eşit isimlerin ve kategori sıralamasının liste yoluyla aynı
+    olmasını sağlar. Çıktı dosyaları yalnızca close()'da açılır: tarama hata ile
+    biterse önceki çıktılar bozulmaz.
+    """
+
+    def __init__(self, output_base: str, formats: List[str], duplicate: bool = True):
+        self.output_base = output_base
+        self.formats = formats
+        self.duplicate = duplicate
+        self.writer = SortedProductWriter([])
+        self.statistics = ProductStatistics()
+        self.count = 0
+
+    def add(self, order: int, product: ProductRecord):
+        """order. giriş satırının kaydını (ve duplikasyon kopyalarını) ekle"""
+        products = [product]
+        if self.duplicate:
+            with METRICS.timer('duplication'):
+                products += ProductFilter.duplicates(product)
+        for rank, item in enumerate(products):
+            self.writer.add(item, (order, rank))
+            self.statistics.add(item, (order, rank))
+        self.count += len(products)
+
+    def extend(self, products: List[ProductRecord]):
+        """Sıralı bir ürün listesini ekle"""
+        for order, product in enumerate(products, self.count):
+            self.add(order, product)
+
+    def close(self) -> List[str]:
+        """Çıktı dosyalarını yaz, yollarını döndür"""
+        sinks = []
+        try:
+            for fmt in self.formats:
+                sinks.append(OUTPUT_SINKS[fmt](f"{self.output_base}.{fmt}"))
+        except BaseException:
+            for sink in sinks:
+                sink.abort()
+            self.writer.discard()
+            raise
+
+        self.writer.close(sinks)
+        for sink in sinks:
+            print(f"[SAVED] {sink.label}: {sink.filepath} ({sink.rows} satır)")
+        return [sink.filepath for sink in sinks]
+
+    def discard(self):
+        """Tarama hata ile bitti: dosya yazmadan geçici run'ları sil"""
+        self.writer.discard()
+
+
+def save_products(products, output_base: str, formats: List[str] = ('xlsx',)) -> List[str]:
+    """Ürünleri seçili formatlarda (xlsx, csv, parquet) output_base.<format> dosyalarına kaydet"""
+    output = ProductOutput(output_base, formats, duplicate=False)
+    output.extend(products)
+
+    if not output.count:
+        print("[WARNING] Kaydedilecek ürün yok")
+
+    return output.close()
+
+
+def save_to_excel(products, filepath: str):
+    """Ürünleri Excel'e kaydet"""
+    if not products:
+        print("[WARNING] Kaydedilecek ürün yok")
         return
 
-    # Scraper oluştur
-    scraper = DogtasSitemapScraper(max_concurrent=2)
+    writer = SortedProductWriter([XlsxSink(filepath)])
+    for product in products:
+        writer.add(product)
+    rows = writer.close()
+    print(f"[SAVED] Excel: {filepath} ({rows} satır)")
 
-    # Zamanlama
-    start_time = time.time()
 
-    # SCRAPING
+PRICE_CHANGE_COLUMNS = [
+    'sku', 'urun_adi_tam', 'eski_LISTE', 'yeni_LISTE', 'eski_PERAKENDE', 'yeni_PERAKENDE', 'durum'
+]
+
+
+def save_price_changes(changes: List[Dict], filepath: str):
+    """--delta fiyat değişikliği raporunu Excel'e kaydet (değişiklik yoksa sadece başlık)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(PRICE_CHANGE_COLUMNS)
+    for change in sorted(changes, key=lambda c: c['sku']):
+        sheet.append([change[col] for col in PRICE_CHANGE_COLUMNS])
+    workbook.save(filepath)
+    print(f"[SAVED] Fiyat değişiklikleri: {filepath} ({len(changes)} satır)")
+
+
+class ProductStatistics:
+    """Kategori dağılımı ve LISTE/PERAKENDE fiyat istatistikleri (artımlı)
+
+    Kayıtlar herhangi bir sırada eklenebilir; eşit sayıdaki kategoriler en küçük
+    order'larına (ürün listesindeki ilk görülme sırası) göre sıralanır.
+    """
+
+    PRICE_FIELDS = ('LISTE', 'PERAKENDE')
+
+    def __init__(self):
+        self.total = 0
+        # kategori -> [ürün sayısı, ilk order]
+        self.kategoriler: Dict[str, List] = {}
+        # alan -> [toplam, adet, minimum, maksimum]
+        self.prices: Dict[str, Optional[List]] = {field: None for field in self.PRICE_FIELDS}
+
+    def add(self, product: Dict, order):
+        self.total += 1
+        kat = product.get('kategori', 'Bilinmiyor')
+        if kat:
+            entry = self.kategoriler.get(kat)
+            if entry is None:
+                self.kategoriler[kat] = [1, order]
+            else:
+                entry[0] += 1
+                entry[1] = min(entry[1], order)
+
+        for field in self.PRICE_FIELDS:
+            price = product.get(field)
+            if not price:
+                continue
+            summary = self.prices[field]
+            if summary is None:
+                self.prices[field] = [price, 1, price, price]
+            else:
+                summary[0] += price
+                summary[1] += 1
+                summary[2] = min(summary[2], price)
+                summary[3] = max(summary[3], price)
+
+    def result(self) -> Dict:
+        stats = {
+            'toplam': self.total,
+            'kategoriler': [
+                (kat, count) for kat, (count, _) in
+                sorted(self.kategoriler.items(), key=lambda x: (-x[1][0], x[1][1]))
+            ],
+        }
+        for field, summary in self.prices.items():
+            stats[field] = {
+                'ortalama': summary[0] / summary[1],
+                'minimum': summary[2],
+                'maksimum': summary[3],
+            } if summary else None
+        return stats
+
+
+def compute_statistics(products: List[Dict]) -> Dict:
+    """Kategori dağılımı ve LISTE/PERAKENDE fiyat istatistikleri"""
+    statistics = ProductStatistics()
+    for order, product in enumerate(products):
+        statistics.add(product, order)
+    return statistics.result()
+
+
+def print_statistics(products: Optional[List[Dict]] = None, stats: Optional[Dict] = None):
+    """İstatistikleri yazdır (stats verilirse yeniden hesaplanmaz)"""
+    if stats is None:
+        stats = compute_statistics(products)
+
     print("\n" + "="*80)
-    print("SCRAPING BAŞLIYOR...")
+    print("ÖZET İSTATİSTİKLER")
     print("="*80)
+    print(f"Toplam Ürün: {stats['toplam']}")
+
+    print(f"\nKategoriler:")
+    for kat, sayi in stats['kategoriler']:
+        print(f"  - {kat}: {sayi} ürün")
+
+    for field, label in (('LISTE', 'LİSTE'), ('PERAKENDE', 'PERAKENDE')):
+        if stats[field]:
+            print(f"\n{label} Fiyat İstatistikleri:")
+            print(f"  - Ortalama: {stats[field]['ortalama']:,.0f} TL")
+            print(f"  - Minimum: {stats[field]['minimum']:,} TL")
+            print(f"  - Maksimum: {stats[field]['maksimum']:,} TL")
+
+
+class BatchProcessor:
+    """Ham ürün kayıtlarını sütun bazında (pandas) toplu işler
+
+    DataValidator.validate_product_data, boş ürün kontrolü, ProductFilter ve
+    istatistikler ile aynı sonucu üretir; her adım kayıt döngüsü yerine birkaç
+    vektörel sütun işlemiyle yapılır.
+    """
+
+    STRING_FIELDS = ['urun_adi', 'urun_adi_tam', 'KOLEKSIYON', 'kategori']
+
+    @staticmethod
+    def clean_price_column(prices):
+        """DataValidator.clean_price'ın vektörel karşılığı: Int64 (boş/aralık dışı/hatalı -> NA)
+
+        Fiyat metinleri çok tekrar ettiği için string işlemleri yalnızca
+        benzersiz değerlerde yapılır, sonuç kodlarla satırlara yayılır.
+        """
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(prices)
+        clean = pd.Series(uniques, dtype=object).astype(str).str.replace(r'[^\d.,]', '', regex=True)
+
+        dot = clean.str.rfind('.')
+        comma = clean.str.rfind(',')
+        has_dot = dot >= 0
+        has_comma = comma >= 0
+
+        normalized = clean.copy()
+        # Türkçe format (12.500,50) -> (12500.50)
+        turkish = has_dot & has_comma & (dot < comma)
+        normalized[turkish] = clean[turkish].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        # İngilizce format (12,500.50) -> (12500.50)
+        english = has_dot & has_comma & (dot > comma)
+        normalized[english] = clean[english].str.replace(',', '', regex=False)
+        # Sadece virgül: ondalık ayırıcı
+        comma_only = has_comma & ~has_dot
+        normalized[comma_only] = clean[comma_only].str.replace(',', '.', regex=False)
+        # Sadece nokta: son parça 2 haneli değilse binlik ayırıcı
+        dot_only = has_dot & ~has_comma & (clean.str.len() - dot - 1 != 2)
+        normalized[dot_only] = clean[dot_only].str.replace('.', '', regex=False)
+
+        unique_values = pd.to_numeric(normalized.where(normalized != "", None), errors='coerce')
+
+        # factorize boş değerlere -1 verir: sona eklenen NaN/False'a düşer
+        values = np.append(unique_values.to_numpy(dtype=float), np.nan)[codes]
+        has_text = np.append((clean != "").to_numpy(), False)[codes]
+
+        parsed = ~np.isnan(values)
+        out_of_range = parsed & ((values < 10) | (values > 1_000_000))
+        unparsed = ~parsed & has_text
+        if out_of_range.any():
+            print(f"[WARNING] {int(out_of_range.sum())} fiyat aralık dışı")
+        if unparsed.any():
+            print(f"[WARNING] {int(unparsed.sum())} fiyat parse edilemedi")
+
+        values[out_of_range] = np.nan
+        # int(price_float) ile aynı: pozitif değerlerde aşağı yuvarlama
+        return pd.Series(np.floor(values), index=prices.index).astype('Int64')
+
+    @staticmethod
+    def validate_frame(df):
+        """validate_product_data + boş ürün kontrolü"""
+        out = df.copy()
+        out['LISTE'] = BatchProcessor.clean_price_column(df['orijinal_fiyat'])
+        out['PERAKENDE'] = BatchProcessor.clean_price_column(df['fiyat'])
+
+        # SKU validasyonu (sadece dolu SKU'lar)
+        sku = df['sku']
+        cleaned = sku.str.strip().str.replace(r'[^A-Za-z0-9\-_]', '', regex=True)
+        cleaned = cleaned.where(cleaned.str.len() >= 3, None)
+        out['sku'] = cleaned.where(sku.notna() & (sku != ""), sku)
+
+        # String alanları temizle (sadece dolu olanlar)
+        for field in BatchProcessor.STRING_FIELDS:
+            column = df[field]
+            out[field] = column.str.strip().where(column.notna() & (column != ""), column)
+
+        out = out.drop(columns=[
+            col for col in ['orijinal_fiyat', 'indirimli_fiyat', 'fiyat', 'indirim_yuzdesi',
+                            'kazanc', 'kampanya_metni', 'sepette_indirim', 'marka']
+            if col in out.columns
+        ])
+
+        # BOŞ ÜRÜN KONTROLÜ (urun_adi_tam yukarıda strip edildi)
+        return out[out['urun_adi_tam'].fillna("") != ""].reset_index(drop=True)
+
+    @staticmethod
+    def rule_mask(df, rule: ProductRule):
+        """ProductRule.match'in vektörel karşılığı (alanlar validate_frame'de strip edilmiş olmalı)"""
+        import numpy as np
+
+        if rule.kategori is None:
+            mask = np.ones(len(df), dtype=bool)
+        else:
+            mask = (df['kategori'].fillna("") == rule.kategori).to_numpy(copy=True)
+
+        # Anahtar kelime araması yalnızca kategorisi tutan satırlarda yapılır
+        if rule.matcher is not None and mask.any():
+            subset = df[mask]
+            hit = np.zeros(len(subset), dtype=bool)
+            for field in rule.fields:
+                text = subset[field].fillna("").str.translate(TURKISH_LOWER).str.lower()
+                hit |= text.str.contains(rule.matcher).to_numpy(dtype=bool)
+            mask[mask] = hit
 
-    products = asyncio.run(scraper.scrape_from_sku_list_async(sku_list))
+        return mask
 
-    # Duplikasyon kuralları uygula
-    if products:
+    @staticmethod
+    def filter_mask(df):
+        """ProductFilter.should_filter_product'ın vektörel karşılığı (True = filtrele)"""
+        import numpy as np
+
+        mask = np.zeros(len(df), dtype=bool)
+        for rule in ProductFilter.FILTER_RULES:
+            mask |= BatchProcessor.rule_mask(df, rule)
+        return mask
+
+    @staticmethod
+    def duplicate_frame(df):
+        """ProductFilter.apply_duplication_rules: kopyalar orijinalin hemen arkasına, kural sırasıyla eklenir"""
+        import numpy as np
+        import pandas as pd
+
+        order = [np.arange(len(df))]
+        rank = [np.zeros(len(df), dtype=int)]
+        pieces = [df]
+        for index, rule in enumerate(ProductFilter.DUPLICATE_RULES, 1):
+            mask = BatchProcessor.rule_mask(df, rule)
+            if not mask.any():
+                continue
+            pieces.append(df[mask].assign(kategori=rule.target_kategori))
+            order.append(np.flatnonzero(mask))
+            rank.append(np.full(int(mask.sum()), index))
+
+        if len(pieces) == 1:
+            return df, 0
+
+        combined = pd.concat(pieces, ignore_index=True)
+        positions = np.lexsort((np.concatenate(rank), np.concatenate(order)))
+        return combined.iloc[positions].reset_index(drop=True), len(combined) - len(df)
+
+    @staticmethod
+    def statistics(df) -> Dict:
+        """compute_statistics'in sütun bazlı karşılığı"""
+        kategori = df['kategori']
+        present = kategori[kategori.notna() & (kategori.astype(str) != "")]
+        counts = present.groupby(present, sort=False).size().sort_values(ascending=False, kind='stable')
+
+        stats = {
+            'toplam': len(df),
+            'kategoriler': [(kat, int(sayi)) for kat, sayi in counts.items()],
+        }
+        for field in ('LISTE', 'PERAKENDE'):
+            prices = df[field].dropna()
+            prices = prices[prices != 0]
+            stats[field] = {
+                'ortalama': int(prices.sum()) / len(prices),
+                'minimum': int(prices.min()),
+                'maksimum': int(prices.max()),
+            } if len(prices) else None
+        return stats
+
+    @staticmethod
+    def to_records(df) -> List[ProductRecord]:
+        """DataFrame -> ProductRecord listesi (NA -> None, fiyatlar int)"""
+        columns = []
+        for name in ProductRecord.FIELDS:
+            if name not in df.columns:
+                columns.append([None] * len(df))
+                continue
+            values = df[name].astype(object).to_numpy(copy=True)
+            values[df[name].isna().to_numpy()] = None
+            columns.append(values.tolist())
+        return [ProductRecord(*row) for row in zip(*columns)]
+
+    @staticmethod
+    def process(raw_records: List[Dict]) -> Tuple[List[ProductRecord], Dict]:
+        """Ham kayıtları validate et, filtrele, duplike et; (ürünler, istatistikler) döndür"""
+        products, stats, _ = BatchProcessor.process_outcomes(raw_records)
+        return products, stats
+
+    @staticmethod
+    def process_outcomes(raw_records: List[Dict]) -> Tuple[List[ProductRecord], Dict, List[str]]:
+        """process() + ham kayıt başına kayıt kayıt yoldaki sonuç durumu
+
+        Boş ürünler (validasyon sonrası urun_adi_tam yok) OUTCOME_FAILED, kurala
+        takılanlar OUTCOME_FILTERED, kalanlar OUTCOME_FOUND olur.
+        """
+        import numpy as np
+        import pandas as pd
+
+        if not raw_records:
+            return [], compute_statistics([]), []
+
+        df = pd.DataFrame.from_records(raw_records)
+        # Giriş sırası: satırlar düşse de sonuç ham kayda yazılabilsin
+        df['_row'] = np.arange(len(df))
+        outcomes = np.full(len(df), OUTCOME_FAILED, dtype=object)
+
+        with METRICS.timer('validate'):
+            df = BatchProcessor.validate_frame(df)
+        outcomes[df['_row'].to_numpy()] = OUTCOME_FOUND
+
+        with METRICS.timer('filter'):
+            mask = BatchProcessor.filter_mask(df)
+            outcomes[df['_row'].to_numpy()[mask]] = OUTCOME_FILTERED
+            df = df[~mask].reset_index(drop=True)
+        print(f"[FILTER] {int(mask.sum())} ürün filtrelendi")
+
+        with METRICS.timer('duplication'):
+            df, duplicate_count = BatchProcessor.duplicate_frame(df)
+        print(f"[DUPLICATE] {duplicate_count} ürün Yatak Odası olarak kopyalandı")
+
+        stats = BatchProcessor.statistics(df)
+        return BatchProcessor.to_records(df), stats, outcomes.tolist()
+
+
+# Açılış profili: ilk kullanımda yüklenen bağımlılıklar
+STARTUP_IMPORTS = [
+    ('xml.etree.ElementTree', "Sitemap parser"),
+    ('openpyxl', "xlsx okuma/yazma"),
+    ('aiohttp', "HTTP istemcisi"),
+    ('bs4', "HTML backend (bs4)"),
+    ('lxml.html', "HTML backend (lxml)"),
+    ('pyarrow.parquet', "Parquet çıktısı"),
+    ('pandas', "Toplu işleme (--batch)"),
+    ('yaml', "YAML kural dosyası (--rules)"),
+]
+
+# main() ilk çıktısına kadar hedef süre (modül yükleme dahil)
+STARTUP_TARGET_SECONDS = 0.5
+
+
+def profile_startup(first_output_at: float):
+    """Açılış süresini ve bağımlılık başına import maliyetini raporla
+
+    Her bağımlılık sırayla import edilir; ortak alt modüller onları ilk yükleyen
+    bağımlılığa yazılır (python -X importtime'daki kümülatif süre gibi).
+    """
+    import importlib
+
+    module_cost = MODULE_LOADED - MODULE_START
+    first_output = first_output_at - MODULE_START
+    status = "OK" if first_output <= STARTUP_TARGET_SECONDS else "HEDEF AŞILDI"
+
+    print(f"\n[STARTUP] Modül yükleme: {module_cost * 1000:8.1f} ms")
+    print(f"[STARTUP] İlk çıktı:     {first_output * 1000:8.1f} ms "
+          f"(hedef {STARTUP_TARGET_SECONDS * 1000:.0f} ms) - {status}")
+    if getattr(sys, 'frozen', False):
+        print("[STARTUP] Not: exe açılmadan önceki bootloader süresi ölçüme dahil değil")
+
+    print(f"\n{'Bağımlılık':<24}{'Süre':>12}{'Modül':>8}  Kullanım")
+    total = 0.0
+    for module_name, usage in STARTUP_IMPORTS:
+        if module_name in sys.modules:
+            print(f"{module_name:<24}{'yüklü':>12}{'':>8}  {usage}")
+            continue
+
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            print(f"{module_name:<24}{'yok':>12}{'':>8}  {usage}")
+            continue
+        cost = time.perf_counter() - start
+        total += cost
+        print(f"{module_name:<24}{cost * 1000:>9.1f} ms{len(sys.modules) - modules_before:>+8d}  {usage}")
+
+    print(f"\n[STARTUP] Bağımlılıklar toplam: {total * 1000:.1f} ms")
+
+
+def parse_args(argv=None):
+    """Komut satırı argümanları"""
+    parser = argparse.ArgumentParser(description="Doğtaş Other.xlsx scraper")
+    parser.add_argument('--resume', action='store_true',
+                        help="Önceki yarım kalan taramaya journal'dan devam et")
+    parser.add_argument('--input',
+                        help="SKU dosyası (xlsx, csv veya txt); varsayılan Other.xlsx")
+    parser.add_argument('--format', default='xlsx',
+                        help="Çıktı formatları, virgülle ayrılmış: xlsx,csv,parquet")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="Açılış süresini ve import maliyetlerini raporla, tarama yapma")
+    parser.add_argument('--profile', action='store_true',
+                        help="Aşama bazlı CPU (cProfile), bellek (tracemalloc), flamegraph yığınları "
+                             "ve event loop gecikmesini dogtasCom_profile.* dosyalarına yaz")
+    parser.add_argument('--delta', action='store_true',
+                        help="Sadece yeni veya sitemap lastmod'u değişen ürünleri çek, "
+                             "öncekilerle birleştir ve fiyat değişikliği raporu yaz")
+    parser.add_argument('--coordinator', action='store_true',
+                        help="SKU listesini paylaşılan iş kuyruğuna yükle (--queue)")
+    parser.add_argument('--local-workers', type=int, default=0,
+                        help="--coordinator ile bu makinede N worker başlat ve sonunda birleştir")
+    parser.add_argument('--worker', action='store_true',
+                        help="Kuyruktan SKU batch'leri kirala ve tara (her worker kendi hız limitini uygular)")
+    parser.add_argument('--merge', action='store_true',
+                        help="Kuyruktaki sonuçlardan dogtasCom çıktılarını yaz")
+    parser.add_argument('--queue',
+                        help="İş kuyruğu SQLite dosyası; varsayılan girdi yanındaki dogtasCom_queue.sqlite")
+    parser.add_argument('--serve', action='store_true',
+                        help="Fiyat sorgulama servisi olarak çalış (HTTP/JSON, bkz. PriceLookupService)")
+    parser.add_argument('--host', default='127.0.0.1', help="--serve adresi")
+    parser.add_argument('--port', type=int, default=8765, help="--serve portu")
+    parser.add_argument('--rules',
+                        help="Filtre/duplikasyon kuralları (JSON veya YAML); "
+                             "varsayılan girdi yanındaki dogtasCom_rules.json")
+    parser.add_argument('--record', metavar='ARSIV',
+                        help="Sayfa ve sitemap yanıtlarını HTTP arşivine (SQLite) kaydet")
+    parser.add_argument('--replay', metavar='ARSIV',
+                        help="Ağa çıkmadan --record arşivindeki yanıtlarla çalış")
+    parser.add_argument('--replay-timing', choices=('original', 'fast'), default='original',
+                        help="--replay: kayıttaki gecikmelerle (original) veya beklemeden (fast)")
+    parser.add_argument('--rps', type=float, default=None,
+                        help="Saniyedeki en fazla istek (varsayılan 3; 0 = sınırsız, yalnızca AIMD)")
+    parser.add_argument('--batch', action='store_true',
+                        help="Validasyon/filtre/istatistikleri sonda toplu (pandas) yap; "
+                             "--resume journal'ın yazıldığı modla kullanılmalı (farklıysa reddedilir)")
+    return parser.parse_args(argv)
+
+
+def finish_products(products: List[Dict], batch: bool) -> Tuple[List[Dict], Optional[Dict], Optional[List[str]]]:
+    """Taranan kayıtlara duplikasyon kurallarını (--batch: toplu işlemeyi) uygula
+
+    (ürünler, istatistikler, sonuçlar) döndürür; sonuçlar yalnızca --batch'te
+    doludur ve giriş kaydı başına gerçek sonuç durumudur.
+    """
+    profile_stage('postprocess')
+    stats = outcomes = None
+    if products and batch:
+        # Ham kayıtlar: validasyon, filtre, duplikasyon ve istatistikler tek geçişte
+        print("\n[PROCESSING] Kayıtlar toplu işleniyor...")
+        products, stats, outcomes = BatchProcessor.process_outcomes(products)
+    elif products:
+        # Duplikasyon kuralları uygula
         print("\n[PROCESSING] Duplikasyon kuralları uygulanıyor...")
-        products = ProductFilter.apply_duplication_rules(products)
+        with METRICS.timer('duplication'):
+            products = ProductFilter.apply_duplication_rules(products)
+    return products, stats, outcomes
 
-    elapsed = time.time() - start_time
 
+def write_results(output: ProductOutput, stats: Optional[Dict], output_dir: str,
+                  elapsed: float, extra: Dict):
+    """Sonuç özetini yazdır, ürünleri ve ölçümleri kaydet"""
+    profile_stage('save')
+    product_count = output.count
     # SONUÇLAR
     print(f"\n{'='*80}")
     print(f"TARAMA TAMAMLANDI!")
     print(f"Süre: {elapsed:.2f} saniye ({elapsed/60:.2f} dakika)")
-    if products:
-        print(f"Hız: {len(products)/elapsed:.2f} ürün/saniye")
+    if product_count:
+        print(f"Hız: {product_count/elapsed:.2f} ürün/saniye")
     print(f"{'='*80}")
 
-    if products:
-        # dogtasCom.xlsx'e kaydet
-        output_path = os.path.join(os.path.dirname(other_xlsx_path), "dogtasCom.xlsx")
-        save_to_excel(products, output_path)
+    if product_count:
+        # dogtasCom.xlsx'e (ve seçilen diğer formatlara) kaydet
+        with METRICS.timer('excel_write'):
+            output_path = output.close()[0]
 
         # İstatistikler
-        print_statistics(products)
+        print_statistics(stats=stats or output.statistics.result())
 
         print("\n" + "="*80)
         print(f"DOSYA: {output_path}")
         print("="*80)
     else:
+        output.discard()
         print("\n[HATA] Hiç ürün çekilemedi!")
 
+    # Aşama ölçümleri: JSON run raporu + Prometheus text dosyası
+    METRICS.print_summary()
+    METRICS.write_json(os.path.join(output_dir, "dogtasCom_run.json"),
+                       extra={'product_count': product_count, **extra})
+    METRICS.write_prometheus(os.path.join(output_dir, "dogtasCom_metrics.prom"))
+    print(f"[SAVED] Ölçümler: dogtasCom_run.json, dogtasCom_metrics.prom")
+
+
+def merge_work_queue(work_queue: WorkQueue) -> Tuple[List[Dict], List[str], List[str]]:
+    """Kuyruktaki sonuçlardan (giriş sırasıyla) ürünleri, çekilemeyen SKU'ları ve
+    ürünlerin SKU'larını topla"""
+    products = []
+    failed = []
+    product_skus = []
+    for sku, status, outcome, record in work_queue.results():
+        if record:
+            products.append(record)
+            product_skus.append(sku)
+        elif status != 'done' or outcome == OUTCOME_FAILED:
+            failed.append(sku)
+    return products, failed, product_skus
+
+
+def start_local_workers(count: int, queue_path: str, rules_path: Optional[str]) -> List:
+    """Bu makinede count adet --worker süreci başlat"""
+    worker_argv = ['--worker', '--queue', queue_path]
+    if rules_path:
+        worker_argv += ['--rules', rules_path]
+
+    processes = []
+    for _ in range(count):
+        process = multiprocessing.Process(target=main, args=(worker_argv,))
+        process.start()
+        processes.append(process)
+    print(f"[QUEUE] {count} yerel worker başlatıldı")
+    return processes
+
+
+def main(argv=None):
+    """Ana fonksiyon"""
+    global PROFILER
+
+    args = parse_args(argv)
+    if not args.profile:
+        return run(args)
+
+    PROFILER = RunProfiler(os.path.join(os.getcwd(), "dogtasCom_profile"))
+    PROFILER.start()
+    try:
+        return run(args)
+    finally:
+        PROFILER.stop()
+        PROFILER = None
+
+
+def run(args):
+    """Seçilen modu çalıştır (main --profile ile profiller)"""
+    formats = [fmt.strip().lower() for fmt in args.format.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in OUTPUT_SINKS]
+    if unknown or not formats:
+        print(f"[ERROR] Bilinmeyen çıktı formatı: {', '.join(unknown) or args.format}")
+        return
+
+    # Stdout'u flush et
+    sys.stdout.reconfigure(line_buffering=True)
+
+    print("="*80, flush=True)
+    first_output_at = time.perf_counter()
+    print("DOGTAS OTHER.XLSX SCRAPER", flush=True)
+    print("Other.xlsx'ten SKU okur -> Sitemap XML'de arar -> dogtasCom.xlsx'e kaydeder", flush=True)
+    print("="*80, flush=True)
+
+    if args.startup_profile:
+        profile_startup(first_output_at)
+        return
+
+    # Other.xlsx yolu
+    other_xlsx_path = args.input or r"D:\GoogleDrive\PRG\Fiyat\Etiket\Other.xlsx"
+
+    # Linux ortamında test için alternatif yol
+    if not args.input and not os.path.exists(other_xlsx_path):
+        other_xlsx_path = os.path.join(get_base_dir(), "Other.xlsx")
+
+    # İş kuyruğu modları: worker ve merge SKU dosyası okumaz, kuyruk dosyasının dizinini kullanır
+    queue_mode = args.worker or args.merge
+    queue_path = args.queue or os.path.join(os.path.dirname(other_xlsx_path), "dogtasCom_queue.sqlite")
+    output_dir = os.path.dirname(os.path.abspath(queue_path)) if queue_mode else os.path.dirname(other_xlsx_path)
+
+    if PROFILER is not None:
+        PROFILER.output_base = os.path.join(output_dir or ".", "dogtasCom_profile")
+
+    if queue_mode and not os.path.exists(queue_path):
+        print(f"[ERROR] İş kuyruğu bulunamadı: {queue_path} (önce --coordinator çalıştırın)")
+        return
+
+    sku_list = []
+    if not queue_mode and not args.serve:
+        if not os.path.exists(other_xlsx_path):
+            print(f"[ERROR] Other.xlsx bulunamadı: {other_xlsx_path}")
+            print("[INFO] Lütfen Other.xlsx dosyasını script ile aynı dizine koyun")
+            return
+
+        # SKU'ları oku
+        profile_stage('read_input')
+        print(f"\n[INFO] Other.xlsx okunuyor: {other_xlsx_path}")
+        sku_list = read_other_xlsx(other_xlsx_path)
+
+        if not sku_list:
+            print("[ERROR] Other.xlsx'ten SKU okunamadı")
+            return
+
+    # Filtre/duplikasyon kuralları (dosya yoksa gömülü varsayılanlar)
+    rules_path = args.rules or os.path.join(output_dir, "dogtasCom_rules.json")
+    if args.rules or os.path.exists(rules_path):
+        try:
+            ProductFilter.load_rules(rules_path)
+        except Exception as e:
+            print(f"[ERROR] Kural dosyası okunamadı: {rules_path} - {e}")
+            return
+    else:
+        rules_path = None
+
+    # Zamanlama
+    start_time = time.time()
+    METRICS.reset()
+    output_base = os.path.join(output_dir, "dogtasCom")
+
+    if args.merge:
+        # Kuyruktaki sonuçları birleştir (--batch kuyruğu oluşturan moddan gelir)
+        work_queue = WorkQueue(queue_path)
+        try:
+            batch = work_queue.get_meta('batch') == '1'
+            if work_queue.unfinished():
+                print(f"[WARNING] Kuyrukta bitmemiş SKU var: {work_queue.progress()}")
+            products, failed_skus, product_skus = merge_work_queue(work_queue)
+            sku_count = int(work_queue.get_meta('sku_count', '0'))
+            print(f"[QUEUE] {len(products)} kayıt birleştirildi")
+
+            products, stats, outcomes = finish_products(products, batch)
+            if outcomes:
+                # Ham kayıtların gerçek sonucu kuyruğa yazılır (kayıt kayıt yol ile aynı)
+                changed = work_queue.set_outcomes(product_skus, outcomes)
+                failed_skus += [sku for sku, outcome in changed if outcome == OUTCOME_FAILED]
+        finally:
+            work_queue.close()
+        output = ProductOutput(output_base, formats, duplicate=False)
+        output.extend(products)
+        write_results(output, stats, output_dir, time.time() - start_time,
+                      {'sku_count': sku_count, 'failed_skus': failed_skus})
+        return
+
+    if args.coordinator:
+        # SKU listesini kuyruğa yükle; --local-workers verilirse worker'ları başlat ve birleştir
+        work_queue = WorkQueue(queue_path)
+        try:
+            work_queue.load(sku_list, {'batch': '1' if args.batch else '0', 'sku_count': str(len(sku_list))})
+        finally:
+            work_queue.close()
+        print(f"[QUEUE] {len(sku_list)} SKU kuyruğa yüklendi: {queue_path}")
+
+        if not args.local_workers:
+            print("[INFO] Worker'lar: --worker --queue <kuyruk>, bitince: --merge --queue <kuyruk>")
+            return
+
+        for process in start_local_workers(args.local_workers, queue_path, rules_path):
+            process.join()
+        main(['--merge', '--queue', queue_path, '--format', args.format]
+             + (['--rules', rules_path] if rules_path else []))
+        return
+
+    # Scraper oluştur (sitemap ve sayfa cache'leri dogtasCom.xlsx ile aynı dizinde)
+    sitemap_cache_path = os.path.join(output_dir, "dogtasCom_sitemap.sqlite")
+    page_cache_path = os.path.join(output_dir, "dogtasCom_pages.sqlite")
+    if args.record or args.replay:
+        # Arşivlenen run'lar tekrarlanabilir olsun: cache'ler ve koşullu istekler kapalı
+        sitemap_cache_path = page_cache_path = None
+    scraper = DogtasSitemapScraper(
+        sitemap_cache_path=sitemap_cache_path,
+        page_cache_path=page_cache_path,
+    )
+    scraper.config['batch_postprocess'] = args.batch
+    if args.rps is not None:
+        scraper.config['requests_per_second'] = max(0.0, args.rps)
+
+    if args.replay:
+        if not os.path.exists(args.replay):
+            print(f"[ERROR] HTTP arşivi bulunamadı: {args.replay}")
+            return
+        scraper.http_archive = HttpArchive(args.replay, 'replay', args.replay_timing)
+        # Sunucu yok: hız sınırı uygulanmaz (eşzamanlılık limiti aynı kalır)
+        scraper.config['requests_per_second'] = 0
+        print(f"[REPLAY] {args.replay} ({args.replay_timing})")
+    elif args.record:
+        scraper.http_archive = HttpArchive(args.record, 'record')
+        print(f"[RECORD] Yanıtlar kaydediliyor: {args.record}")
+
+    if args.serve:
+        # Servis her zaman validate edilmiş, filtrelenmiş kayıt döndürür
+        scraper.config['batch_postprocess'] = False
+        try:
+            asyncio.run(PriceLookupService(scraper).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            print("\n[SERVE] Durduruldu")
+        finally:
+            if scraper.http_archive:
+                scraper.http_archive.close()
+        return
+
+    if args.worker:
+        # Kuyruktan kirala -> tara -> sonucu yaz; kuyrukta iş kalmayınca çık
+        work_queue = WorkQueue(queue_path)
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        try:
+            scraper.config['batch_postprocess'] = work_queue.get_meta('batch') == '1'
+            print(f"[QUEUE] Worker {worker_id} başladı: {queue_path}")
+            done = asyncio.run(scraper.scrape_work_queue_async(work_queue, worker_id))
+        finally:
+            work_queue.close()
+            if scraper.http_archive:
+                scraper.http_archive.close()
+        print(f"[QUEUE] Worker {worker_id} bitti: {done} SKU")
+        METRICS.print_summary()
+        return
+
+    # SKU sonuç journal'ı (--resume ile kaldığı yerden devam)
+    journal_path = os.path.join(output_dir, "dogtasCom_journal.jsonl")
+    journal_mode = 'batch' if args.batch else 'record'
+    if args.resume:
+        previous_mode = RunJournal.read_mode(journal_path)
+        if previous_mode and previous_mode != journal_mode:
+            flag = "ile" if previous_mode == 'batch' else "olmadan"
+            print(f"[ERROR] Journal {previous_mode} modunda yazılmış; --resume'u --batch {flag} çalıştırın")
+            return
+    journal = RunJournal(journal_path, resume=args.resume, mode=journal_mode)
+
+    # Delta modu: SKU başına önceki kayıt ve lastmod
+    delta = None
+    if args.delta:
+        delta = DeltaStore(os.path.join(output_dir, "dogtasCom_delta.sqlite"))
+
+    # SCRAPING
+    print("\n" + "="*80)
+    print("SCRAPING BAŞLIYOR...")
+    print("="*80)
+
+    # --batch dışında ürünler tamamlandıkça (duplikasyon ve istatistiklerle) çıktıya akar;
+    # --batch ham kayıtları sonda toplu işler
+    output = ProductOutput(output_base, formats, duplicate=not args.batch)
+    stats = None
+    try:
+        emit = None if args.batch else output.add
+        products = asyncio.run(scraper.scrape_from_sku_list_async(sku_list, journal=journal, delta=delta,
+                                                                  emit=emit))
+        if args.batch:
+            products, stats, outcomes = finish_products(products, True)
+            if outcomes:
+                # Filtrelenen/boş ham kayıtların sonucu journal, delta ve sayaçlara yazılır
+                scraper.apply_batch_outcomes(outcomes, journal, delta)
+            output.extend(products)
+            del products
+    except BaseException:
+        output.discard()
+        raise
+    finally:
+        journal.close()
+        if scraper.http_archive:
+            scraper.http_archive.close()
+        if delta:
+            delta.close()
+
+    if delta:
+        save_price_changes(scraper.price_changes, os.path.join(output_dir, "dogtasCom_price_changes.xlsx"))
+
+    write_results(output, stats, output_dir, time.time() - start_time,
+                  {'sku_count': len(sku_list), 'failed_skus': scraper.failed_skus,
+                   'price_change_count': len(scraper.price_changes)})
+
+
+MODULE_LOADED = time.perf_counter()
+
 
 if __name__ == "__main__":
+    # Exe'de parse süreç havuzu açılırsa alt süreçlerin main()'i çalıştırmaması için
+    multiprocessing.freeze_support()
     main()
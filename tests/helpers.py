@@ -0,0 +1,113 @@
+"""Testlerin ortak verileri: sentetik ham kayıtlar, ürün sayfaları ve yerel HTTP sunucusu
+
+Benchmark script'lerinden bağımsızdır; aiohttp ve scraper modülü yalnızca
+kullanan fonksiyonlarda import edilir (bağımlılığı olmayan testler skip edebilsin).
+"""
+import json
+import random
+import contextlib
+
+KATEGORILER = ["Yatak Odası", "Yemek Odası", "Oturma Grupları", "Doğtaş Home", "", " Genç Odası "]
+ADLAR = ["Komodin", "Ayna", "Konsol", "Abajur", "Halı", "Karyola", "Vazo", "Sehpa", "Dolap", "Kırlent",
+         "KIRLENT", "AYNALI DOLAP", "İNCE HALI", "ŞAMDAN"]
+FIYATLAR = ["12.500,50 TL", "12,500.50", "1.250", "1.25", "999,90", "5", "2.000.000 TL",
+            "abc", "", "  45.000 ₺", "1.2.34", "7,5"]
+
+
+def make_records(count: int, seed: int):
+    """Rastgele ham kayıtlar (ProductExtractor.extract çıktısı biçiminde)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        koleksiyon = rng.choice(["Lenova", "Vega", "", "Carmen "])
+        urun_adi = f" {rng.choice(ADLAR)} {i}" if rng.random() > 0.02 else ""
+        urun_adi_tam = f"{koleksiyon} {urun_adi}" if koleksiyon and urun_adi else urun_adi
+        records.append({
+            'KOLEKSIYON': koleksiyon,
+            'urun_adi': urun_adi,
+            'urun_adi_tam': urun_adi_tam,
+            'sku': rng.choice([f"3{i:09d}", " 31-A_x* ", "a!", ""]),
+            'orijinal_fiyat': rng.choice(FIYATLAR),
+            'fiyat': rng.choice(FIYATLAR),
+            'kategori': rng.choice(KATEGORILER),
+            'marka': "Doğtaş",
+            'urun_url': f"https://www.dogtas.com/urun-{i}",
+        })
+    return records
+
+
+def per_record(raw_records):
+    """Scraper'ın kayıt kayıt uyguladığı yol: (ürünler, istatistikler)"""
+    from dogtas_other_scraper import DataValidator, ProductFilter, compute_statistics
+
+    products = []
+    for veri in raw_records:
+        validated = DataValidator.validate_product_data(veri)
+        if not validated.get('urun_adi_tam') or not validated.get('urun_adi_tam').strip():
+            continue
+        if ProductFilter.should_filter_product(validated):
+            continue
+        products.append(validated)
+    products = ProductFilter.apply_duplication_rules(products)
+    return products, compute_statistics(products)
+
+
+def product_page(sku: str = "3000000001", koleksiyon: str = "ASPEN", urun: str = "Ayna",
+                 kategori: str = "Yatak Odası", liste: str = "12.500 TL",
+                 perakende: str = "9.990,00 TL", padding_kb: int = 1) -> bytes:
+    """Ürün sayfası (perakende=None: indirim elemanı yok); sonda büyük bir script paketi"""
+    json_ld = json.dumps({'@type': 'Product', 'name': f"{koleksiyon} {urun}",
+                          'brand': {'@type': 'Brand', 'name': 'Doğtaş'}}, ensure_ascii=False)
+    discount = f'<span class="discount-price">{perakende}</span>' if perakende is not None else ""
+    padding = "<script>var bundle='" + ("x" * (padding_kb * 1024)) + "';</script>"
+    return f"""<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>{koleksiyon} {urun}</title>
+<script type="application/ld+json">{json_ld}</script></head>
+<body>
+<ol class="breadcrumb"><li><a href="/">Ana Sayfa</a></li><li><a href="/k">{kategori}</a></li><li>{urun}</li></ol>
+<h1 class="title"><span>{koleksiyon}</span> {urun}</h1>
+<div class="sku">Ürün Kodu: {sku}</div>
+<div class="price-box">
+  <span class="sale-price sale-variant-price">{liste}</span>
+  {discount}
+</div>
+{padding}
+</body></html>""".encode('utf-8')
+
+
+def sitemap_xml(entries, tag: str = 'url') -> bytes:
+    """(loc, lastmod) listesinden sitemap (tag='sitemap': sitemap index)"""
+    root = 'sitemapindex' if tag == 'sitemap' else 'urlset'
+    items = "".join(
+        f"<{tag}><loc>{loc}</loc>" + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "") + f"</{tag}>"
+        for loc, lastmod in entries
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{items}</{root}>').encode('utf-8')
+
+
+@contextlib.asynccontextmanager
+async def local_server(routes):
+    """{yol: handler} ile 127.0.0.1'de rastgele portta aiohttp sunucusu; taban URL'i verir"""
+    from aiohttp import web
+
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    finally:
+        await runner.cleanup()
+
+
+def make_scraper(**kwargs):
+    """Ağ oturumu kurmadan istek metotları çağrılabilen scraper"""
+    from dogtas_other_scraper import AdaptiveConcurrencyLimiter, DogtasSitemapScraper
+
+    scraper = DogtasSitemapScraper(**kwargs)
+    scraper.concurrency = AdaptiveConcurrencyLimiter(2, 1, 4)
+    return scraper
@@ -0,0 +1,90 @@
+"""--record/--replay: arşivlenen yanıtlar ve aiohttp hataları aynı türle geri verilmeli"""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+from dogtas_other_scraper import HttpArchive, ReplaySession
+from helpers import local_server
+
+
+async def ok(request):
+    return web.Response(text="merhaba", content_type='text/plain', charset='utf-8')
+
+
+async def drop(request):
+    # Yanıt göndermeden bağlantıyı kapat
+    request.transport.close()
+    await asyncio.sleep(0.05)
+    return web.Response()
+
+
+async def short_body(request):
+    # Content-Length'ten kısa gövde: okuma ClientPayloadError verir
+    response = web.StreamResponse(headers={'Content-Length': '100'})
+    await response.prepare(request)
+    await response.write(b"yarim")
+    request.transport.close()
+    return response
+
+
+async def outcomes(session, base):
+    """Her yol için (durum, gövde) veya istisna türü"""
+    results = []
+    for path in ('/ok', '/drop', '/short', '/ok'):
+        try:
+            async with session.get(f"{base}{path}") as response:
+                results.append((response.status, await response.read()))
+        except aiohttp.ClientError as e:
+            results.append(type(e))
+    return results
+
+
+def test_replay_reproduces_responses_and_client_errors(tmp_path):
+    path = str(tmp_path / 'archive.sqlite')
+
+    async def record():
+        archive = HttpArchive(path, 'record')
+        async with local_server({'/ok': ok, '/drop': drop, '/short': short_body}) as base:
+            async with aiohttp.ClientSession() as session:
+                results = await outcomes(archive.wrap(session), base)
+        archive.close()
+        return results, base
+
+    async def replay(base):
+        archive = HttpArchive(path, 'replay', 'fast')
+        results = await outcomes(archive.wrap(None), base)
+        archive.close()
+        return results
+
+    recorded, base = asyncio.run(record())
+    assert recorded[0] == (200, b"merhaba")
+    assert recorded[1] is aiohttp.ServerDisconnectedError
+    assert recorded[2] is aiohttp.ClientPayloadError
+
+    assert asyncio.run(replay(base)) == recorded
+
+
+def test_archived_error_falls_back_to_constructible_base():
+    # ClientConnectorError mesajla kurulamaz: en yakın bağlantı hatası üst sınıfı kullanılır
+    error = ReplaySession.archived_error("ClientConnectorError: Cannot connect to host")
+    assert isinstance(error, aiohttp.ClientConnectionError)
+    assert "Cannot connect" in str(error)
+
+    # Tür adı olmayan eski kayıtlar
+    legacy = ReplaySession.archived_error("connection: reset")
+    assert type(legacy) is aiohttp.ClientConnectionError
+
+
+def test_replay_miss_is_404(tmp_path):
+    path = str(tmp_path / 'archive.sqlite')
+    HttpArchive(path, 'record').close()
+
+    async def replay():
+        archive = HttpArchive(path, 'replay', 'fast')
+        async with ReplaySession(None, archive).get("http://yok/urun") as response:
+            return response.status
+
+    assert asyncio.run(replay()) == 404
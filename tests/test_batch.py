@@ -0,0 +1,64 @@
+"""--batch: BatchProcessor kayıt kayıt yol ile aynı ürünleri, istatistikleri ve sonuçları üretmeli"""
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from dogtas_other_scraper import (
+    OUTCOME_FAILED, OUTCOME_FILTERED, OUTCOME_FOUND,
+    BatchProcessor, DataValidator, ProductFilter, RunJournal,
+)
+from helpers import make_records, per_record
+
+
+def record_outcome(veri) -> str:
+    """scrape_sku_outcome'un kayıt kayıt yoldaki sonucu"""
+    validated = DataValidator.validate_product_data(veri)
+    if not validated.get('urun_adi_tam') or not validated.get('urun_adi_tam').strip():
+        return OUTCOME_FAILED
+    if ProductFilter.should_filter_product(validated):
+        return OUTCOME_FILTERED
+    return OUTCOME_FOUND
+
+
+@pytest.mark.parametrize('seed', [1, 42])
+def test_batch_matches_per_record_path(seed):
+    records = make_records(30_000, seed)
+
+    with redirect_stdout(io.StringIO()):
+        expected, expected_stats = per_record(records)
+        expected_outcomes = [record_outcome(veri) for veri in records]
+        actual, actual_stats, outcomes = BatchProcessor.process_outcomes(records)
+
+    assert actual == expected
+    assert actual_stats == expected_stats
+    assert outcomes == expected_outcomes
+    assert {OUTCOME_FOUND, OUTCOME_FILTERED, OUTCOME_FAILED} <= set(outcomes)
+
+
+def test_empty_input():
+    assert BatchProcessor.process_outcomes([])[::2] == ([], [])
+
+
+def test_journal_mode(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path, mode='batch')
+    journal.record('3000000001', OUTCOME_FOUND, {'sku': '3000000001', 'fiyat': '1.000 TL'})
+    journal.close()
+    assert RunJournal.read_mode(path) == 'batch'
+
+    # Mod satırı resume'da tekrar yazılmaz, kayıtlar okunur
+    resumed = RunJournal(path, resume=True, mode='batch')
+    resumed.close()
+    assert list(resumed.completed) == ['3000000001']
+    with open(path, encoding='utf-8') as f:
+        assert sum('"mode"' in line for line in f) == 1
+
+
+def test_journal_mode_inferred_for_old_journals(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"sku": "1", "status": "found", "record": {"LISTE": 10, "PERAKENDE": 5}, "ts": 0}\n',
+                    encoding='utf-8')
+    assert RunJournal.read_mode(str(path)) == 'record'
@@ -0,0 +1,53 @@
+"""bench_load: sahte sunucunun sayfaları scraper'ın işaretlemesine uymalı, rapor ölçümleri içermeli"""
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+
+import bench_load
+from dogtas_other_scraper import SitemapStreamParser, create_extractor
+
+
+def test_synthetic_page_matches_extractor():
+    record = create_extractor('bs4').extract_record(bench_load.render_product_page(7, 1), "https://x/urun/7")
+    fields = bench_load.product_fields(7)
+
+    assert record['sku'] == fields['sku']
+    assert record['kategori'] == fields['kategori']
+    assert record['urun_adi_tam'] == f"{fields['koleksiyon']} {fields['urun']}"
+    assert record['LISTE'] == fields['liste']
+    assert record['PERAKENDE'] == fields['perakende']
+
+
+def test_sitemaps_cover_catalog_once():
+    locs = []
+    for no in (1, 2, 3):
+        parser = SitemapStreamParser()
+        locs += [loc for loc, _ in parser.feed(bench_load.render_sitemap("http://h", no, 4, 10)) + parser.close()]
+
+    assert len(locs) == 10
+    assert [loc.rsplit('-', 1)[1] for loc in locs] == [bench_load.product_sku(i) for i in range(10)]
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert bench_load.percentile(values, 50) in (50, 51)
+    assert bench_load.percentile(values, 99) == 99
+    assert bench_load.percentile([], 50) is None
+
+
+def test_end_to_end_report():
+    args = bench_load.parse_args(['--urls', '200', '--sitemaps', '2', '--skus', '20', '--missing-rate', '0.1',
+                                  '--latency-ms', '0', '--page-kb', '2', '--error-rate', '0.1'])
+    options = {key: value for key, value in vars(args).items() if key != 'json'}
+
+    report = bench_load.run_benchmark(options)
+
+    assert report['skus'] == 20
+    outcomes = report['outcomes']
+    assert outcomes['not_found'] == 2
+    # 500'ler retry ile aşılır: katalogdaki her SKU bulunur (bir kısmı filtrelenir)
+    assert outcomes['found'] + outcomes.get('filtered', 0) == 18
+    assert report['products'] == outcomes['found']
+    assert report['skus_per_sec'] > 0
+    assert report['latency_ms']['p50'] <= report['latency_ms']['p95'] <= report['latency_ms']['p99']
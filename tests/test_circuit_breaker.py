@@ -0,0 +1,78 @@
+"""CircuitBreaker: probe'lar başarısız olmaya devam ettiğinde bekleyenler takılmamalı"""
+import asyncio
+
+import pytest
+
+from dogtas_other_scraper import CircuitBreaker
+
+
+async def run_workers(breaker: CircuitBreaker, workers: int, requests_per_worker: int):
+    """Her isteği başarısız olan worker'lar; her worker'ın yaptığı istek sayısını döndür"""
+    counts = [0] * workers
+
+    async def worker(index: int):
+        for _ in range(requests_per_worker):
+            probe = await breaker.before_request()
+            try:
+                await asyncio.sleep(0.001)
+                counts[index] += 1
+                breaker.record_failure()
+            finally:
+                if probe:
+                    breaker.end_probe(probe)
+
+    await asyncio.wait_for(asyncio.gather(*(worker(i) for i in range(workers))), timeout=5)
+    return counts
+
+
+def test_failing_probes_do_not_block_waiters():
+    breaker = CircuitBreaker(failure_threshold=2, open_seconds=0.01, max_open_seconds=0.02)
+    counts = asyncio.run(run_workers(breaker, workers=3, requests_per_worker=6))
+    assert counts == [6, 6, 6]
+    assert breaker.is_open
+
+
+def test_cancelled_probe_is_released():
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=0.01, max_open_seconds=0.01)
+        breaker.record_failure()
+        assert breaker.is_open
+
+        probe_started = asyncio.Event()
+
+        async def hung_probe():
+            probe = await breaker.before_request()
+            assert probe
+            try:
+                probe_started.set()
+                await asyncio.sleep(3600)
+            finally:
+                breaker.end_probe(probe)
+
+        probe_task = asyncio.create_task(hung_probe())
+        await probe_started.wait()
+        waiter = asyncio.create_task(breaker.before_request())
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+
+        probe_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe_task
+        # Bekleyen yeni probe olarak devam eder
+        assert await asyncio.wait_for(waiter, timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_successful_probe_closes_for_everyone():
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=0.01, max_open_seconds=0.01)
+        breaker.record_failure()
+        probe = await breaker.before_request()
+        waiters = [asyncio.create_task(breaker.before_request()) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        breaker.record_success()
+        assert await asyncio.wait_for(asyncio.gather(*waiters), timeout=1) == [0, 0, 0]
+        assert probe and not breaker.is_open
+
+    asyncio.run(scenario())
@@ -0,0 +1,53 @@
+"""AdaptiveConcurrencyLimiter ve Retry-After: limit büyüyünce bekleyenler slot almalı, HTTP tarihi UTC sayılmalı"""
+import asyncio
+import email.utils
+import time
+
+import pytest
+
+from dogtas_other_scraper import AdaptiveConcurrencyLimiter, parse_retry_after
+
+
+def test_limit_growth_wakes_waiters():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter(1, 1, 4)
+        entered = asyncio.Event()
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter:
+                await release.wait()
+
+        async def waiter():
+            async with limiter:
+                entered.set()
+
+        tasks = [asyncio.create_task(holder()), asyncio.create_task(waiter())]
+        await asyncio.sleep(0.01)
+        assert not entered.is_set()
+
+        # İlk slot hâlâ dolu: yalnızca limit artışı waiter'ı içeri almalı
+        await limiter.on_success(0.01)
+        assert int(limiter.limit) == 2
+        await asyncio.wait_for(entered.wait(), 1)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def istanbul_time(monkeypatch):
+    # Yerel saat UTC değilken naive datetime yerel saat sanılır
+    monkeypatch.setenv('TZ', 'Europe/Istanbul')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize('zone', ['GMT', '+0000', '-0000'])
+def test_retry_after_http_date_is_utc(zone, istanbul_time):
+    retry_at = email.utils.formatdate(time.time() + 60)[:-len('-0000')] + zone
+    assert 50 < parse_retry_after(retry_at) <= 61
@@ -0,0 +1,99 @@
+"""Delta modu: lastmod'u değişmeyen SKU tekrar taranmaz, fiyat değişiklikleri raporlanır"""
+import asyncio
+
+import pytest
+
+from dogtas_other_scraper import (OUTCOME_FAILED, OUTCOME_FILTERED, OUTCOME_FOUND, DeltaStore,
+                                  ProductRecord, price_change)
+from helpers import make_scraper
+
+BASE = "https://www.dogtas.com/urun"
+
+
+def record(sku, liste, perakende):
+    return ProductRecord(KOLEKSIYON="ASPEN", urun_adi="Ayna", urun_adi_tam="ASPEN Ayna", sku=sku,
+                         kategori="Yatak Odası", urun_url=f"{BASE}/aspen-ayna-{sku}", LISTE=liste, PERAKENDE=perakende)
+
+
+def indexed_scraper(lastmods):
+    scraper = make_scraper()
+    scraper.sku_index = {sku: f"{BASE}/aspen-ayna-{sku}" for sku in lastmods}
+    scraper.url_lastmod = {scraper.sku_index[sku]: lastmod for sku, lastmod in lastmods.items()}
+    return scraper
+
+
+def skip(scraper, delta, skus):
+    async def run():
+        queue = asyncio.Queue()
+        for idx, sku in enumerate(skus):
+            queue.put_nowait((idx, sku))
+        delivered = {}
+        remaining = scraper.skip_unchanged(queue, delta, delivered.__setitem__)
+        return delivered, [remaining.get_nowait()[1] for _ in range(remaining.qsize())]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def delta(tmp_path):
+    store = DeltaStore(str(tmp_path / 'delta.sqlite'))
+    yield store
+    store.close()
+
+
+def test_store_round_trip(delta):
+    delta.update('1', f"{BASE}/aspen-ayna-1", "2026-01-01", OUTCOME_FOUND, record('1', 100, 90), 'bs4')
+    delta.update('2', f"{BASE}/aspen-ayna-2", "", OUTCOME_FILTERED, None, 'bs4')
+
+    row = delta.get('1')
+    assert row['record'] == record('1', 100, 90)
+    assert isinstance(row['record'], ProductRecord)
+    assert (row['lastmod'], row['status'], row['kind']) == ("2026-01-01", OUTCOME_FOUND, 'bs4')
+    assert delta.get('2')['record'] is None
+    assert delta.get('3') is None
+
+
+def test_unchanged_skus_are_skipped(delta, capsys):
+    first = indexed_scraper({'1': "2026-01-01", '2': "2026-01-01", '3': "2026-01-01", '4': ""})
+    for sku in '1234':
+        first.record_delta(delta, sku, OUTCOME_FOUND, record(sku, 100, 90))
+    first.record_delta(delta, '5', OUTCOME_FAILED, None)
+
+    # 2'nin lastmod'u değişti, 4'ün lastmod'u yok, 5 önceki çalıştırmada başarısızdı, 6 yeni
+    second = indexed_scraper({'1': "2026-01-01", '2': "2026-02-01", '3': "2026-01-01", '4': "",
+                              '5': "2026-01-01", '6': "2026-01-01"})
+    delivered, remaining = skip(second, delta, ['1', '2', '3', '4', '5', '6'])
+
+    assert delivered == {'1': record('1', 100, 90), '3': record('3', 100, 90)}
+    assert remaining == ['2', '4', '5', '6']
+    assert "[DELTA] 2 SKU değişmemiş" in capsys.readouterr().out
+
+
+def test_backend_change_rescrapes(delta):
+    scraper = indexed_scraper({'1': "2026-01-01"})
+    scraper.record_delta(delta, '1', OUTCOME_FOUND, record('1', 100, 90))
+
+    scraper.config['batch_postprocess'] = True
+    assert skip(scraper, delta, ['1']) == ({}, ['1'])
+
+
+def test_price_changes_are_reported(delta):
+    scraper = indexed_scraper({'1': "2026-01-01", '2': "2026-01-01"})
+    scraper.record_delta(delta, '1', OUTCOME_FOUND, record('1', 100, 90))
+    scraper.price_changes = []
+
+    scraper.url_lastmod = dict.fromkeys(scraper.url_lastmod, "2026-02-01")
+    scraper.record_delta(delta, '1', OUTCOME_FOUND, record('1', 120, 90))
+    scraper.record_delta(delta, '2', OUTCOME_FOUND, record('2', 50, 40))
+
+    assert scraper.price_changes == [
+        {'sku': '1', 'urun_adi_tam': "ASPEN Ayna", 'eski_LISTE': 100, 'yeni_LISTE': 120,
+         'eski_PERAKENDE': 90, 'yeni_PERAKENDE': 90, 'durum': "değişti"},
+        {'sku': '2', 'urun_adi_tam': "ASPEN Ayna", 'eski_LISTE': None, 'yeni_LISTE': 50,
+         'eski_PERAKENDE': None, 'yeni_PERAKENDE': 40, 'durum': "yeni"},
+    ]
+    assert delta.get('1')['lastmod'] == "2026-02-01"
+
+
+def test_same_price_is_not_a_change():
+    assert price_change('1', record('1', 100, 90), record('1', 100, 90)) is None
@@ -0,0 +1,38 @@
+"""bs4 ve lxml backend'leri aynı başlık ayıklama sonucunu vermeli"""
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('lxml')
+
+from dogtas_other_scraper import ProductExtractor, create_extractor
+
+TITLES = {
+    'text_after_span': ('<h1 class="title"><span>ASPEN</span> Ayna</h1>', ('ASPEN', 'Ayna')),
+    'tag_after_span': ('<h1 class="title"><span>ASPEN</span><b>Ayna</b></h1>', None),
+    'span_only': ('<h1 class="title"><span>ASPEN</span></h1>', ('ASPEN', 'ASPEN')),
+    'no_span': ('<h1 class="title">Ayna</h1>', ('', 'Ayna')),
+    'no_title': ('<h2>Ayna</h2>', ('', '')),
+}
+
+
+@pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+@pytest.mark.parametrize('case', sorted(TITLES))
+def test_title(backend, case):
+    html, expected = TITLES[case]
+    extractor = create_extractor(backend)
+    assert extractor.title(extractor.parse(f"<html><body>{html}</body></html>")) == expected
+
+
+@pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+def test_tag_after_span_skips_product(backend):
+    html = '<html><body><h1 class="title"><span>ASPEN</span><b>Ayna</b></h1></body></html>'
+    assert create_extractor(backend).extract_record(html, '/urun/1') is None
+
+
+def test_extractor_hooks_are_abstract():
+    class Partial(ProductExtractor):
+        def parse(self, html):
+            return html
+
+    with pytest.raises(TypeError):
+        Partial()
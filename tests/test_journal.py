@@ -0,0 +1,36 @@
+"""RunJournal: çökmede yarım kalan satır sonraki kayıtları bozmamalı"""
+from dogtas_other_scraper import OUTCOME_FOUND, OUTCOME_NOT_FOUND, RunJournal
+
+
+def test_resume_after_partial_last_line(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = RunJournal(path)
+    journal.record('1', OUTCOME_NOT_FOUND, None)
+    journal.close()
+
+    # Çökme: son satır newline'sız yarım kaldı
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"sku": "2", "status": "fou')
+
+    resumed = RunJournal(path, resume=True)
+    assert list(resumed.completed) == ['1']
+    resumed.record('3', OUTCOME_NOT_FOUND, None)
+    resumed.close()
+
+    again = RunJournal(path, resume=True)
+    again.close()
+    assert sorted(again.completed) == ['1', '3']
+
+
+def test_resume_when_whole_file_is_partial(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"mode": "rec', encoding='utf-8')
+
+    journal = RunJournal(str(path), resume=True)
+    journal.record('1', OUTCOME_FOUND, None)
+    journal.close()
+
+    again = RunJournal(str(path), resume=True)
+    again.close()
+    assert list(again.completed) == ['1']
+    assert RunJournal.read_mode(str(path)) == 'record'
@@ -0,0 +1,51 @@
+"""Ağır bağımlılıklar modül yüklenirken ve scraper kurulurken import edilmemeli"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ('pandas', 'aiohttp', 'bs4', 'lxml', 'openpyxl', 'yaml', 'pyarrow')
+
+
+def loaded_after(code: str) -> list:
+    """code'u temiz bir süreçte çalıştır; yüklenen ağır modülleri döndür"""
+    probe = f"import sys\n{code}\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def test_module_import_is_light():
+    assert loaded_after("import dogtas_other_scraper") == []
+
+
+def test_scraper_constructor_does_not_load_html_backend():
+    assert loaded_after("import dogtas_other_scraper as m\nm.DogtasSitemapScraper(html_backend='lxml')") == []
+
+
+def test_unknown_backend_is_rejected_at_construction():
+    from dogtas_other_scraper import DogtasSitemapScraper
+
+    with pytest.raises(ValueError):
+        DogtasSitemapScraper(html_backend='html5lib')
+
+
+def test_extractor_is_created_on_first_use():
+    pytest.importorskip('bs4')
+    from dogtas_other_scraper import DogtasSitemapScraper
+
+    scraper = DogtasSitemapScraper()
+    assert scraper._extractor is None
+    assert scraper.record_kind == 'bs4'
+    assert scraper._extractor is None
+    assert scraper.extractor is scraper.extractor
+    assert scraper.extractor.name == 'bs4'
+
+
+def test_startup_profile_reports_imports():
+    result = subprocess.run([sys.executable, 'dogtas_other_scraper.py', '--startup-profile'],
+                            cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0
+    assert '[STARTUP] Modül yükleme:' in result.stdout
+    assert 'pandas' in result.stdout
@@ -0,0 +1,85 @@
+"""RunMetrics: sayaçlar, aşama histogramları, JSON ve Prometheus çıktısı"""
+import asyncio
+import json
+
+import pytest
+
+from dogtas_other_scraper import METRICS, RunMetrics
+
+
+def sample_metrics():
+    metrics = RunMetrics()
+    metrics.inc('page_requests')
+    metrics.inc('page_bytes', 2048)
+    metrics.set_gauge('concurrency_limit', 3.5)
+    for seconds in [0.002] * 90 + [0.2] * 9 + [100]:
+        metrics.observe('page_fetch', seconds)
+    return metrics
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    metrics = sample_metrics()
+    assert metrics.quantile('page_fetch', 0.50) == 0.005
+    assert metrics.quantile('page_fetch', 0.95) == 0.25
+    assert metrics.quantile('page_fetch', 1.0) == float('inf')
+    assert metrics.quantile('yok', 0.5) is None
+
+
+def test_json_report(tmp_path):
+    path = tmp_path / 'run.json'
+    sample_metrics().write_json(str(path), {'products': 7})
+
+    report = json.loads(path.read_text(encoding='utf-8'))
+    assert report['products'] == 7
+    assert report['counters'] == {'page_requests': 1, 'page_bytes': 2048}
+    assert report['gauges'] == {'concurrency_limit': 3.5}
+    stage = report['stages']['page_fetch']
+    assert stage['count'] == 100
+    assert stage['buckets']['0.005'] == 90 and stage['buckets']['+Inf'] == 1
+    assert stage['p95_s'] == 0.25
+
+
+def test_prometheus_histogram_is_cumulative(tmp_path):
+    path = tmp_path / 'metrics.prom'
+    sample_metrics().write_prometheus(str(path))
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert 'dogtas_page_requests_total 1' in lines
+    assert 'dogtas_page_bytes_total 2048' in lines
+    assert 'dogtas_concurrency_limit 3.500' in lines
+    assert 'dogtas_stage_seconds_bucket{stage="page_fetch",le="0.005"} 90' in lines
+    assert 'dogtas_stage_seconds_bucket{stage="page_fetch",le="0.25"} 99' in lines
+    assert 'dogtas_stage_seconds_bucket{stage="page_fetch",le="+Inf"} 100' in lines
+    assert 'dogtas_stage_seconds_count{stage="page_fetch"} 100' in lines
+    assert not (tmp_path / 'metrics.prom.tmp').exists()
+
+
+def test_timer_records_on_error():
+    metrics = RunMetrics()
+    with pytest.raises(ValueError):
+        with metrics.timer('validate'):
+            raise ValueError
+    assert metrics.histograms['validate']['count'] == 1
+
+
+def test_page_fetch_records_stages():
+    aiohttp = pytest.importorskip('aiohttp')
+    pytest.importorskip('bs4')
+    from aiohttp import web
+    from helpers import local_server, make_scraper, product_page
+
+    async def handler(request):
+        return web.Response(body=product_page(), content_type='text/html', charset='utf-8')
+
+    async def fetch():
+        scraper = make_scraper()
+        async with local_server({'/urun/a': handler}) as base:
+            async with aiohttp.ClientSession() as session:
+                return await scraper.get_product_detail_async(session, f"{base}/urun/a")
+
+    METRICS.reset()
+    assert asyncio.run(fetch()) is not None
+    assert METRICS.counters['page_requests'] == 1
+    assert METRICS.counters['page_bytes'] == len(product_page())
+    for stage in ('page_fetch', 'html_parse', 'validate'):
+        assert METRICS.histograms[stage]['count'] == 1
@@ -0,0 +1,90 @@
+"""Çıktı: akan (ProductOutput) yazım liste yoluyla aynı olmalı, hata yarım dosya bırakmamalı"""
+import csv
+import os
+import random
+
+import pytest
+
+from dogtas_other_scraper import (
+    CsvSink, OutputSink, ProductFilter, ProductOutput, ProductRecord, SortedProductWriter,
+    compute_statistics, save_products,
+)
+
+
+def make_products(count, seed):
+    rng = random.Random(seed)
+    products = []
+    for i in range(count):
+        kategori = rng.choice(["Yemek Odası", "Yatak Odası", "Genç Odası", "Oturma Grubu"])
+        ad = rng.choice(["Ayna", "Komodin", "Gardırop", "Masa"])
+        products.append(ProductRecord(
+            KOLEKSIYON="ASPEN", urun_adi=ad, urun_adi_tam=f"ASPEN {ad}" if i % 17 else None,
+            sku=str(3000000000 + i), kategori=kategori, urun_url=f"/urun/{i}",
+            LISTE=rng.randint(1000, 9000), PERAKENDE=rng.choice([None, rng.randint(500, 8000)]),
+        ))
+    return products
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.reader(f))
+
+
+@pytest.mark.parametrize('seed', [1, 7])
+def test_streaming_output_matches_list_path(tmp_path, seed):
+    products = make_products(200, seed)
+
+    expected = ProductFilter.apply_duplication_rules(products)
+    save_products(expected, str(tmp_path / 'list'), ['csv'])
+
+    # Kayıtlar tamamlanma sırasıyla (karışık) gelir, run'lar diske taşar
+    output = ProductOutput(str(tmp_path / 'stream'), ['csv'])
+    output.writer.run_size = 16
+    order = list(enumerate(products))
+    random.Random(seed).shuffle(order)
+    for idx, product in order:
+        output.add(idx, product)
+    output.close()
+
+    assert output.count == len(expected)
+    assert read_csv(tmp_path / 'stream.csv') == read_csv(tmp_path / 'list.csv')
+    assert output.statistics.result() == compute_statistics(expected)
+
+
+class FailingSink(OutputSink):
+    def __init__(self, filepath):
+        super().__init__(filepath)
+        open(filepath, 'w').close()
+
+    def write(self, row):
+        raise OSError("disk dolu")
+
+    def close(self):
+        pass
+
+
+def test_failed_write_closes_and_removes_outputs(tmp_path):
+    writer = SortedProductWriter([], run_size=2)
+    for product in make_products(5, 3):
+        writer.add(product)
+    runs = list(writer.runs)
+
+    csv_sink = CsvSink(str(tmp_path / 'out.csv'))
+    with pytest.raises(OSError):
+        writer.close([csv_sink, FailingSink(str(tmp_path / 'out.bad'))])
+
+    assert csv_sink.file.closed
+    assert list(tmp_path.iterdir()) == []
+    assert runs and not any(os.path.exists(path) for path in runs)
+
+
+def test_discarded_output_writes_nothing(tmp_path):
+    output = ProductOutput(str(tmp_path / 'out'), ['csv'])
+    output.extend(make_products(3, 5))
+    output.discard()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_output_sink_is_abstract():
+    with pytest.raises(TypeError):
+        OutputSink('x')
@@ -0,0 +1,116 @@
+"""PageCache: saklanan ETag/Last-Modified her zaman son alınan yanıtınki olmalı"""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+from aiohttp import web
+
+from helpers import local_server, make_scraper, product_page
+
+
+class Page:
+    """Gövdesi sabit, ETag'i test içinde değiştirilen ürün sayfası"""
+
+    def __init__(self, padding_kb=1):
+        self.etag = '"v1"'
+        self.body = product_page(padding_kb=padding_kb)
+        self.requests = []
+        # True: koşullu her isteğe ETag'siz 304 (önbellek katmanı arkasındaki sunucu gibi)
+        self.always_not_modified = False
+        # 304 yanıtında gönderilen ETag (None: mevcut ETag)
+        self.not_modified_etag = None
+
+    async def handler(self, request):
+        sent = request.headers.get('If-None-Match')
+        self.requests.append(sent)
+        if sent and self.always_not_modified:
+            return web.Response(status=304)
+        if sent == self.etag:
+            return web.Response(status=304, headers={'ETag': self.not_modified_etag or self.etag})
+        return web.Response(body=self.body, content_type='text/html', charset='utf-8',
+                            headers={'ETag': self.etag})
+
+
+async def run_steps(tmp_path, steps, padding_kb=1, **config):
+    page = Page(padding_kb)
+    scraper = make_scraper(page_cache_path=str(tmp_path / 'pages.sqlite'))
+    scraper.config.update(config)
+    async with local_server({'/urun/a': page.handler}) as base:
+        url = f"{base}/urun/a"
+        async with aiohttp.ClientSession() as session:
+            assert await scraper.get_product_detail_async(session, url) is not None
+            for step in steps:
+                step(page, scraper.page_cache)
+                assert await scraper.get_product_detail_async(session, url, revalidate=True) is not None
+    cached = scraper.page_cache.lookup(url)
+    scraper.page_cache.close()
+    return page, cached
+
+
+def new_etag(etag):
+    def step(page, cache):
+        page.etag = etag
+    return step
+
+
+def backend_changed(evict_body, etag=None):
+    def step(page, cache):
+        with cache.conn:
+            cache.conn.execute("UPDATE pages SET extractor = 'eski'")
+            if evict_body:
+                cache.conn.execute("DELETE FROM bodies")
+        if etag:
+            page.etag = etag
+            page.always_not_modified = True
+    return step
+
+
+def test_unchanged_body_with_new_etag_is_persisted(tmp_path):
+    page, cached = asyncio.run(run_steps(tmp_path, [new_etag('"v2"')]))
+    assert page.requests == [None, '"v1"']
+    assert cached['etag'] == '"v2"'
+
+
+def test_not_modified_keeps_etag(tmp_path):
+    page, cached = asyncio.run(run_steps(tmp_path, [lambda page, cache: None]))
+    assert page.requests == [None, '"v1"']
+    assert cached['etag'] == '"v1"'
+
+
+def test_not_modified_with_new_etag_is_persisted(tmp_path):
+    def step(page, cache):
+        page.not_modified_etag = '"v1-gzip"'
+
+    page, cached = asyncio.run(run_steps(tmp_path, [step]))
+    assert page.requests == [None, '"v1"']
+    assert cached['etag'] == '"v1-gzip"'
+
+
+def test_backend_change_with_evicted_body_stores_refetched_validators(tmp_path):
+    # 304 -> saklı gövde yok -> koşulsuz istek: yeni yanıtın ETag'i saklanmalı
+    page, cached = asyncio.run(run_steps(tmp_path, [backend_changed(evict_body=True, etag='"v3"')]))
+    assert page.requests == [None, '"v1"', None]
+    assert cached['etag'] == '"v3"'
+    assert cached['extractor'] != 'eski'
+
+
+def test_backend_change_uses_stored_body(tmp_path):
+    page, cached = asyncio.run(run_steps(tmp_path, [backend_changed(evict_body=False)]))
+    assert page.requests == [None, '"v1"']
+    assert cached['etag'] == '"v1"'
+    assert cached['extractor'] != 'eski'
+
+
+def test_cut_page_body_is_not_stored(tmp_path):
+    def step(page, cache):
+        # Sayfa başı tam gövde gibi saklanmadı
+        assert cache.conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0] == 0
+        backend_changed(evict_body=False)(page, cache)
+
+    # Backend değişince kısmi gövdeden çıkarım yapılmaz, sayfa yeniden çekilir
+    page, cached = asyncio.run(run_steps(tmp_path, [step], padding_kb=64, stream_chunk_size=1024))
+    assert page.requests == [None, '"v1"', None]
+    assert cached['extractor'] != 'eski'
+    assert cached['record']['sku'] == '3000000001'
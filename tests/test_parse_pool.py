@@ -0,0 +1,69 @@
+"""HTML parse süreç havuzu: havuzdaki kayıt inline ile aynı olmalı, havuz çökerse inline devam edilmeli"""
+import asyncio
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from dogtas_other_scraper import METRICS, ProductRecord
+from helpers import make_scraper, product_page
+
+URL = "https://www.dogtas.com/urun/aspen-ayna-3000000001"
+
+
+class BrokenPool(Executor):
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("worker öldü")
+
+    def shutdown(self, wait=True, **kwargs):
+        pass
+
+
+def extract(scraper, html):
+    return asyncio.run(scraper.extract_record_async(html, URL))
+
+
+def test_pool_record_matches_inline():
+    html = product_page().decode('utf-8')
+    scraper = make_scraper()
+    inline = extract(scraper, html)
+
+    scraper.parse_pool = ProcessPoolExecutor(max_workers=1)
+    try:
+        METRICS.reset()
+        pooled = extract(scraper, html)
+    finally:
+        scraper.shutdown_parse_pool()
+
+    assert isinstance(pooled, ProductRecord)
+    assert pooled == inline
+    # Worker'daki aşama süreleri ana sürecin ölçümlerine eklenir
+    assert METRICS.histograms['html_parse']['count'] == 1
+    assert scraper.parse_pool is None
+
+
+def test_broken_pool_falls_back_to_inline(capsys):
+    scraper = make_scraper()
+    scraper.parse_pool = BrokenPool()
+
+    record = extract(scraper, product_page().decode('utf-8'))
+
+    assert record['sku'] == '3000000001'
+    assert scraper.parse_pool is None
+    assert "Parse havuzu çöktü" in capsys.readouterr().out
+
+
+def test_parse_workers_default(monkeypatch):
+    scraper = make_scraper()
+    monkeypatch.setattr('os.cpu_count', lambda: 4)
+    assert scraper.resolve_parse_workers() == 3
+
+    # Paketlenmiş exe: inline
+    monkeypatch.setattr(sys, 'frozen', True, raising=False)
+    assert scraper.resolve_parse_workers() == 0
+
+    scraper.config['parse_workers'] = 2
+    assert scraper.resolve_parse_workers() == 2
@@ -0,0 +1,82 @@
+"""SKU pipeline: eşzamanlı worker'lar, sonuçlar giriş sırasında; token bucket hızı sınırlamalı"""
+import asyncio
+import contextlib
+import time
+
+from dogtas_other_scraper import OUTCOME_FOUND, OUTCOME_NOT_FOUND, TokenBucket
+from helpers import make_scraper
+
+
+def pipeline_scraper(worker_count=4):
+    scraper = make_scraper()
+    scraper.config['worker_count'] = worker_count
+    scraper.in_flight = scraper.peak = 0
+
+    @contextlib.asynccontextmanager
+    async def session():
+        yield None
+
+    async def scrape_sku_outcome(_session, sku, prefix="", revalidate=False):
+        scraper.in_flight += 1
+        scraper.peak = max(scraper.peak, scraper.in_flight)
+        # Sonraki SKU'lar daha erken biter: tamamlanma sırası giriş sırasının tersi
+        await asyncio.sleep(0.05 - int(sku[-2:]) * 0.002)
+        scraper.in_flight -= 1
+        if sku.endswith('7'):
+            return OUTCOME_NOT_FOUND, None
+        return OUTCOME_FOUND, {'sku': sku}
+
+    scraper.scraping_session = session
+    scraper.scrape_sku_outcome = scrape_sku_outcome
+    return scraper
+
+
+def test_results_come_back_in_input_order_with_many_in_flight():
+    skus = [f"30000000{i:02d}" for i in range(20)]
+    scraper = pipeline_scraper(worker_count=4)
+
+    products = asyncio.run(scraper.scrape_from_sku_list_async(skus))
+
+    assert [product['sku'] for product in products] == [sku for sku in skus if not sku.endswith('7')]
+    assert scraper.product_skus == [product['sku'] for product in products]
+    assert scraper.peak == 4
+
+
+def test_wall_clock_scales_with_workers_not_sku_count():
+    skus = [f"30000000{i:02d}" for i in range(20)]
+    scraper = pipeline_scraper(worker_count=10)
+
+    start = time.perf_counter()
+    asyncio.run(scraper.scrape_from_sku_list_async(skus))
+    # Sıralı çalışsaydı ~0.6 sn sürerdi
+    assert time.perf_counter() - start < 0.3
+
+
+def test_token_bucket_limits_rate_after_burst():
+    async def take(bucket, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.perf_counter() - start
+
+    # 5 token'lık burst hemen, kalan 10 token saniyede 50 hızla (~0.2 sn)
+    elapsed = asyncio.run(take(TokenBucket(50, 5), 15))
+    assert 0.15 <= elapsed < 0.5
+
+
+def test_token_bucket_off_still_honours_pause():
+    async def scenario():
+        bucket = TokenBucket(0)
+        start = time.perf_counter()
+        for _ in range(100):
+            await bucket.acquire()
+        unlimited = time.perf_counter() - start
+
+        bucket.pause(0.1)
+        start = time.perf_counter()
+        await bucket.acquire()
+        return unlimited, time.perf_counter() - start
+
+    unlimited, paused = asyncio.run(scenario())
+    assert unlimited < 0.05
+    assert paused >= 0.09
@@ -0,0 +1,74 @@
+"""ProductRecord: slot'lu kayıt, intern edilen metinler, dict gibi okuma ve paylaşılan kopyalar"""
+import json
+import pickle
+
+import pytest
+
+from dogtas_other_scraper import (DataValidator, ProductFilter, ProductRecord, dump_record, json_default,
+                                  load_record)
+
+
+def raw_product(kategori="Yatak Odası"):
+    return {
+        'urun_adi': " Ayna ", 'urun_adi_tam': "ASPEN Ayna", 'KOLEKSIYON': "".join(["ASP", "EN"]),
+        'kategori': "".join(["Yatak ", "Odası"]) if kategori == "Yatak Odası" else kategori,
+        'sku': "3000000001", 'urun_url': "https://www.dogtas.com/urun/aspen-ayna-3000000001",
+        'orijinal_fiyat': "12.500,50 TL", 'fiyat': "9.999 TL", 'marka': "Doğtaş",
+    }
+
+
+def test_validated_record_is_slotted_and_typed():
+    record = DataValidator.validate_product_data(raw_product())
+
+    assert isinstance(record, ProductRecord)
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.marka = "Doğtaş"
+    assert (record.LISTE, record.PERAKENDE) == (12500, 9999)
+    assert record.urun_adi == "Ayna"
+    assert 'marka' not in record
+
+
+def test_category_and_collection_are_interned():
+    first = DataValidator.validate_product_data(raw_product())
+    second = DataValidator.validate_product_data(raw_product())
+
+    assert first.kategori is second.kategori
+    assert first.KOLEKSIYON is second.KOLEKSIYON
+
+
+def test_reads_like_a_dict():
+    record = DataValidator.validate_product_data(raw_product())
+
+    assert record['sku'] == "3000000001"
+    assert record.get('kategori') == "Yatak Odası"
+    assert record.get('marka', "-") == "-"
+    with pytest.raises(KeyError):
+        record['marka']
+    assert list(record.to_dict()) == list(ProductRecord.FIELDS)
+    assert record == record.to_dict()
+    assert record != record.replace(LISTE=1)
+
+
+def test_duplicate_shares_unchanged_fields():
+    record = DataValidator.validate_product_data(raw_product("Yemek Odası"))
+    record = record.replace(urun_adi_tam="ASPEN AYNALI Konsol")
+
+    products = ProductFilter.apply_duplication_rules([record])
+
+    assert [p.kategori for p in products] == ["Yemek Odası", "Yatak Odası"]
+    original, copy = products
+    assert copy is not original
+    for field in ProductRecord.FIELDS:
+        if field != 'kategori':
+            assert getattr(copy, field) is getattr(original, field)
+
+
+def test_serialization_round_trip():
+    record = DataValidator.validate_product_data(raw_product())
+
+    assert load_record(dump_record(record)) == record
+    assert json.loads(json.dumps([record], default=json_default)) == [record.to_dict()]
+    assert pickle.loads(pickle.dumps(record)) == record
+    # --batch ham kayıtları dict olarak kalır
+    assert load_record(dump_record({'sku': "3000000001"})) == {'sku': "3000000001"}
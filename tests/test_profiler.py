@@ -0,0 +1,87 @@
+"""--profile: aşama raporu, cProfile ve collapsed-stack dosyaları, event loop gecikmesi"""
+import asyncio
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import dogtas_other_scraper
+from dogtas_other_scraper import RunProfiler, profile_stage
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def busy(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def block_loop():
+    """Event loop'u bloklayan aşama: watch_loop gecikmeyi ölçmeli"""
+    async def run(profiler):
+        watch = asyncio.create_task(profiler.watch_loop())
+        await asyncio.sleep(0.06)
+        busy(0.2)
+        await asyncio.sleep(0.06)
+        watch.cancel()
+
+    return run
+
+
+def test_profile_files_per_stage(tmp_path, capsys):
+    base = tmp_path / 'profile'
+    profiler = RunProfiler(str(base), sample_interval=0.001)
+    profiler.start()
+    try:
+        profiler.stage('parse')
+        chunks = [bytes(1024) for _ in range(2048)]
+        busy(0.1)
+        profiler.stage('scrape')
+        asyncio.run(block_loop()(profiler))
+    finally:
+        profiler.stop()
+    del chunks
+
+    assert [stage['name'] for stage in profiler.stages] == ['startup', 'parse', 'scrape']
+    assert not tracemalloc.is_tracing()
+
+    folded = (tmp_path / 'profile.folded').read_text(encoding='utf-8').splitlines()
+    assert {line.split(';', 1)[0] for line in folded} <= {'startup', 'parse', 'scrape'}
+    assert any(line.startswith('parse;') and 'busy (test_profiler.py' in line for line in folded)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in folded)
+
+    assert pstats.Stats(str(tmp_path / 'profile.prof')).total_calls > 0
+
+    report = (tmp_path / 'profile.txt').read_text(encoding='utf-8')
+    assert '[parse] En çok bellek ayıran satırlar' in report
+    # 2 MB'lık liste parse aşamasının ayırdığı satır olarak görünür
+    parse_allocations = report.split('[parse] En çok bellek ayıran satırlar')[1].split('=' * 80)[0]
+    assert 'test_profiler.py' in parse_allocations
+
+    count, _, worst = profiler.loop_lag['scrape']
+    assert count >= 1 and worst >= 0.1
+    assert '[PROFILE]' in capsys.readouterr().out
+
+
+def test_repeated_stage_is_ignored(tmp_path):
+    profiler = RunProfiler(str(tmp_path / 'profile'))
+    profiler.start()
+    profiler.stage('scrape')
+    profiler.stage('scrape')
+    profiler.stop()
+    assert [stage['name'] for stage in profiler.stages] == ['startup', 'scrape']
+
+
+def test_stage_marks_are_noops_without_profile():
+    assert dogtas_other_scraper.PROFILER is None
+    profile_stage('scrape')
+    assert not tracemalloc.is_tracing()
+
+    # --profile olmadan profilleme modülleri yüklenmez
+    probe = ("import sys, dogtas_other_scraper as m\nm.profile_stage('scrape')\n"
+             "print([name for name in ('cProfile', 'pstats', 'tracemalloc') if name in sys.modules])")
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,56 @@
+"""read_other_xlsx: pandas olmadan ilk sütunu akıtmalı, sırayı koruyarak tekilleştirmeli"""
+import sys
+
+import pytest
+
+from dogtas_other_scraper import INVALID_ROW_SAMPLES, read_other_xlsx
+
+
+@pytest.fixture
+def no_pandas(monkeypatch):
+    # pandas import edilmeye çalışılırsa ImportError
+    monkeypatch.setitem(sys.modules, 'pandas', None)
+
+
+def test_csv_keeps_order_dedupes_and_skips_header(tmp_path, no_pandas, capsys):
+    path = tmp_path / 'skus.csv'
+    path.write_text("SKU,ad\n3000000002,a\n 3000000001 ,b\n3000000002,c\nabc,d\n\n3000000003\n", encoding='utf-8')
+
+    assert read_other_xlsx(str(path)) == ['3000000002', '3000000001', '3000000003']
+    out = capsys.readouterr().out
+    assert "1 geçersiz satır" in out
+    assert "Satır 5: 'abc'" in out
+    assert "1 tekrarlanan SKU" in out
+
+
+def test_txt_first_line_is_data_when_valid(tmp_path, no_pandas):
+    path = tmp_path / 'skus.txt'
+    path.write_text("3000000001\n3000000002\n", encoding='utf-8')
+    assert read_other_xlsx(str(path)) == ['3000000001', '3000000002']
+
+
+def test_invalid_row_samples_are_capped(tmp_path, no_pandas, capsys):
+    path = tmp_path / 'skus.txt'
+    path.write_text("3000000001\n" + "".join(f"x{i}\n" for i in range(1000)), encoding='utf-8')
+
+    assert read_other_xlsx(str(path)) == ['3000000001']
+    out = capsys.readouterr().out
+    assert "1000 geçersiz satır" in out
+    assert out.count("Satır ") == INVALID_ROW_SAMPLES
+    assert f"... ve {1000 - INVALID_ROW_SAMPLES} satır daha" in out
+
+
+def test_xlsx_reads_first_column_of_numeric_cells(tmp_path, no_pandas):
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in [("SKU", "Ad"), (3000000002, "a"), (3000000001.0, "b"), ("3000000002", "c"), (None, "d")]:
+        sheet.append(row)
+    path = tmp_path / 'Other.xlsx'
+    workbook.save(path)
+
+    assert read_other_xlsx(str(path)) == ['3000000002', '3000000001']
+
+
+def test_missing_file_returns_empty(tmp_path):
+    assert read_other_xlsx(str(tmp_path / 'yok.xlsx')) == []
@@ -0,0 +1,62 @@
+"""Kayıt memo'su: yalnızca birden fazla SKU'nun çıktığı URL'ler, son SKU'ya kadar tutulmalı"""
+import asyncio
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from helpers import make_scraper
+
+
+def memo_scraper():
+    scraper = make_scraper()
+    scraper.config['batch_postprocess'] = True
+    scraper.sku_index = {'1': 'u/ortak', '2': 'u/ortak', '3': 'u/tek'}
+    scraper.record_memo = {}
+    scraper.fetched = []
+    memo_sizes = []
+
+    async def get_product_detail_async(session, url, revalidate=False):
+        scraper.fetched.append(url)
+        await asyncio.sleep(0)
+        return {'urun_url': url}
+
+    async def get_product_record(session, url, revalidate=False):
+        record = await original(session, url, revalidate)
+        memo_sizes.append(dict(scraper.record_memo))
+        return record
+
+    original = scraper.get_product_record
+    scraper.get_product_detail_async = get_product_detail_async
+    scraper.get_product_record = get_product_record
+    scraper.memo_sizes = memo_sizes
+    return scraper
+
+
+def test_single_sku_url_is_never_memoized():
+    scraper = memo_scraper()
+    scraper.plan_record_memo(['1', '2', '3'])
+    assert scraper.memo_pending == {'u/ortak': 2}
+
+    async def lookups():
+        return [await scraper.get_product_record(None, url) for url in ['u/tek', 'u/ortak', 'u/ortak']]
+
+    records = asyncio.run(lookups())
+
+    assert [record['urun_url'] for record in records] == ['u/tek', 'u/ortak', 'u/ortak']
+    assert scraper.fetched == ['u/tek', 'u/ortak']
+    assert scraper.memo_sizes == [{}, {'u/ortak': {'urun_url': 'u/ortak'}}, {}]
+    assert scraper.memo_pending == {}
+
+
+def test_batch_leaves_memo_empty():
+    scraper = memo_scraper()
+    batch = [(0, '1'), (1, '3'), (2, '2')]
+
+    results = asyncio.run(scraper.scrape_batch(None, batch))
+
+    assert sorted(position for position, _, _ in results) == [0, 1, 2]
+    assert sorted(scraper.fetched) == ['u/ortak', 'u/tek']
+    assert all('u/tek' not in memo for memo in scraper.memo_sizes)
+    assert scraper.record_memo == {}
+    assert scraper.memo_pending == {}
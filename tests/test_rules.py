@@ -0,0 +1,102 @@
+"""Kural motoru: Türkçe harf dönüşümü, derlenmiş eşleştirici, kural dosyası ve cache'i"""
+import json
+import random
+import re
+
+import pytest
+
+from dogtas_other_scraper import (ProductFilter, ProductRecord, ProductRule, keywords_to_pattern,
+                                  load_rules_file, turkish_lower)
+
+
+@pytest.fixture
+def default_rules(monkeypatch):
+    # load_rules sınıf özelliklerini değiştirir: test sonunda varsayılanlar geri gelir
+    monkeypatch.setattr(ProductFilter, 'FILTER_RULES', ProductFilter.FILTER_RULES)
+    monkeypatch.setattr(ProductFilter, 'DUPLICATE_RULES', ProductFilter.DUPLICATE_RULES)
+
+
+def product(kategori, urun_adi):
+    return ProductRecord(KOLEKSIYON="ASPEN", urun_adi=urun_adi, urun_adi_tam=f"ASPEN {urun_adi}",
+                         sku="3000000001", kategori=kategori, LISTE=100, PERAKENDE=90)
+
+
+def test_turkish_lower():
+    assert turkish_lower("KIRLENT") == "kırlent"
+    assert turkish_lower("İNCE HALI") == "ince halı"
+    assert turkish_lower("ŞAMDAN") == "şamdan"
+
+
+@pytest.mark.parametrize('kategori, urun_adi, filtered', [
+    ("Doğtaş Home", "Karyola", True),
+    ("", "KIRLENT", True),
+    ("", "İnce Halı Seti", True),
+    (" ", "Vazo", True),
+    ("Yatak Odası", "Vazo", False),
+    ("", "Karyola", False),
+])
+def test_default_filter_rules(kategori, urun_adi, filtered):
+    assert ProductFilter.should_filter_product(product(kategori, urun_adi)) is filtered
+
+
+def test_default_duplicate_rule():
+    copies = ProductFilter.duplicates(product("Yemek Odası", "AYNALI Konsol"))
+    assert [copy['kategori'] for copy in copies] == ["Yatak Odası"]
+    assert ProductFilter.duplicates(product("Yatak Odası", "Ayna")) == []
+
+
+def test_trie_pattern_matches_like_plain_alternation():
+    words = ['mum', 'mumluk', 'masa', 'mat', 'ayna', 'aynalık', 'a']
+    trie = re.compile(keywords_to_pattern(words))
+    plain = re.compile('|'.join(sorted(map(re.escape, words), key=len, reverse=True)))
+    rng = random.Random(1)
+    for _ in range(500):
+        text = "".join(rng.choice("mumlaskytnı ") for _ in range(12))
+        assert [m.group() for m in trie.finditer(text)] == [m.group() for m in plain.finditer(text)]
+
+
+def test_rule_reports_original_keyword_spelling():
+    rule = ProductRule(keywords=['Mum', 'Mumluk'])
+    assert rule.match(product("", "Cam MUMLUK")) == 'Mumluk'
+    assert rule.match(product("", "Karyola")) is None
+
+
+def test_rules_file_is_loaded_and_cached(tmp_path, default_rules):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps({
+        'filter': [{'keywords': ['Karyola']}],
+        'duplicate': [{'kategori': "Genç Odası", 'keywords': ['ayna'], 'target_kategori': "Yatak Odası"}],
+    }), encoding='utf-8')
+
+    first = load_rules_file(str(path))
+    assert load_rules_file(str(path)) is first
+
+    ProductFilter.load_rules(str(path))
+    assert ProductFilter.should_filter_product(product("Yatak Odası", "KARYOLA"))
+    assert not ProductFilter.should_filter_product(product("Doğtaş Home", "Sehpa"))
+    assert [c['kategori'] for c in ProductFilter.duplicates(product("Genç Odası", "Ayna"))] == ["Yatak Odası"]
+
+    # Dosya değişince yeniden derlenir
+    path.write_text(json.dumps({'filter': [{'kategori': "Doğtaş Home"}]}), encoding='utf-8')
+    assert load_rules_file(str(path)) is not first
+
+
+@pytest.mark.parametrize('rules', [
+    {'filter': [{'kategory': "Doğtaş Home"}]},
+    {'duplicate': [{'kategori': "Yemek Odası", 'keywords': ['ayna']}]},
+])
+def test_invalid_rules_are_rejected(tmp_path, rules):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps(rules), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_rules_file(str(path))
+
+
+def test_yaml_rules_file(tmp_path):
+    pytest.importorskip('yaml')
+    path = tmp_path / 'rules.yaml'
+    path.write_text("filter:\n  - kategori: ''\n    keywords: [Obje]\n", encoding='utf-8')
+
+    filters, duplicates = load_rules_file(str(path))
+    assert duplicates == []
+    assert filters[0].match(product("", "Dekoratif OBJE")) == 'Obje'
@@ -0,0 +1,81 @@
+"""--serve: kayıt cache'i sınırlı olmalı, /prices geçersiz veya büyük istekleri reddetmeli"""
+import asyncio
+import json
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+from aiohttp import web
+
+from dogtas_other_scraper import OUTCOME_NOT_FOUND, DogtasSitemapScraper, PriceLookupService
+
+
+def make_service(max_records=3, max_batch=4):
+    scraper = DogtasSitemapScraper()
+    scraper.config.update(service_max_records=max_records, service_max_batch=max_batch)
+    scraper.sku_index = {}
+    scraper.url_lastmod = {}
+    fetched = []
+
+    async def scrape_sku_outcome(session, sku, prefix, revalidate=False):
+        fetched.append(sku)
+        return OUTCOME_NOT_FOUND, None
+
+    scraper.scrape_sku_outcome = scrape_sku_outcome
+    return PriceLookupService(scraper), fetched
+
+
+def test_records_are_bounded_lru():
+    service, fetched = make_service(max_records=3)
+
+    async def lookups():
+        for sku in ['1', '2', '3', '1', '4', '1', '2']:
+            await service.lookup(sku)
+
+    asyncio.run(lookups())
+    # '1' sık kullanıldığı için kalır; '2' ve '3' sırayla atılır
+    assert list(service.records) == ['4', '1', '2']
+    assert fetched == ['1', '2', '3', '4', '2']
+
+
+async def post_prices(service, body):
+    app = web.Application()
+    app.router.add_get('/prices', service.handle_prices)
+    app.router.add_post('/prices', service.handle_prices)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f'http://127.0.0.1:{port}/prices', data=body) as response:
+                return response.status, await response.json()
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.parametrize('body', [
+    '{"skus": "3000000001"}',
+    '{"skus": {"a": 1}}',
+    '{"skus": [["3000000001"]]}',
+    '{"skus": [true]}',
+    '["3000000001"]',
+    'not json',
+    json.dumps({'skus': [str(i) for i in range(5)]}),
+])
+def test_invalid_or_large_batches_are_rejected(body):
+    service, fetched = make_service(max_batch=4)
+    status, data = asyncio.run(post_prices(service, body))
+    assert status == 400
+    assert 'error' in data
+    assert fetched == []
+
+
+def test_valid_batch_is_answered():
+    service, fetched = make_service(max_batch=4)
+    status, data = asyncio.run(post_prices(service, json.dumps({'skus': ['1', 2]})))
+    assert status == 200
+    assert [result['sku'] for result in data['results']] == ['1', '2']
+    assert fetched == ['1', '2']
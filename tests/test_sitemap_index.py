@@ -0,0 +1,138 @@
+"""Sitemap SKU index'i: run başına tek oluşturma, diskteki cache, koşullu istek ve lastmod ile yenileme"""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+from dogtas_other_scraper import TokenBucket
+from helpers import local_server, make_scraper, sitemap_xml
+
+
+class SitemapSite:
+    """Sitemap index'i ve ürün sitemap'leri; ETag'li, istekleri kaydeden sunucu"""
+
+    def __init__(self):
+        self.products = {
+            '1.xml': [('{base}/urun/aspen-ayna-3000000001', '2026-01-01'),
+                      ('{base}/urun/aspen-komodin-3000000002', '2026-01-02')],
+            '2.xml': [],
+        }
+        self.lastmods = {'1.xml': '2026-01-05', '2.xml': '2026-01-05'}
+        self.requests = []
+
+    def respond(self, request, name, body):
+        sent = request.headers.get('If-None-Match')
+        self.requests.append((name, sent))
+        etag = f'"{hash(body)}"'
+        if sent == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, content_type='application/xml', headers={'ETag': etag})
+
+    async def index(self, request):
+        base = f"http://{request.host}"
+        entries = [(f"{base}/sitemap/products/{name}", lastmod) for name, lastmod in self.lastmods.items()]
+        entries.append((f"{base}/sitemap/pages.xml", ''))
+        return self.respond(request, 'index', sitemap_xml(entries, tag='sitemap'))
+
+    async def product(self, request):
+        base = f"http://{request.host}"
+        name = request.match_info['name']
+        entries = [(loc.format(base=base), lastmod) for loc, lastmod in self.products[name]]
+        return self.respond(request, name, sitemap_xml(entries))
+
+    async def pages(self, request):
+        # Index'teki ürün dışı sitemap: istenmemeli
+        return self.respond(request, 'pages', sitemap_xml([(f"http://{request.host}/urun/x-3999999999", '')]))
+
+    @property
+    def routes(self):
+        return {'/sitemap.xml': self.index, '/sitemap/products/{name}': self.product,
+                '/sitemap/pages.xml': self.pages}
+
+    async def build(self, base, cache_path):
+        """Yeni bir scraper ile index'i oluştur: (SKU -> yol, istekler)"""
+        self.requests = []
+        scraper = make_scraper(sitemap_cache_path=cache_path)
+        scraper.rate_limiter = TokenBucket(0)
+        scraper.sitemap_index_url = f"{base}/sitemap.xml"
+        async with aiohttp.ClientSession() as session:
+            index = await scraper.build_sku_index(session)
+        scraper.sitemap_cache.close()
+        return {sku: url.split('/', 3)[3] for sku, url in index.items()}, sorted(self.requests, key=str)
+
+    def runs(self, cache_path, *changes):
+        """Aynı sunucuya ardışık run'lar; her run'dan önce sıradaki değişiklik uygulanır"""
+        async def scenario():
+            results = []
+            async with local_server(self.routes) as base:
+                for change in (None,) + changes:
+                    if change:
+                        change(self)
+                    results.append(await self.build(base, cache_path))
+            return results
+        return asyncio.run(scenario())
+
+
+def test_warm_run_uses_cache_without_downloading_sitemaps(tmp_path):
+    site = SitemapSite()
+    (cold_index, cold_requests), (warm_index, warm_requests) = site.runs(
+        str(tmp_path / 'sitemaps.sqlite'), lambda site: None)
+
+    assert cold_index == {'3000000001': 'urun/aspen-ayna-3000000001',
+                          '3000000002': 'urun/aspen-komodin-3000000002'}
+    assert cold_requests == [('1.xml', None), ('2.xml', None), ('index', None)]
+    # Index koşullu istekle 304 aldı; lastmod'u değişmeyen ürün sitemap'leri (boş olan dahil) istenmedi
+    assert warm_index == cold_index
+    assert len(warm_requests) == 1
+    assert warm_requests[0][0] == 'index' and warm_requests[0][1] is not None
+
+
+def test_changed_lastmod_refreshes_only_that_sitemap(tmp_path):
+    def change(site):
+        site.lastmods['2.xml'] = '2026-02-01'
+        site.products['2.xml'] = [('{base}/urun/carmen-konsol-3000000003', '2026-02-01')]
+
+    _, (index, requests) = SitemapSite().runs(str(tmp_path / 'sitemaps.sqlite'), change)
+
+    assert index['3000000003'] == 'urun/carmen-konsol-3000000003'
+    assert len(index) == 3
+    assert [name for name, _ in requests] == ['2.xml', 'index']
+
+
+def test_index_is_built_once_for_concurrent_lookups():
+    site = SitemapSite()
+    # Aynı SKU iki sitemap'te: sitemap sırasında ilk bulunan URL kazanır
+    site.products['2.xml'] = [('{base}/urun/aspen-ayna-eski-3000000001', ''),
+                              ('{base}/urun/vega-sehpa-3000000004', '')]
+
+    async def scenario():
+        scraper = make_scraper()
+        scraper.rate_limiter = TokenBucket(0)
+        async with local_server(site.routes) as base:
+            scraper.sitemap_index_url = f"{base}/sitemap.xml"
+            async with aiohttp.ClientSession() as session:
+                urls = await asyncio.gather(*(scraper.search_sku_in_sitemaps(session, sku) for sku in
+                                              ['3000000001', '3000000004', '3000000009', '3000000002'] * 5))
+        return [url.split('/', 3)[3] if url else None for url in urls[:4]]
+
+    assert asyncio.run(scenario()) == ['urun/aspen-ayna-3000000001', 'urun/vega-sehpa-3000000004', None,
+                                       'urun/aspen-komodin-3000000002']
+    assert sorted(name for name, _ in site.requests) == ['1.xml', '2.xml', 'index']
+
+
+def test_missing_index_falls_back_to_fixed_sitemap_list():
+    site = SitemapSite()
+
+    async def scenario():
+        scraper = make_scraper()
+        scraper.rate_limiter = TokenBucket(0)
+        async with local_server(site.routes) as base:
+            scraper.sitemap_index_url = f"{base}/yok.xml"
+            scraper.sitemap_urls = [f"{base}/sitemap/products/1.xml"]
+            async with aiohttp.ClientSession() as session:
+                return await scraper.build_sku_index(session)
+
+    assert sorted(asyncio.run(scenario())) == ['3000000001', '3000000002']
+    assert [name for name, _ in site.requests] == ['1.xml']
@@ -0,0 +1,51 @@
+"""SitemapStreamParser: parça boyutundan bağımsız aynı girdiler, işlenen elemanlar bırakılmalı"""
+import tracemalloc
+
+from dogtas_other_scraper import SitemapStreamParser
+from helpers import sitemap_xml
+
+
+def parse(data: bytes, chunk_size: int, tag: str = 'url'):
+    parser = SitemapStreamParser(tag)
+    entries = []
+    for start in range(0, len(data), chunk_size):
+        entries.extend(parser.feed(data[start:start + chunk_size]))
+    entries.extend(parser.close())
+    return entries
+
+
+def test_chunk_boundaries_do_not_change_entries():
+    expected = [(f"https://www.dogtas.com/urun/{i}-30000000{i:02d}", "2026-01-01" if i % 3 else "")
+                for i in range(50)]
+    data = sitemap_xml([(f"  {loc}\n", lastmod) for loc, lastmod in expected])
+
+    assert parse(data, len(data)) == expected
+    assert parse(data, 7) == expected
+    assert parse(data, 1) == expected
+
+
+def test_sitemap_index_tag_and_empty_loc():
+    data = sitemap_xml([("https://www.dogtas.com/sitemap/products/1.xml", "2026-01-05"), ("  ", "")],
+                       tag='sitemap')
+    assert parse(data, 64, tag='sitemap') == [("https://www.dogtas.com/sitemap/products/1.xml", "2026-01-05")]
+
+
+def test_processed_elements_are_released():
+    data = sitemap_xml([(f"https://www.dogtas.com/urun/{i}-3{i:09d}", "2026-01-01") for i in range(20000)])
+    parser = SitemapStreamParser()
+    count = 0
+
+    tracemalloc.start()
+    try:
+        for start in range(0, len(data), 16 * 1024):
+            count += len(parser.feed(data[start:start + 16 * 1024]))
+            # Kökte en fazla yarım kalmış son eleman durur
+            assert len(parser.root) <= 1
+        count += len(parser.close())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count == 20000
+    # Tüm ağaç bellekte tutulsaydı tepe değer dokümanın birkaç katı olurdu
+    assert peak < len(data) / 4
@@ -0,0 +1,54 @@
+"""Sitemap isteği 429/503 alırsa Retry-After sonrası tekrar denenmeli, SKU'lar düşmemeli"""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+from aiohttp import web
+
+from dogtas_other_scraper import DogtasSitemapScraper, TokenBucket
+from helpers import local_server, make_scraper
+
+SITEMAP = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    '<url><loc>https://www.dogtas.com/urun/a-3000000001</loc><lastmod>2026-01-01</lastmod></url>'
+    '</urlset>'
+)
+
+
+async def fetch_sitemap(throttled_responses: int, status: int = 429):
+    requests = 0
+
+    async def handler(request):
+        nonlocal requests
+        requests += 1
+        if requests <= throttled_responses:
+            return web.Response(status=status, headers={'Retry-After': '0'})
+        return web.Response(text=SITEMAP, content_type='application/xml')
+
+    scraper = make_scraper()
+    scraper.rate_limiter = TokenBucket(0)
+    async with local_server({'/sitemap.xml': handler}) as base:
+        async with aiohttp.ClientSession() as session:
+            entries = await scraper.get_xml_async(session, f'{base}/sitemap.xml')
+    return entries, requests
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_throttled_sitemap_is_retried(status):
+    entries, requests = asyncio.run(fetch_sitemap(throttled_responses=2, status=status))
+    assert requests == 3
+    assert entries == [('https://www.dogtas.com/urun/a-3000000001', '2026-01-01')]
+
+
+def test_sitemap_gives_up_after_retry_count():
+    entries, requests = asyncio.run(fetch_sitemap(throttled_responses=10))
+    assert entries is None
+    assert requests == DogtasSitemapScraper().config['retry_count']
+
+
+def test_default_request_rate_is_capped():
+    rate = DogtasSitemapScraper().config['requests_per_second']
+    assert 0 < rate <= 4
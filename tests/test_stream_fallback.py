@@ -0,0 +1,106 @@
+"""Sayfa başı yetmediğinde ikinci GET atılmamalı, aynı yanıtın kalanı okunmalı"""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+from aiohttp import web
+
+from dogtas_other_scraper import METRICS, ArchivedResponse
+from helpers import local_server, make_scraper, product_page
+
+
+async def fetch(body: bytes, count: int = 1, **config):
+    """Aynı sayfayı count kez çek: (son kayıt, istek sayısı, kullanılan bağlantı sayısı)"""
+    requests = 0
+    peers = set()
+
+    async def handler(request):
+        # Gövdenin ilk yarısı hemen, kalanı biraz sonra: kesme anında yanıt hâlâ sürüyor
+        nonlocal requests
+        requests += 1
+        peers.add(request.transport.get_extra_info('peername'))
+        response = web.StreamResponse(headers={'Content-Type': 'text/html; charset=utf-8'})
+        response.content_length = len(body)
+        await response.prepare(request)
+        await response.write(body[:len(body) // 2])
+        await asyncio.sleep(0.05)
+        await response.write(body[len(body) // 2:])
+        return response
+
+    scraper = make_scraper()
+    scraper.config['stream_chunk_size'] = 1024
+    scraper.config.update(config)
+    METRICS.reset()
+    async with local_server({'/urun/a': handler}) as base:
+        async with aiohttp.ClientSession() as session:
+            for _ in range(count):
+                record = await scraper.get_product_detail_async(session, f"{base}/urun/a")
+    assert scraper.concurrency.in_flight == 0
+    return record, requests, len(peers)
+
+
+def test_incomplete_prefix_reads_rest_of_same_response():
+    # Boş .sku: sayfa başından kayıt çıkmaz, tam sayfa gerekir
+    body = product_page(sku="", padding_kb=64)
+    record, requests, _ = asyncio.run(fetch(body))
+
+    assert record is not None
+    assert requests == 1
+    assert METRICS.counters['page_stream_cuts'] == 1
+    assert METRICS.counters['page_stream_fallbacks'] == 1
+    assert METRICS.counters['page_bytes'] == len(body)
+
+
+def test_complete_prefix_stops_reading():
+    body = product_page(padding_kb=64)
+    record, requests, _ = asyncio.run(fetch(body))
+
+    assert record is not None
+    assert requests == 1
+    assert 'page_stream_fallbacks' not in METRICS.counters
+    assert METRICS.counters['page_bytes'] < len(body)
+
+
+def test_page_without_discount_is_cut():
+    body = product_page(perakende=None, padding_kb=64)
+    record, _, _ = asyncio.run(fetch(body))
+
+    assert record['PERAKENDE'] == record['LISTE'] == 12500
+    assert METRICS.counters['page_stream_cuts'] == 1
+    assert 'page_stream_fallbacks' not in METRICS.counters
+    assert METRICS.counters['page_bytes'] < len(body)
+
+
+def test_small_remainder_is_drained_and_connection_reused():
+    body = product_page(padding_kb=64)
+    _, requests, connections = asyncio.run(fetch(body, count=3))
+
+    assert requests == 3
+    assert connections == 1
+    assert METRICS.counters['page_stream_cuts'] == 3
+    assert 'page_stream_closes' not in METRICS.counters
+
+
+def test_large_remainder_closes_connection():
+    body = product_page(padding_kb=64)
+    _, requests, connections = asyncio.run(fetch(body, count=2, stream_drain_bytes=4 * 1024))
+
+    assert requests == 2
+    assert connections == 2
+    assert METRICS.counters['page_stream_closes'] == 2
+
+
+def test_archived_response_continues_after_cut():
+    response = ArchivedResponse('u', 200, 'OK', [], b'abcdefgh', 'utf-8', None)
+
+    async def read():
+        first = []
+        async for chunk in response.content.iter_chunked(3):
+            first.append(chunk)
+            break
+        rest = [chunk async for chunk in response.content.iter_chunked(3)]
+        return first, rest
+
+    assert asyncio.run(read()) == ([b'abc'], [b'def', b'gh'])
@@ -0,0 +1,69 @@
+"""--worker: heartbeat hatası kiraları bırakmamalı, kuyruk çağrıları event loop'u bloklamamalı"""
+import asyncio
+import contextlib
+import sqlite3
+import threading
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('bs4')
+
+from dogtas_other_scraper import OUTCOME_NOT_FOUND, DogtasSitemapScraper, WorkQueue
+
+
+class FlakyQueue(WorkQueue):
+    """İlk heartbeat'i 'database is locked' ile düşüren, çağrı thread'lerini kaydeden kuyruk"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.heartbeats = 0
+        self.threads = set()
+
+    def heartbeat(self, worker_id, lease_seconds):
+        self.threads.add(threading.get_ident())
+        self.heartbeats += 1
+        if self.heartbeats == 1:
+            raise sqlite3.OperationalError("database is locked")
+        super().heartbeat(worker_id, lease_seconds)
+
+    def claim(self, worker_id, batch_size, lease_seconds):
+        self.threads.add(threading.get_ident())
+        return super().claim(worker_id, batch_size, lease_seconds)
+
+    def complete(self, worker_id, results, max_attempts):
+        self.threads.add(threading.get_ident())
+        super().complete(worker_id, results, max_attempts)
+
+
+def make_scraper():
+    scraper = DogtasSitemapScraper()
+    scraper.config.update(queue_batch_size=2, queue_lease_seconds=0.06)
+
+    @contextlib.asynccontextmanager
+    async def session():
+        yield None
+
+    async def scrape_batch(_session, batch):
+        # Her batch birkaç heartbeat aralığı sürer
+        await asyncio.sleep(0.1)
+        return [(position, OUTCOME_NOT_FOUND, None) for position, _ in batch]
+
+    scraper.scraping_session = session
+    scraper.scrape_batch = scrape_batch
+    return scraper
+
+
+def test_heartbeat_survives_errors_and_queue_calls_run_off_loop(tmp_path, capsys):
+    queue = FlakyQueue(str(tmp_path / 'queue.sqlite'))
+    queue.load([str(3000000000 + i) for i in range(4)], {})
+
+    done = asyncio.run(make_scraper().scrape_work_queue_async(queue, 'w1'))
+
+    assert done == 4
+    assert queue.progress() == {'done': 4}
+    # İlk hatadan sonra heartbeat çalışmaya devam etti
+    assert queue.heartbeats >= 2
+    assert "kira uzatılamadı" in capsys.readouterr().out
+    assert threading.get_ident() not in queue.threads
+    queue.close()